@@ -0,0 +1,32 @@
+from django.http import HttpResponse
+from django.views import View
+from rest_framework import exceptions, status
+from rest_framework.renderers import JSONRenderer
+
+from .authentication import CachedJWTAuthentication
+from .serializers import UserSerializer
+
+
+def render_json(data, status=status.HTTP_200_OK):
+    """Render ``data`` exactly as DRF's JSONRenderer does for the sync views."""
+    return HttpResponse(JSONRenderer().render(data), content_type='application/json', status=status)
+
+
+class UserProfileAsyncView(View):
+    """Async ``UserProfileView``: the user and wallet come from the cached principal."""
+    authentication = CachedJWTAuthentication()
+    
+    async def get(self, request, *args, **kwargs):
+        try:
+            authenticated = await self.authentication.aauthenticate(request)
+            if authenticated is None:
+                raise exceptions.NotAuthenticated()
+        except exceptions.APIException as exc:
+            # Same body and header as DRF's exception handler
+            data = exc.detail if isinstance(exc.detail, (list, dict)) else {'detail': exc.detail}
+            response = render_json(data, status=status.HTTP_401_UNAUTHORIZED)
+            response['WWW-Authenticate'] = self.authentication.authenticate_header(request)
+            return response
+        
+        user, _ = authenticated
+        return render_json(UserSerializer(user).data)
@@ -1,9 +1,48 @@
+import hashlib
+
+from django.conf import settings
 from django.contrib.auth.backends import ModelBackend
 from django.contrib.auth import get_user_model
-from django.db.models import Q
+from django.core.cache import cache
+from django.db.models import Q, Value
+from django.db.models.functions import Lower
+from django.db.models.lookups import Exact
 
 User = get_user_model()
 
+UNKNOWN_CACHE_KEY = 'auth:unknown:{}'
+
+
+def _unknown_key(identifier):
+    # Hash so any identifier makes a valid, bounded cache key
+    return UNKNOWN_CACHE_KEY.format(hashlib.sha256(identifier.lower().encode()).hexdigest())
+
+
+def find_users(identifier):
+    """
+    Users whose username or email equals ``identifier`` ignoring case, at
+    most two. ``LOWER(column) = LOWER(%s)`` matches the functional indexes
+    on both columns, unlike ``iexact``. With ``AUTH_UNKNOWN_CACHE_TTL`` set,
+    identifiers that match nobody are remembered for that many seconds.
+    """
+    ttl = getattr(settings, 'AUTH_UNKNOWN_CACHE_TTL', 0)
+    if ttl and cache.get(_unknown_key(identifier)):
+        return []
+    
+    value = Lower(Value(identifier))
+    users = list(
+        User.objects.filter(Q(Exact(Lower('username'), value)) | Q(Exact(Lower('email'), value)))
+        .select_related('wallet')[:2]
+    )
+    if not users and ttl:
+        cache.set(_unknown_key(identifier), True, ttl)
+    return users
+
+
+def forget_unknown(*identifiers):
+    cache.delete_many([_unknown_key(identifier) for identifier in identifiers if identifier])
+
+
 class EmailOrUsernameModelBackend(ModelBackend):
     """
     Custom authentication backend that allows users to login with either their username or email
@@ -13,19 +52,17 @@ class EmailOrUsernameModelBackend(ModelBackend):
         if username is None or password is None:
             return None
         
-        try:
-            # Try to fetch the user by username or email
-            user = User.objects.get(
-                Q(username__iexact=username) | Q(email__iexact=username)
-            )
-        except User.DoesNotExist:
-            return None
-        except User.MultipleObjectsReturned:
-            # If multiple users are found, return None
+        users = find_users(username)
+        if request is not None:
+            # Lets the login view report unknown users without a second lookup
+            request.login_user_found = bool(users)
+        if len(users) != 1:
+            # Unknown, or the identifier is one user's username and another's email
             return None
-        else:
-            if user.check_password(password) and self.user_can_authenticate(user):
-                return user
+        
+        user = users[0]
+        if user.check_password(password) and self.user_can_authenticate(user):
+            return user
         return None
     
     def user_can_authenticate(self, user):
@@ -34,4 +71,4 @@ class EmailOrUsernameModelBackend(ModelBackend):
         that attribute are allowed.
         """
         is_active = getattr(user, 'is_active', None)
-        return is_active or is_active is None 
\ No newline at end of file
+        return is_active or is_active is None
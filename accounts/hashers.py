@@ -0,0 +1,42 @@
+from django.conf import settings
+from django.contrib.auth.hashers import Argon2PasswordHasher, ScryptPasswordHasher
+
+
+class TunedScryptPasswordHasher(ScryptPasswordHasher):
+    """
+    scrypt with its cost taken from ``PASSWORD_SCRYPT_*`` settings. Hashes
+    made with other parameters are upgraded on the user's next login.
+    """
+
+    @property
+    def work_factor(self):
+        return getattr(settings, 'PASSWORD_SCRYPT_WORK_FACTOR', 2**14)
+
+    @property
+    def block_size(self):
+        return getattr(settings, 'PASSWORD_SCRYPT_BLOCK_SIZE', 8)
+
+    @property
+    def parallelism(self):
+        return getattr(settings, 'PASSWORD_SCRYPT_PARALLELISM', 1)
+
+    @property
+    def maxmem(self):
+        # scrypt needs 128 * n * r bytes; leave headroom over OpenSSL's 32 MiB default
+        return max(2 * 128 * self.work_factor * self.block_size, 32 * 1024 * 1024)
+
+
+class TunedArgon2PasswordHasher(Argon2PasswordHasher):
+    """Argon2id with its cost taken from ``PASSWORD_ARGON2_*`` settings; needs argon2-cffi."""
+
+    @property
+    def time_cost(self):
+        return getattr(settings, 'PASSWORD_ARGON2_TIME_COST', 2)
+
+    @property
+    def memory_cost(self):
+        return getattr(settings, 'PASSWORD_ARGON2_MEMORY_COST', 102400)
+
+    @property
+    def parallelism(self):
+        return getattr(settings, 'PASSWORD_ARGON2_PARALLELISM', 8)
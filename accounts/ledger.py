@@ -0,0 +1,226 @@
+import logging
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, Count, DecimalField, F, Max, OuterRef, Subquery, Sum, Value, When
+from django.db.models.functions import Coalesce
+
+from gold_flux.middleware import invalidate_responses
+from .models import BalanceCheckpoint, LedgerEntry, Wallet
+from .principals import forget_principals
+
+logger = logging.getLogger(__name__)
+
+
+class InsufficientFunds(Exception):
+    pass
+
+
+@transaction.atomic
+def adjust_wallet(user_id, balance=0, gold_holdings=0, reason='ADJUSTMENT', reference=''):
+    """
+    Apply a cash and/or gold delta to a wallet in a single conditional UPDATE:
+
+        UPDATE wallet SET balance = balance + x ... WHERE user_id = ? AND balance >= -x
+
+    The check and the write happen in one statement, so concurrent requests
+    can neither lose an update nor overdraw the wallet. Raises
+    ``InsufficientFunds`` when a debit is not covered. Every applied change
+    is recorded as a ``LedgerEntry`` in the same transaction.
+    """
+    balance = Decimal(balance)
+    gold_holdings = Decimal(gold_holdings)
+
+    if not apply_wallet_delta(user_id, balance, gold_holdings):
+        if not Wallet.objects.filter(user_id=user_id).exists():
+            raise Wallet.DoesNotExist(f'User {user_id} has no wallet')
+        if balance < 0 and gold_holdings >= 0:
+            raise InsufficientFunds('Insufficient balance')
+        if gold_holdings < 0 and balance >= 0:
+            raise InsufficientFunds('Insufficient gold holdings')
+        raise InsufficientFunds('Insufficient balance or gold holdings')
+
+    # UPDATE sends no signals
+    forget_principals([user_id])
+    invalidate_responses(Wallet, [user_id])
+    return LedgerEntry.objects.create(
+        user_id=user_id, cash_delta=balance, gold_delta=gold_holdings, reason=reason, reference=reference
+    )
+
+
+def apply_wallet_delta(user_id, balance, gold_holdings):
+    """
+    The guarded UPDATE behind ``adjust_wallet``; returns whether it applied.
+    Records no ledger entry and expires no caches, so callers settling many
+    changes can do both once per batch.
+    """
+    wallets = Wallet.objects.filter(user_id=user_id)
+    if balance < 0:
+        wallets = wallets.filter(balance__gte=-balance)
+    if gold_holdings < 0:
+        wallets = wallets.filter(gold_holdings__gte=-gold_holdings)
+    return bool(wallets.update(
+        balance=F('balance') + balance,
+        gold_holdings=F('gold_holdings') + gold_holdings,
+    ))
+
+
+def record_entries(entries):
+    """Append ledger entries for wallet changes applied in bulk elsewhere."""
+    return LedgerEntry.objects.bulk_create(entries, batch_size=1000)
+
+
+def lock_wallets(user_ids):
+    """
+    Lock the wallets of ``user_ids`` (``SELECT ... FOR UPDATE``) in user_id
+    order, so bulk operations touching overlapping users can't deadlock.
+    Must run inside a transaction. Returns ``{user_id: (balance, gold_holdings)}``.
+    """
+    wallets = Wallet.objects.select_for_update().filter(user_id__in=user_ids).order_by('user_id')
+    return {user_id: (balance, gold) for user_id, balance, gold in wallets.values_list('user_id', 'balance', 'gold_holdings')}
+
+
+def _case(deltas, index, decimal_places):
+    return Case(
+        *(When(user_id=user_id, then=Value(delta[index])) for user_id, delta in deltas.items() if delta[index]),
+        default=Value(0), output_field=DecimalField(max_digits=15, decimal_places=decimal_places),
+    )
+
+
+@transaction.atomic
+def bulk_adjust_wallets(deltas, entries, locked=False):
+    """
+    Apply ``{user_id: (cash_delta, gold_delta)}`` to many wallets with one
+    ``UPDATE ... SET balance = balance + CASE user_id WHEN ...`` after locking
+    them with ``lock_wallets``, and append ``entries`` to the ledger. Callers
+    that debit must check the locked balances first; they already hold the
+    locks and pass ``locked=True``, having checked every wallet exists.
+    The UPDATE is guarded like ``adjust_wallet``'s: if any wallet would go
+    negative nothing is applied and ``InsufficientFunds`` is raised.
+    """
+    deltas = {user_id: (Decimal(cash), Decimal(gold)) for user_id, (cash, gold) in deltas.items() if cash or gold}
+    if not deltas:
+        return
+    if not locked:
+        missing = set(deltas) - set(lock_wallets(deltas))
+        if missing:
+            raise Wallet.DoesNotExist(f'Users {sorted(missing)} have no wallet')
+
+    wallets = Wallet.objects.filter(user_id__in=deltas)
+    changes = {}
+    if any(cash for cash, _ in deltas.values()):
+        wallets = wallets.alias(new_balance=F('balance') + _case(deltas, 0, 2)).filter(new_balance__gte=0)
+        changes['balance'] = F('balance') + _case(deltas, 0, 2)
+    if any(gold for _, gold in deltas.values()):
+        wallets = wallets.alias(new_gold=F('gold_holdings') + _case(deltas, 1, 4)).filter(new_gold__gte=0)
+        changes['gold_holdings'] = F('gold_holdings') + _case(deltas, 1, 4)
+    if wallets.update(**changes) != len(deltas):
+        raise InsufficientFunds('A wallet changed since its balance was checked')
+    forget_principals(deltas)
+    invalidate_responses(Wallet, deltas)
+    record_entries(entries)
+
+
+def balance_at(user_id, at=None):
+    """
+    Rebuild a wallet's ``(balance, gold_holdings)`` as of ``at`` (default:
+    now) from the nearest checkpoint plus the entries after it, so the cost
+    is bounded by the checkpoint interval rather than the account's age.
+
+    Everything is keyed on entry ids, the order a wallet's changes were
+    applied in (each change holds the wallet's row lock): the result is the
+    balance right after the newest entry created at or before ``at``.
+    """
+    entries = LedgerEntry.objects.filter(user_id=user_id)
+    if at is not None:
+        entries = entries.filter(created__lte=at)
+    cutoff = entries.order_by('-id').values_list('id', flat=True).first()
+    if cutoff is None:
+        return Decimal('0.00'), Decimal('0.0000')
+
+    checkpoint = (
+        BalanceCheckpoint.objects.filter(user_id=user_id, last_entry_id__lte=cutoff)
+        .order_by('-last_entry_id').first()
+    )
+    balance, gold_holdings, after = Decimal('0.00'), Decimal('0.0000'), 0
+    if checkpoint is not None:
+        balance, gold_holdings, after = checkpoint.balance, checkpoint.gold_holdings, checkpoint.last_entry_id
+
+    tail = LedgerEntry.objects.filter(user_id=user_id, id__gt=after, id__lte=cutoff).aggregate(
+        cash=Sum('cash_delta'), gold=Sum('gold_delta')
+    )
+    return balance + (tail['cash'] or 0), gold_holdings + (tail['gold'] or 0)
+
+
+def _checkpoint_candidates(wallets):
+    """
+    ``wallets`` annotated, in one query, with their latest checkpoint and
+    the count, last id and sums of the ledger entries after it. Each
+    correlated subquery is a range read on ``ledger_user_entry_idx``.
+    """
+    latest = BalanceCheckpoint.objects.filter(user_id=OuterRef('user_id')).order_by('-last_entry_id')
+    tail = LedgerEntry.objects.filter(user_id=OuterRef('user_id'), id__gt=OuterRef('after')).order_by().values('user_id')
+
+    def over_tail(aggregate):
+        return Subquery(tail.annotate(value=aggregate).values('value'))
+
+    return wallets.annotate(
+        after=Coalesce(Subquery(latest.values('last_entry_id')[:1]), Value(0)),
+        previous_balance=Coalesce(Subquery(latest.values('balance')[:1]), Value(Decimal('0.00'))),
+        previous_gold=Coalesce(Subquery(latest.values('gold_holdings')[:1]), Value(Decimal('0.0000'))),
+        entries=Coalesce(over_tail(Count('id')), Value(0)),
+        last_entry_id=over_tail(Max('id')),
+        cash=over_tail(Sum('cash_delta')),
+        gold=over_tail(Sum('gold_delta')),
+    ).values_list(
+        'user_id', 'balance', 'gold_holdings', 'entries', 'last_entry_id',
+        'previous_balance', 'previous_gold', 'cash', 'gold',
+    )
+
+
+def create_checkpoints(min_entries=None, batch_size=1000):
+    """
+    Checkpoint every wallet with at least ``min_entries`` ledger entries since
+    its last checkpoint (``LEDGER_CHECKPOINT_INTERVAL`` by default). Returns
+    ``(written, mismatched)``.
+
+    Candidates are found with one unlocked query; each batch is then locked
+    with ``lock_wallets`` and re-read, so every change to those wallets has
+    committed along with its entry and no entry with a lower id can commit
+    after the checkpoint is taken. A checkpoint must also match the wallet's
+    own balance; wallets whose ledger disagrees are counted as mismatched
+    and left alone.
+    """
+    if min_entries is None:
+        min_entries = getattr(settings, 'LEDGER_CHECKPOINT_INTERVAL', 500)
+    min_entries = max(min_entries, 1)
+
+    candidates = [
+        row[0] for row in _checkpoint_candidates(Wallet.objects.order_by('user_id')).iterator(chunk_size=batch_size)
+        if row[3] >= min_entries
+    ]
+    written = mismatched = 0
+    for start in range(0, len(candidates), batch_size):
+        batch = candidates[start:start + batch_size]
+        with transaction.atomic():
+            lock_wallets(batch)
+            checkpoints = []
+            rows = _checkpoint_candidates(Wallet.objects.filter(user_id__in=batch).order_by('user_id'))
+            for user_id, balance, gold_holdings, entries, last_entry_id, previous_balance, previous_gold, cash, gold in rows:
+                if entries < min_entries:
+                    continue
+                checkpoint = BalanceCheckpoint(
+                    user_id=user_id, last_entry_id=last_entry_id,
+                    balance=previous_balance + cash, gold_holdings=previous_gold + gold,
+                )
+                if (checkpoint.balance, checkpoint.gold_holdings) != (balance, gold_holdings):
+                    logger.warning(
+                        'Ledger for user %s sums to %s / %s but the wallet holds %s / %s; not checkpointed',
+                        user_id, checkpoint.balance, checkpoint.gold_holdings, balance, gold_holdings,
+                    )
+                    mismatched += 1
+                    continue
+                checkpoints.append(checkpoint)
+            written += len(BalanceCheckpoint.objects.bulk_create(checkpoints))
+    return written, mismatched
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from accounts.ledger import create_checkpoints
+
+
+class Command(BaseCommand):
+    help = 'Write balance checkpoints for wallets with enough new ledger entries'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--min-entries', type=int, default=None,
+            help='Entries since the last checkpoint required (default: LEDGER_CHECKPOINT_INTERVAL)',
+        )
+
+    def handle(self, *args, **options):
+        written, mismatched = create_checkpoints(min_entries=options['min_entries'])
+        self.stdout.write(self.style.SUCCESS(f'Wrote {written} balance checkpoints.'))
+        if mismatched:
+            self.stdout.write(self.style.WARNING(f'{mismatched} wallets do not match their ledger and were skipped.'))
@@ -0,0 +1,70 @@
+# Generated by Django 4.2 on 2026-10-18 14:13
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def open_ledger(apps, schema_editor):
+    # Existing balances predate the ledger: record them as opening entries
+    Wallet = apps.get_model('accounts', 'Wallet')
+    LedgerEntry = apps.get_model('accounts', 'LedgerEntry')
+    LedgerEntry.objects.bulk_create(
+        [
+            LedgerEntry(user_id=wallet.user_id, cash_delta=wallet.balance, gold_delta=wallet.gold_holdings, reason='OPENING')
+            for wallet in Wallet.objects.exclude(balance=0, gold_holdings=0).iterator()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_cursor_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LedgerEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('cash_delta', models.DecimalField(decimal_places=2, default=0, max_digits=15)),
+                ('gold_delta', models.DecimalField(decimal_places=4, default=0, max_digits=15)),
+                ('reason', models.CharField(choices=[('OPENING', 'Opening Balance'), ('TRADE', 'Trade'), ('DEPOSIT', 'Deposit'), ('WITHDRAWAL', 'Withdrawal'), ('GOLD_LOCK', 'Gold Lock'), ('LOCK_MATURITY', 'Gold Lock Maturity'), ('ADJUSTMENT', 'Adjustment')], max_length=15)),
+                ('reference', models.CharField(blank=True, max_length=50)),
+                ('created', models.DateTimeField(auto_now_add=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ledger_entries', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['id'],
+            },
+        ),
+        migrations.CreateModel(
+            name='BalanceCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('last_entry_id', models.BigIntegerField()),
+                ('balance', models.DecimalField(decimal_places=2, max_digits=15)),
+                ('gold_holdings', models.DecimalField(decimal_places=4, max_digits=15)),
+                ('created', models.DateTimeField(auto_now_add=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='balance_checkpoints', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-last_entry_id'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='ledgerentry',
+            index=models.Index(fields=['user', 'id'], name='ledger_user_entry_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ledgerentry',
+            index=models.Index(fields=['user', 'created'], name='ledger_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='balancecheckpoint',
+            index=models.Index(fields=['user', '-last_entry_id'], name='checkpoint_user_entry_idx'),
+        ),
+        migrations.RunPython(open_ledger, migrations.RunPython.noop),
+    ]
@@ -1,11 +1,20 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.db.models.functions import Lower
 
 # Create your models here.
 
 class User(AbstractUser):
     is_admin = models.BooleanField(default=False)
     
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            models.Index(fields=['-date_joined', '-id'], name='user_date_joined_idx'),
+            # Case-insensitive login lookups (accounts.backends.find_users)
+            models.Index(Lower('username'), name='user_username_lower_idx'),
+            models.Index(Lower('email'), name='user_email_lower_idx'),
+        ]
+    
     def __str__(self):
         return self.username
 
@@ -16,3 +25,60 @@ class Wallet(models.Model):
     
     def __str__(self):
         return f"{self.user.username}'s Wallet"
+
+class LedgerEntry(models.Model):
+    """
+    Append-only record of every change to a wallet. Entries are never updated
+    or deleted; a wallet's history is the running sum of its entries.
+    """
+    REASON_CHOICES = [
+        ('OPENING', 'Opening Balance'),
+        ('TRADE', 'Trade'),
+        ('DEPOSIT', 'Deposit'),
+        ('WITHDRAWAL', 'Withdrawal'),
+        ('GOLD_LOCK', 'Gold Lock'),
+        ('LOCK_MATURITY', 'Gold Lock Maturity'),
+        ('ADJUSTMENT', 'Adjustment'),
+    ]
+    
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='ledger_entries')
+    cash_delta = models.DecimalField(max_digits=15, decimal_places=2, default=0)
+    gold_delta = models.DecimalField(max_digits=15, decimal_places=4, default=0)
+    reason = models.CharField(max_length=15, choices=REASON_CHOICES)
+    reference = models.CharField(max_length=50, blank=True)
+    created = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['user', 'id'], name='ledger_user_entry_idx'),
+            models.Index(fields=['user', 'created'], name='ledger_user_created_idx'),
+        ]
+    
+    def save(self, *args, **kwargs):
+        if self.pk is not None:
+            raise ValueError('Ledger entries are append-only')
+        super().save(*args, **kwargs)
+    
+    def delete(self, *args, **kwargs):
+        raise ValueError('Ledger entries are append-only')
+    
+    def __str__(self):
+        return f"{self.user_id} {self.reason} {self.cash_delta} cash / {self.gold_delta} gold"
+
+class BalanceCheckpoint(models.Model):
+    """Wallet totals as of ``last_entry_id``, so history replays start here."""
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='balance_checkpoints')
+    last_entry_id = models.BigIntegerField()
+    balance = models.DecimalField(max_digits=15, decimal_places=2)
+    gold_holdings = models.DecimalField(max_digits=15, decimal_places=4)
+    created = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        ordering = ['-last_entry_id']
+        indexes = [
+            models.Index(fields=['user', '-last_entry_id'], name='checkpoint_user_entry_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.user_id} balance as of entry {self.last_entry_id}"
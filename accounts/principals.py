@@ -0,0 +1,71 @@
+from functools import partial
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+
+from .models import User
+
+CACHE_KEY = 'auth:principal:{}'
+
+
+def principal_key(user_id):
+    return CACHE_KEY.format(user_id)
+
+
+def _cache():
+    return caches[getattr(settings, 'AUTH_PRINCIPAL_CACHE_ALIAS', 'default')]
+
+
+def principal_ttl():
+    """
+    Seconds to cache principals for; 0 when the cache is local to this
+    process and more than one worker may be running, since deactivating a
+    user or changing a password would then only reach the worker that
+    saved it.
+    """
+    if isinstance(_cache(), LocMemCache) and not getattr(settings, 'AUTH_PRINCIPAL_CACHE_SINGLE_WORKER', False):
+        return 0
+    return getattr(settings, 'AUTH_PRINCIPAL_CACHE_TTL', 60)
+
+
+def get_principal(user_id):
+    """
+    ``User`` with its wallet preloaded, served from the cache for up to
+    ``principal_ttl()`` seconds. Raises ``User.DoesNotExist``. The wallet
+    is for display: code that acts on balances must read the ``Wallet`` row.
+    """
+    ttl = principal_ttl()
+    if not ttl:
+        return User.objects.select_related('wallet').get(pk=user_id)
+    cache = _cache()
+    key = principal_key(user_id)
+    user = cache.get(key)
+    if user is None:
+        user = User.objects.select_related('wallet').get(pk=user_id)
+        cache.set(key, user, ttl)
+    return user
+
+
+async def aget_principal(user_id):
+    """Async ``get_principal`` using the async cache and ORM APIs."""
+    ttl = principal_ttl()
+    if not ttl:
+        return await User.objects.select_related('wallet').aget(pk=user_id)
+    cache = _cache()
+    key = principal_key(user_id)
+    user = await cache.aget(key)
+    if user is None:
+        user = await User.objects.select_related('wallet').aget(pk=user_id)
+        await cache.aset(key, user, ttl)
+    return user
+
+
+def forget_principals(user_ids):
+    """Drop cached principals whose user or wallet changed."""
+    cache = _cache()
+    keys = [principal_key(user_id) for user_id in user_ids]
+    cache.delete_many(keys)
+    # Again after commit, in case a request in between cached the old rows
+    transaction.on_commit(partial(cache.delete_many, keys))
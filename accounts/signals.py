@@ -0,0 +1,26 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from gold_flux.middleware import invalidate_responses
+from .backends import forget_unknown
+from .models import User, Wallet
+from .principals import forget_principals
+
+
+@receiver(post_save, sender=User)
+def forget_unknown_identifiers(sender, instance, **kwargs):
+    forget_unknown(instance.username, instance.email)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def forget_user_principal(sender, instance, **kwargs):
+    forget_principals([instance.pk])
+    invalidate_responses(sender, [instance.pk])
+
+
+@receiver(post_save, sender=Wallet)
+@receiver(post_delete, sender=Wallet)
+def forget_wallet_principal(sender, instance, **kwargs):
+    forget_principals([instance.user_id])
+    invalidate_responses(sender, [instance.user_id])
@@ -1,3 +1,232 @@
-from django.test import TestCase
+import threading
+import time
+from datetime import timedelta
+from decimal import Decimal
 
-# Create your tests here.
+from django.core.cache import cache, caches
+from django.db import OperationalError, connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from investments.models import GoldPrice
+from investments.pricing import latest_price
+from .ledger import InsufficientFunds, adjust_wallet, balance_at, create_checkpoints
+from .models import BalanceCheckpoint, LedgerEntry, User, Wallet
+
+
+class WalletLedgerConcurrencyTests(TransactionTestCase):
+    threads = 8
+    operations = 50
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='trader', email='trader@example.com', password='pass12345')
+        Wallet.objects.create(user=self.user, balance=Decimal('100.00'), gold_holdings=Decimal('0'))
+
+    def _hammer(self, **delta):
+        """Run ``adjust_wallet`` from many threads at once; return the number of successful calls."""
+        start = threading.Barrier(self.threads)
+        successes = []
+        errors = []
+
+        def worker():
+            done = 0
+            try:
+                start.wait()
+                for _ in range(self.operations):
+                    while True:
+                        try:
+                            adjust_wallet(self.user.pk, **delta)
+                            done += 1
+                        except InsufficientFunds:
+                            pass
+                        except OperationalError as exc:
+                            # SQLite reports writer contention instead of blocking
+                            if 'locked' not in str(exc):
+                                raise
+                            time.sleep(0.001)
+                            continue
+                        break
+            except Exception as exc:
+                errors.append(exc)
+            finally:
+                successes.append(done)
+                connection.close()
+
+        workers = [threading.Thread(target=worker) for _ in range(self.threads)]
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        return sum(successes)
+
+    def test_concurrent_credits_are_not_lost(self):
+        applied = self._hammer(balance=Decimal('1.00'), gold_holdings=Decimal('0.0001'))
+
+        wallet = Wallet.objects.get(user=self.user)
+        self.assertEqual(applied, self.threads * self.operations)
+        self.assertEqual(wallet.balance, Decimal('100.00') + applied)
+        self.assertEqual(wallet.gold_holdings, Decimal('0.0001') * applied)
+
+    def test_concurrent_debits_never_overdraw(self):
+        # 400 attempted debits against a balance that covers exactly 100
+        applied = self._hammer(balance=Decimal('-1.00'))
+
+        wallet = Wallet.objects.get(user=self.user)
+        self.assertEqual(applied, 100)
+        self.assertEqual(wallet.balance, Decimal('0.00'))
+
+    def test_trade_moves_cash_and_gold_together(self):
+        adjust_wallet(self.user.pk, balance=Decimal('-60.00'), gold_holdings=Decimal('0.5'))
+        with self.assertRaises(InsufficientFunds):
+            adjust_wallet(self.user.pk, balance=Decimal('-60.00'), gold_holdings=Decimal('0.5'))
+
+        wallet = Wallet.objects.get(user=self.user)
+        self.assertEqual(wallet.balance, Decimal('40.00'))
+        self.assertEqual(wallet.gold_holdings, Decimal('0.5'))
+
+
+class LoginLookupTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='Trader', email='Trader@Example.com', password='pass12345')
+        Wallet.objects.create(user=self.user)
+        self.client = APIClient()
+
+    def login(self, username, password='pass12345'):
+        return self.client.post('/api/auth/login/', {'username': username, 'password': password}, format='json')
+
+    def test_username_or_email_in_any_case(self):
+        for identifier in ('trader', 'TRADER', 'trader@example.com'):
+            with self.subTest(identifier=identifier):
+                self.assertEqual(self.login(identifier).status_code, 200)
+
+    def test_failures_need_one_lookup(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.login('trader', password='wrong')
+        self.assertEqual(response.data, {'error': 'Invalid password'})
+        self.assertEqual(len(queries), 1)
+
+        response = self.login('nobody')
+        self.assertEqual(response.data, {'error': 'User not found'})
+
+    def test_old_hashes_are_upgraded_on_login(self):
+        with override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.PBKDF2PasswordHasher']):
+            self.user.set_password('pass12345')
+            self.user.save()
+        self.assertTrue(User.objects.get(pk=self.user.pk).password.startswith('pbkdf2_sha256$'))
+
+        self.assertEqual(self.login('trader').status_code, 200)
+        self.assertTrue(User.objects.get(pk=self.user.pk).password.startswith('scrypt$'))
+
+    @override_settings(AUTH_UNKNOWN_CACHE_TTL=60)
+    def test_unknown_identifiers_are_cached_until_a_user_claims_them(self):
+        self.login('newcomer')
+        with CaptureQueriesContext(connection) as queries:
+            response = self.login('newcomer')
+        self.assertEqual(response.data, {'error': 'User not found'})
+        self.assertEqual(len(queries), 0)
+
+        User.objects.create_user(username='newcomer', email='newcomer@example.com', password='pass12345')
+        self.assertEqual(self.login('Newcomer').status_code, 200)
+
+
+@override_settings(AUTH_PRINCIPAL_CACHE_SINGLE_WORKER=True)
+class CachedPrincipalTests(TestCase):
+
+    def setUp(self):
+        caches['responses'].clear()
+        self.user = User.objects.create_user(username='trader', email='trader@example.com', password='pass12345')
+        Wallet.objects.create(user=self.user, balance=Decimal('100.00'))
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(self.user).access_token}')
+
+    def test_profile_served_without_queries_and_refreshed_on_wallet_change(self):
+        self.assertEqual(self.client.get('/api/user/profile/').status_code, 200)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/user/profile/')
+        self.assertEqual(len(queries), 0)
+        self.assertEqual(response.json()['wallet']['balance'], '100.00')
+
+        adjust_wallet(self.user.pk, balance=Decimal('-40'))
+        response = self.client.get('/api/user/profile/')
+        self.assertEqual(response.json()['wallet']['balance'], '60.00')
+
+    def test_deactivated_user_is_refused(self):
+        self.client.get('/api/user/profile/')
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.client.get('/api/user/profile/').status_code, 401)
+
+    def test_snapshot_reads_the_wallet_from_the_database(self):
+        GoldPrice.objects.create(price=Decimal('2000.00'))
+        latest_price.invalidate()
+        self.client.get('/api/user/profile/')
+        # Changed by another worker: this process's cached principal is stale
+        Wallet.objects.filter(user=self.user).update(balance=Decimal('250.00'))
+        response = self.client.post('/api/user/portfolio/')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()['cash_balance'], '250.00')
+
+    @override_settings(AUTH_PRINCIPAL_CACHE_SINGLE_WORKER=False)
+    def test_process_local_cache_is_not_used_with_several_workers(self):
+        self.client.get('/api/user/profile/')
+        # Deactivated by another worker, whose signals can't reach this process
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        self.assertEqual(self.client.get('/api/user/profile/').status_code, 401)
+
+
+class LedgerCheckpointTests(TestCase):
+
+    def wallet(self, username, moves):
+        user = User.objects.create_user(username=username, email=f'{username}@example.com', password='pass12345')
+        Wallet.objects.create(user=user)
+        for cash in moves:
+            adjust_wallet(user.pk, balance=Decimal(cash), reason='DEPOSIT')
+        return user
+
+    def test_balance_at_replays_to_a_point_in_time(self):
+        user = self.wallet('alice', ['100.00', '-30.00'])
+        middle = LedgerEntry.objects.filter(user=user).order_by('id').last().created
+        adjust_wallet(user.pk, balance=Decimal('5.50'), gold_holdings=Decimal('0.2500'))
+
+        self.assertEqual(balance_at(user.pk, at=middle), (Decimal('70.00'), Decimal('0.0000')))
+        self.assertEqual(balance_at(user.pk), (Decimal('75.50'), Decimal('0.2500')))
+        self.assertEqual(balance_at(user.pk, at=middle - timedelta(days=1)), (Decimal('0.00'), Decimal('0.0000')))
+
+    def test_checkpoints_start_replays_and_match_the_wallet(self):
+        user = self.wallet('alice', ['10.00'] * 4)
+        self.assertEqual(create_checkpoints(min_entries=3), (1, 0))
+        self.assertEqual(create_checkpoints(min_entries=3), (0, 0))
+        checkpoint = BalanceCheckpoint.objects.get(user=user)
+        self.assertEqual(checkpoint.balance, Decimal('40.00'))
+        self.assertEqual(checkpoint.last_entry_id, LedgerEntry.objects.filter(user=user).latest('id').id)
+
+        adjust_wallet(user.pk, balance=Decimal('2.00'))
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(balance_at(user.pk), (Decimal('42.00'), Decimal('0.0000')))
+        # The tail sum only covers entries after the checkpoint
+        self.assertIn(f'"id" > {checkpoint.last_entry_id}', queries[-1]['sql'])
+
+    def test_checkpoint_queries_do_not_grow_with_wallets(self):
+        for i in range(3):
+            self.wallet(f'small{i}', ['1.00'] * 2)
+        with CaptureQueriesContext(connection) as few:
+            create_checkpoints(min_entries=2)
+        BalanceCheckpoint.objects.all().delete()
+        for i in range(12):
+            self.wallet(f'large{i}', ['1.00'] * 2)
+        with CaptureQueriesContext(connection) as many:
+            self.assertEqual(create_checkpoints(min_entries=2), (15, 0))
+        self.assertEqual(len(few), len(many))
+
+    def test_wallet_that_disagrees_with_its_ledger_is_not_checkpointed(self):
+        user = self.wallet('alice', ['10.00'] * 3)
+        Wallet.objects.filter(user=user).update(balance=Decimal('999.00'))  # changed outside the ledger
+        with self.assertLogs('accounts.ledger', 'WARNING'):
+            self.assertEqual(create_checkpoints(min_entries=1), (0, 1))
+        self.assertFalse(BalanceCheckpoint.objects.exists())
@@ -1,8 +1,12 @@
 from django.urls import path
+from .async_views import UserProfileAsyncView
 from .views import SignupView, LoginView, UserProfileView
 
 urlpatterns = [
     path('auth/signup/', SignupView.as_view(), name='signup'),
     path('auth/login/', LoginView.as_view(), name='login'),
     path('user/profile/', UserProfileView.as_view(), name='user-profile'),
+    
+    # Async (ASGI-native) variants of read-heavy endpoints
+    path('async/user/profile/', UserProfileAsyncView.as_view(), name='async-user-profile'),
 ] 
\ No newline at end of file
@@ -1,3 +1,5 @@
+import logging
+
 from django.shortcuts import render
 from rest_framework import generics, status
 from rest_framework.response import Response
@@ -5,11 +7,10 @@ from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth import authenticate
 from django.db import transaction
-from django.db.models import Q
 from .models import User, Wallet
 from .serializers import UserSerializer, LoginSerializer
 
-# Create your views here.
+logger = logging.getLogger(__name__)
 
 class SignupView(generics.CreateAPIView):
     permission_classes = [AllowAny]
@@ -50,14 +51,9 @@ class LoginView(generics.GenericAPIView):
         username = serializer.validated_data.get('username')
         password = serializer.validated_data.get('password')
         
-        # Debug information
-        print(f"Login attempt for username: {username}")
-        
-        # Try to authenticate user
-        user = authenticate(username=username, password=password)
+        user = authenticate(request, username=username, password=password)
         
         if user:
-            print(f"Authentication successful for user: {user.username}")
             refresh = RefreshToken.for_user(user)
             user_serializer = UserSerializer(user)
             return Response({
@@ -65,23 +61,17 @@ class LoginView(generics.GenericAPIView):
                 'access': str(refresh.access_token),
                 'refresh': str(refresh)
             })
-        else:
-            print(f"Authentication failed for username: {username}")
-            
-            # Check if user exists
-            try:
-                existing_user = User.objects.get(
-                    Q(username__iexact=username) | Q(email__iexact=username)
-                )
-                print(f"User exists: {existing_user.username} (active: {existing_user.is_active})")
-                return Response({
-                    'error': 'Invalid password'
-                }, status=status.HTTP_401_UNAUTHORIZED)
-            except User.DoesNotExist:
-                print(f"No user found with username/email: {username}")
-                return Response({
-                    'error': 'User not found'
-                }, status=status.HTTP_401_UNAUTHORIZED)
+        
+        # The backend already looked the identifier up for this request
+        if getattr(request, 'login_user_found', False):
+            logger.info('Login failed: invalid password for %r', username)
+            return Response({
+                'error': 'Invalid password'
+            }, status=status.HTTP_401_UNAUTHORIZED)
+        logger.info('Login failed: no user with username/email %r', username)
+        return Response({
+            'error': 'User not found'
+        }, status=status.HTTP_401_UNAUTHORIZED)
 
 class UserProfileView(generics.RetrieveAPIView):
     permission_classes = [IsAuthenticated]
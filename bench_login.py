@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Benchmark: login throughput per core under each password hasher policy
+"""
+
+import os
+import time
+
+import django
+
+# Setup Django
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'gold_flux.settings')
+django.setup()
+
+from django.conf import settings
+from django.contrib.auth import authenticate
+from django.contrib.auth.hashers import get_hasher
+from django.db import connection
+from django.test.utils import override_settings, setup_test_environment, teardown_test_environment
+
+from accounts.models import User
+
+LOGINS = 50
+PASSWORD = 'correct horse battery staple'
+
+
+def hashers_for(policy):
+    default = settings.PASSWORD_HASHER_POLICIES[policy]
+    return [default] + [hasher for hasher in settings.PASSWORD_HASHERS if hasher != default]
+
+
+def available(policy):
+    try:
+        with override_settings(PASSWORD_HASHERS=hashers_for(policy)):
+            get_hasher().encode(PASSWORD, get_hasher().salt())
+    except ValueError:
+        # e.g. argon2 without argon2-cffi installed
+        return False
+    return True
+
+
+def login_rate(policy):
+    """Successful ``authenticate()`` calls per second on one core."""
+    with override_settings(PASSWORD_HASHERS=hashers_for(policy)):
+        User.objects.filter(username='bench').delete()
+        User.objects.create_user(username='bench', email='bench@example.com', password=PASSWORD)
+        start = time.perf_counter()
+        for _ in range(LOGINS):
+            assert authenticate(username='bench', password=PASSWORD) is not None
+        return LOGINS / (time.perf_counter() - start)
+
+
+def rehash_check(old, new):
+    """Log in once under ``new`` with a password hashed by ``old``; return the stored algorithm."""
+    with override_settings(PASSWORD_HASHERS=hashers_for(old)):
+        User.objects.filter(username='bench').delete()
+        User.objects.create_user(username='bench', email='bench@example.com', password=PASSWORD)
+    with override_settings(PASSWORD_HASHERS=hashers_for(new)):
+        authenticate(username='bench', password=PASSWORD)
+    return User.objects.get(username='bench').password.split('$', 1)[0]
+
+
+if __name__ == '__main__':
+    # Run against a throwaway test database, never the real one
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        print(f'=== Login throughput, {LOGINS} logins per policy, one core ===')
+        policies = [policy for policy in settings.PASSWORD_HASHER_POLICIES if available(policy)]
+        for policy in settings.PASSWORD_HASHER_POLICIES:
+            if policy not in policies:
+                print(f'{policy:>8}: skipped (hasher library not installed)')
+                continue
+            rate = login_rate(policy)
+            print(f'{policy:>8}: {rate:8.1f} logins/s  ({1000 / rate:6.1f} ms each)')
+        print(f'   rehash: pbkdf2 hash after a login under {settings.PASSWORD_HASHER} -> '
+              f'{rehash_check("pbkdf2", settings.PASSWORD_HASHER)}')
+        print('   workers needed for a storm of N logins/s ~= N / (logins/s above) cores')
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
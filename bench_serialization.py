@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Benchmark: ModelSerializer vs values() serialization of list endpoints
+"""
+
+import os
+import time
+from datetime import timedelta
+from decimal import Decimal
+
+import django
+
+# Setup Django
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'gold_flux.settings')
+django.setup()
+
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from accounts.models import User
+from investments.fast_serializers import values_serializer
+from investments.models import GoldPrice, Transaction
+from investments.serializers import GoldPriceSerializer, TransactionSerializer
+
+SIZES = [10_000, 100_000]
+REPEAT = 3
+
+
+def fill(count):
+    GoldPrice.objects.all().delete()
+    Transaction.objects.all().delete()
+    user, _ = User.objects.get_or_create(username='bench', defaults={'email': 'bench@example.com'})
+    now = timezone.now()
+    GoldPrice.objects.bulk_create(
+        (GoldPrice(timestamp=now - timedelta(seconds=i), price=Decimal(200_000 + i % 5_000).scaleb(-2)) for i in range(count)),
+        batch_size=5_000,
+    )
+    Transaction.objects.bulk_create(
+        (
+            Transaction(
+                user=user, transaction_type='BUY' if i % 2 else 'SELL', amount=Decimal(i % 90_000 + 1).scaleb(-4),
+                price_at_transaction=Decimal('2345.67'), executed_price=Decimal('2345.67'), status='EXECUTED',
+            )
+            for i in range(count)
+        ),
+        batch_size=5_000,
+    )
+
+
+def serializer_path(serializer_class, queryset):
+    """The generic view path: model instances, a serializer per row, then JSON."""
+    return JSONRenderer().render(serializer_class(queryset, many=True).data)
+
+
+def values_path(serializer_class, queryset):
+    """investments.fast_serializers: values() dicts, then JSON."""
+    serializer = values_serializer(serializer_class)
+    return JSONRenderer().render(serializer.to_representation(queryset.values(*serializer.lookups)))
+
+
+def best_of(func, *args):
+    best = None
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        output = func(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, output
+
+
+if __name__ == '__main__':
+    # Run against a throwaway test database, never the real one
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        endpoints = [
+            ('/api/gold/prices/', GoldPriceSerializer, lambda: GoldPrice.objects.order_by('-timestamp', '-id')),
+            ('/api/admin/transactions/', TransactionSerializer,
+             lambda: Transaction.objects.select_related('user').order_by('-timestamp', '-id')),
+        ]
+        for count in SIZES:
+            fill(count)
+            print(f'=== {count:,} rows, best of {REPEAT} ===')
+            for url, serializer_class, queryset in endpoints:
+                slow, expected = best_of(serializer_path, serializer_class, queryset())
+                fast, output = best_of(values_path, serializer_class, queryset())
+                print(f'{url:>26}: serializer {slow * 1000:8.1f} ms  values {fast * 1000:8.1f} ms  '
+                      f'speedup {slow / fast:5.1f}x  identical: {output == expected}')
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark: Decimal settlement math vs the old float path
+
+Timed twice: the arithmetic alone, and with each result converted for its
+wallet column as a save would. Reports the median and range of REPEAT runs;
+ratios within that range are noise.
+"""
+
+import os
+import random
+import statistics
+import timeit
+from decimal import Decimal
+
+import django
+
+# Setup Django
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'gold_flux.settings')
+django.setup()
+
+from django.db import connection
+from django.db.models import DecimalField
+
+from investments.settlement import portfolio_value, trade_value
+
+ORDERS = 100_000
+REPEAT = 5
+
+# The wallet columns: floats assigned to them are converted on save
+BALANCE_FIELD = DecimalField(max_digits=15, decimal_places=2)
+HOLDINGS_FIELD = DecimalField(max_digits=15, decimal_places=4)
+
+
+def make_orders():
+    rng = random.Random(42)
+    return [
+        (
+            str(Decimal(rng.randint(1, 500_000)).scaleb(-4)),  # amount as posted, e.g. '12.3456'
+            Decimal(rng.randint(150_000, 300_000)).scaleb(-2),  # gold price, e.g. 2345.67
+            Decimal(rng.randint(0, 10_000_000)).scaleb(-2),  # wallet balance
+            Decimal(rng.randint(0, 5_000_000)).scaleb(-4),  # wallet gold holdings
+        )
+        for _ in range(ORDERS)
+    ]
+
+
+def float_math(orders):
+    """The previous view code's arithmetic."""
+    for amount, price, balance, holdings in orders:
+        cost = float(amount) * float(price)
+        new_balance = float(balance) - cost
+        new_holdings = float(holdings) + float(amount)
+        gold_value = new_holdings * float(price)
+        total_value = new_balance + gold_value
+
+
+def decimal_math(orders):
+    """investments.settlement's arithmetic."""
+    for amount, price, balance, holdings in orders:
+        cost = trade_value(amount, price)
+        new_balance = balance - cost
+        new_holdings = holdings + Decimal(amount)
+        gold_value, total_value = portfolio_value(new_balance, new_holdings, price)
+
+
+def float_path(orders):
+    """The previous view code: float math, converted back to Decimal on save."""
+    for amount, price, balance, holdings in orders:
+        cost = float(amount) * float(price)
+        new_balance = float(balance) - cost
+        new_holdings = float(holdings) + float(amount)
+        BALANCE_FIELD.get_db_prep_save(new_balance, connection)
+        HOLDINGS_FIELD.get_db_prep_save(new_holdings, connection)
+        gold_value = new_holdings * float(price)
+        total_value = new_balance + gold_value
+        BALANCE_FIELD.get_db_prep_save(total_value, connection)
+
+
+def decimal_path(orders):
+    """investments.settlement: quantized Decimal math, stored as is."""
+    for amount, price, balance, holdings in orders:
+        cost = trade_value(amount, price)
+        new_balance = balance - cost
+        new_holdings = holdings + Decimal(amount)
+        BALANCE_FIELD.get_db_prep_save(new_balance, connection)
+        HOLDINGS_FIELD.get_db_prep_save(new_holdings, connection)
+        gold_value, total_value = portfolio_value(new_balance, new_holdings, price)
+        BALANCE_FIELD.get_db_prep_save(total_value, connection)
+
+
+def mismatches(orders):
+    """Orders whose stored float cost differs from the exact Decimal cost."""
+    count = 0
+    for amount, price, _, _ in orders:
+        stored = BALANCE_FIELD.get_db_prep_save(float(amount) * float(price), connection)
+        if Decimal(stored) != trade_value(amount, price):
+            count += 1
+    return count
+
+
+def compare(title, orders, paths):
+    print(f'--- {title} ---')
+    medians = {}
+    for name, func in paths:
+        runs = timeit.repeat(lambda: func(orders), number=1, repeat=REPEAT)
+        medians[name] = statistics.median(runs)
+        print(
+            f'{name:>8}: {medians[name] * 1000:8.1f} ms median, {min(runs) * 1000:.1f}-{max(runs) * 1000:.1f} ms'
+            f'  ({ORDERS / medians[name]:,.0f} orders/s)'
+        )
+    print(f'   ratio: decimal/float = {medians["decimal"] / medians["float"]:.2f}')
+
+
+if __name__ == '__main__':
+    orders = make_orders()
+    print(f'=== Settlement math: {ORDERS:,} orders, {REPEAT} runs ===')
+    compare('arithmetic only', orders, [('float', float_math), ('decimal', decimal_math)])
+    compare('with column conversion', orders, [('float', float_path), ('decimal', decimal_path)])
+    print(f'   float costs stored off by a cent: {mismatches(orders):,}')
@@ -13,4 +13,30 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'gold_flux.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# Imported after the app registry is ready
+from investments.streams import price_socket, price_sse  # noqa: E402
+
+# Streams that must notice a client leaving, which Django's handler doesn't
+STREAMING_ROUTES = {
+    '/api/gold/prices/stream/': price_sse,
+}
+
+WEBSOCKET_ROUTES = {
+    '/ws/gold/prices/': price_socket,
+}
+
+
+async def application(scope, receive, send):
+    if scope['type'] == 'websocket':
+        handler = WEBSOCKET_ROUTES.get(scope['path'])
+        if handler is None:
+            await send({'type': 'websocket.close', 'code': 4404})
+            return
+        await handler(scope, receive, send)
+        return
+    if scope['type'] == 'http' and scope['method'] == 'GET' and scope['path'] in STREAMING_ROUTES:
+        await STREAMING_ROUTES[scope['path']](scope, receive, send)
+        return
+    await django_application(scope, receive, send)
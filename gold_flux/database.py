@@ -0,0 +1,67 @@
+from django.core.exceptions import ImproperlyConfigured
+
+# DATABASE_PROFILE values
+PROFILES = ('development', 'production')
+
+# Applied to every new SQLite connection in the production profile. WAL
+# lets readers run alongside the writer, and with it synchronous=NORMAL
+# only fsyncs at checkpoints (a power cut can lose the last commits, never
+# corrupt the file); the busy timeout makes writers queue for the lock
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,  # ms
+    'mmap_size': 256 * 1024 * 1024,
+}
+
+# Server-side poolers in transaction mode (PgBouncer, RDS Proxy, ...) hand
+# each transaction to any server connection, so nothing may outlive one
+POOLERS = ('', 'transaction')
+
+
+def parse_url(url):
+    # Imported here so development without DATABASE_URL doesn't need it
+    try:
+        import dj_database_url
+    except ImportError:
+        raise ImproperlyConfigured('DATABASE_URL requires dj-database-url (pip install dj-database-url)')
+    return dj_database_url.parse(url)
+
+
+def database_config(profile, url=None, sqlite_path=None, conn_max_age=600, pooler=''):
+    """
+    ``DATABASES['default']`` for a profile. ``url`` (DATABASE_URL) picks
+    the server; without it, the SQLite file at ``sqlite_path``.
+
+    development: Django's defaults, a new connection per request.
+    production:  persistent connections (``conn_max_age`` seconds) with a
+                 health check before reuse; for PostgreSQL, ``pooler``
+                 names the mode of a server-side pooler in front of it; for
+                 SQLite, the pragmas above and BEGIN IMMEDIATE writes.
+    """
+    if profile not in PROFILES:
+        raise ImproperlyConfigured(f"DATABASE_PROFILE must be one of: {', '.join(PROFILES)}")
+    if pooler not in POOLERS:
+        raise ImproperlyConfigured(f"DATABASE_POOLER must be one of: {', '.join(repr(mode) for mode in POOLERS)}")
+
+    if url:
+        config = parse_url(url)
+    else:
+        config = {'ENGINE': 'django.db.backends.sqlite3', 'NAME': sqlite_path}
+    if profile == 'development':
+        return config
+
+    config['CONN_MAX_AGE'] = conn_max_age
+    config['CONN_HEALTH_CHECKS'] = True
+    options = config.setdefault('OPTIONS', {})
+    if config['ENGINE'] == 'django.db.backends.sqlite3':
+        config['ENGINE'] = 'gold_flux.sqlite3'
+        options.setdefault('pragmas', SQLITE_PRAGMAS)
+        options.setdefault('transaction_mode', 'IMMEDIATE')
+    elif config['ENGINE'] == 'django.db.backends.postgresql':
+        options.setdefault('connect_timeout', 5)
+        if pooler == 'transaction':
+            # Named server-side cursors (QuerySet.iterator()) live across
+            # statements, which a transaction pooler can't route
+            config['DISABLE_SERVER_SIDE_CURSORS'] = True
+    return config
@@ -0,0 +1,145 @@
+import hashlib
+import uuid
+from functools import partial
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+from django.http import HttpResponse
+from django.utils.deprecation import MiddlewareMixin
+
+# Scopes a cached route can have:
+#   public - one copy for everyone; no authentication needed
+#   user   - one copy per user, invalidated by changes to that user's rows
+#   shared - one copy per user (permissions differ), invalidated by any change
+SCOPES = ('public', 'user', 'shared')
+
+
+def _cache():
+    return caches[getattr(settings, 'RESPONSE_CACHE_ALIAS', 'default')]
+
+
+def cached_scopes():
+    """
+    Scopes whose responses are cached. Only ``public`` when the cache is
+    local to this process and more than one worker may be running: the
+    invalidations for user and shared responses would then only reach the
+    worker (or command) that made the change.
+    """
+    if isinstance(_cache(), LocMemCache) and not getattr(settings, 'RESPONSE_CACHE_SINGLE_WORKER', False):
+        return ('public',)
+    return SCOPES
+
+
+def _model_label(model):
+    return model if isinstance(model, str) else model._meta.label_lower
+
+
+def _bump(keys):
+    # A fresh token rather than a counter: no read-modify-write, and a token
+    # evicted from the cache can never come back with an old value
+    _cache().set_many({key: uuid.uuid4().hex for key in keys}, None)
+
+
+def invalidate_responses(model, user_ids=None):
+    """
+    Expire cached responses built from ``model``. With ``user_ids``, only
+    those users' own responses (plus shared and public ones) expire; without
+    them, every cached response built from ``model`` does. Runs again after
+    commit so a request racing the transaction can't re-cache old data.
+    """
+    label = _model_label(model)
+    if user_ids is None:
+        keys = [f'respcache:v:{label}:all']
+    else:
+        keys = [f'respcache:v:{label}:any'] + [f'respcache:v:{label}:user:{user_id}' for user_id in user_ids]
+    _bump(keys)
+    transaction.on_commit(partial(_bump, keys))
+
+
+def _versions(keys):
+    cache = _cache()
+    versions = cache.get_many(keys)
+    missing = [key for key in keys if key not in versions]
+    if missing:
+        for key in missing:
+            cache.add(key, uuid.uuid4().hex, None)
+        versions.update(cache.get_many(missing))
+    return [versions.get(key, '') for key in keys]
+
+
+class ResponseCacheMiddleware(MiddlewareMixin):
+    """
+    Serve repeat GETs of the routes in ``RESPONSE_CACHE_ROUTES`` from the
+    ``RESPONSE_CACHE_ALIAS`` cache without running the view. A route maps
+    its URL name to ``(scope, model labels)``; the cache key covers the
+    path, query string, Accept header, user (unless public) and the current
+    version of every model the route reads, so ``invalidate_responses``
+    retires stale copies without having to find them.
+    """
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        from accounts.authentication import CachedJWTAuthentication
+        self.authentication = CachedJWTAuthentication()
+
+    def _route(self, request):
+        if request.method not in ('GET', 'HEAD') or request.resolver_match is None:
+            return None
+        return getattr(settings, 'RESPONSE_CACHE_ROUTES', {}).get(request.resolver_match.url_name)
+
+    def _user_id(self, request):
+        try:
+            authenticated = self.authentication.authenticate(request)
+        except Exception:
+            # Let the view produce the authentication error
+            return None
+        return authenticated[0].pk if authenticated else None
+
+    def _key(self, request, scope, models):
+        if scope == 'public':
+            owner = 'public'
+        else:
+            owner = self._user_id(request)
+            if owner is None:
+                return None
+        version_keys = []
+        for label in models:
+            version_keys.append(f'respcache:v:{label}:all')
+            version_keys.append(f'respcache:v:{label}:user:{owner}' if scope == 'user' else f'respcache:v:{label}:any')
+        parts = [
+            scope, str(owner), request.path, request.META.get('QUERY_STRING', ''),
+            request.META.get('HTTP_ACCEPT', ''), *_versions(version_keys),
+        ]
+        return 'respcache:r:' + hashlib.sha256('\n'.join(parts).encode()).hexdigest()
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        route = self._route(request)
+        if route is None:
+            return None
+        scope, models = route
+        if scope not in cached_scopes():
+            return None
+        key = self._key(request, scope, models)
+        if key is None:
+            return None
+        cached = _cache().get(key)
+        if cached is None:
+            request._response_cache_key = key
+            return None
+        status, content, headers = cached
+        response = HttpResponse(content, status=status)
+        for name, value in headers:
+            response[name] = value
+        response['X-Cache'] = 'HIT'
+        return response
+
+    def process_response(self, request, response):
+        key = getattr(request, '_response_cache_key', None)
+        if key is None or response.status_code != 200 or response.streaming or response.has_header('Set-Cookie'):
+            return response
+        headers = [(name, value) for name, value in response.items()]
+        _cache().set(key, (response.status_code, response.content, headers), getattr(settings, 'RESPONSE_CACHE_TIMEOUT', 60))
+        response['X-Cache'] = 'MISS'
+        return response
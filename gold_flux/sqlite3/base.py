@@ -0,0 +1,31 @@
+from django.db.backends.sqlite3 import base
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """
+    Django's SQLite backend plus two OPTIONS it doesn't have before 5.1:
+
+    ``pragmas``           PRAGMAs run on every new connection, in order
+    ``transaction_mode``  e.g. ``'IMMEDIATE'``: take the write lock when a
+                          transaction begins, so concurrent writers wait on
+                          busy_timeout instead of failing with "database is
+                          locked" when a read lock can't be upgraded
+    """
+
+    def get_connection_params(self):
+        params = super().get_connection_params()
+        self.pragmas = params.pop('pragmas', {})
+        self.transaction_mode = params.pop('transaction_mode', None)
+        return params
+
+    def get_new_connection(self, conn_params):
+        conn = super().get_new_connection(conn_params)
+        for name, value in self.pragmas.items():
+            conn.execute(f'PRAGMA {name} = {value}')
+        return conn
+
+    def _start_transaction_under_autocommit(self):
+        if self.transaction_mode:
+            self.cursor().execute(f'BEGIN {self.transaction_mode}')
+        else:
+            super()._start_transaction_under_autocommit()
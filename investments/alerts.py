@@ -0,0 +1,156 @@
+import threading
+import time
+from decimal import Decimal
+
+import numpy as np
+from django.conf import settings
+from django.db.models import Max
+from django.utils import timezone
+
+from gold_flux.middleware import invalidate_responses
+from .models import PriceAlert
+from .tailing import RowTail
+
+# Rows per query when reloading the whole index
+SYNC_CHUNK_SIZE = 2000
+
+# Ids per UPDATE when marking triggered alerts
+MARK_CHUNK_SIZE = 500
+
+ALERT_FIELDS = ('is_active', 'triggered', 'alert_type', 'target_price')
+
+
+def to_cents(price):
+    return int(Decimal(price).scaleb(2).to_integral_value())
+
+
+class AlertIndex:
+    """
+    Active, untriggered price alerts held as two sorted arrays of target
+    prices (in cents), one per direction. A tick locates the triggered range
+    with a binary search and marks those alerts by id.
+
+    Each tick reads only the alerts added since the last one (``RowTail``).
+    Alerts deactivated in this process leave through ``discard``; their
+    array entries are skipped when they are matched and dropped when the
+    arrays are compacted. Every ``ALERT_INDEX_RECONCILE_INTERVAL`` seconds
+    the index is reloaded, which picks up alerts deactivated by other
+    processes and inserts that took long to commit.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        self._levels = {
+            'ABOVE': np.empty(0, dtype=np.int64),
+            'BELOW': np.empty(0, dtype=np.int64),
+        }
+        self._ids = {
+            'ABOVE': np.empty(0, dtype=np.int64),
+            'BELOW': np.empty(0, dtype=np.int64),
+        }
+        # Ids of the live alerts; array entries for any other id are dead
+        self._known = set()
+        self._tail = RowTail()
+        # Monotonic time of the last full reload, None until the first
+        self._reconciled_at = None
+
+    def __len__(self):
+        return len(self._known)
+
+    def add(self, rows):
+        """Merge ``(pk, alert_type, target_price)`` rows into the arrays."""
+        rows = [row for row in rows if row[0] not in self._known]
+        self._known.update(pk for pk, _, _ in rows)
+        for alert_type in ('ABOVE', 'BELOW'):
+            new = sorted((to_cents(price), pk) for pk, kind, price in rows if kind == alert_type)
+            if not new:
+                continue
+            levels = np.array([level for level, _ in new], dtype=np.int64)
+            ids = np.array([pk for _, pk in new], dtype=np.int64)
+            positions = np.searchsorted(self._levels[alert_type], levels, side='right')
+            self._levels[alert_type] = np.insert(self._levels[alert_type], positions, levels)
+            self._ids[alert_type] = np.insert(self._ids[alert_type], positions, ids)
+
+    def discard(self, alert_id):
+        """Forget an alert that is no longer active."""
+        with self._lock:
+            self._known.discard(alert_id)
+            self._compact()
+
+    def _compact(self):
+        # Rebuild once dead entries outnumber live ones: O(n), amortized
+        # over the removals that produced them
+        if len(self._ids['ABOVE']) + len(self._ids['BELOW']) > 2 * len(self._known) + 1000:
+            known = np.fromiter(self._known, dtype=np.int64, count=len(self._known))
+            for alert_type in ('ABOVE', 'BELOW'):
+                keep = np.isin(self._ids[alert_type], known)
+                self._levels[alert_type] = self._levels[alert_type][keep]
+                self._ids[alert_type] = self._ids[alert_type][keep]
+
+    def reconcile(self):
+        """Reload the index from every active, untriggered alert."""
+        self.clear()
+        # Read the high-water mark first: rows above it are seen by the tail
+        self._tail.reset(PriceAlert.objects.aggregate(last=Max('pk'))['last'])
+        self.add(
+            PriceAlert.objects.filter(is_active=True, triggered__isnull=True)
+            .values_list('pk', 'alert_type', 'target_price')
+            .iterator(chunk_size=SYNC_CHUNK_SIZE)
+        )
+        self._reconciled_at = time.monotonic()
+
+    def sync(self):
+        """Add the alerts created since the last sync, or reload when due."""
+        interval = getattr(settings, 'ALERT_INDEX_RECONCILE_INTERVAL', 300)
+        if self._reconciled_at is None or time.monotonic() - self._reconciled_at >= interval:
+            self.reconcile()
+            return
+        self.add(
+            (pk, alert_type, target_price)
+            for pk, is_active, triggered, alert_type, target_price
+            in self._tail.poll(PriceAlert.objects.all(), ALERT_FIELDS)
+            if is_active and triggered is None
+        )
+
+    def match(self, price):
+        """Remove and return the ids of every alert triggered by ``price``."""
+        cents = to_cents(price)
+
+        # ABOVE alerts fire once the price reaches their target: a prefix
+        above = int(np.searchsorted(self._levels['ABOVE'], cents, side='right'))
+        triggered = self._ids['ABOVE'][:above]
+        self._levels['ABOVE'] = self._levels['ABOVE'][above:]
+        self._ids['ABOVE'] = self._ids['ABOVE'][above:]
+
+        # BELOW alerts fire once the price drops to their target: a suffix
+        below = int(np.searchsorted(self._levels['BELOW'], cents, side='left'))
+        triggered = np.concatenate([triggered, self._ids['BELOW'][below:]])
+        self._levels['BELOW'] = self._levels['BELOW'][:below]
+        self._ids['BELOW'] = self._ids['BELOW'][:below]
+
+        triggered = [pk for pk in triggered.tolist() if pk in self._known]
+        self._known.difference_update(triggered)
+        return triggered
+
+    def on_tick(self, price):
+        price = Decimal(price)
+        with self._lock:
+            self.sync()
+            triggered = self.match(price)
+        if triggered:
+            now = timezone.now()
+            updated = 0
+            for start in range(0, len(triggered), MARK_CHUNK_SIZE):
+                # Still guarded, for alerts deactivated elsewhere since the last reload
+                updated += PriceAlert.objects.filter(
+                    pk__in=triggered[start:start + MARK_CHUNK_SIZE], is_active=True, triggered__isnull=True,
+                ).update(triggered=now)
+            if updated:
+                invalidate_responses(PriceAlert)
+        return triggered
+
+
+alert_index = AlertIndex()
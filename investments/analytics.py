@@ -0,0 +1,113 @@
+import math
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import caches
+
+from .models import PortfolioSnapshot
+from .settlement import quantize_cash
+
+# Snapshots are taken once per calendar day, and gold trades every day
+PERIODS_PER_YEAR = 365
+
+CACHE_KEY = 'portfolio_analytics:{}'
+
+
+def cache_key(user_id):
+    return CACHE_KEY.format(user_id)
+
+
+def _cache():
+    return caches[getattr(settings, 'PORTFOLIO_ANALYTICS_CACHE_ALIAS', 'default')]
+
+
+def invalidate_analytics(*user_ids):
+    _cache().delete_many([cache_key(user_id) for user_id in user_ids])
+
+
+def _money(value):
+    # Adding 0.0 turns -0.0 into 0.0
+    return str(quantize_cash(float(value) + 0.0))
+
+
+def load_snapshots(user_id):
+    """
+    A user's snapshots as column arrays ordered by date, keeping the last
+    snapshot of each day.
+    """
+    rows = list(
+        PortfolioSnapshot.objects.filter(user_id=user_id).order_by('date', 'id')
+        .values_list('date', 'total_value', 'cash_balance', 'gold_value', 'gold_holdings', 'gold_price')
+    )
+    if not rows:
+        return None
+    dates, *values = zip(*rows)
+    dates = np.array(dates, dtype='datetime64[D]')
+    # np.unique keeps the first occurrence, so search the reversed dates
+    _, last = np.unique(dates[::-1], return_index=True)
+    keep = len(dates) - 1 - last
+    columns = dict(zip(
+        ('total_value', 'cash_balance', 'gold_value', 'gold_holdings', 'gold_price'),
+        (np.array(column, dtype=np.float64)[keep] for column in values),
+    ))
+    columns['date'] = dates[keep]
+    return columns
+
+
+def compute_analytics(columns):
+    """
+    Returns, drawdown, volatility, time-weighted return and P&L attribution
+    for snapshot columns from ``load_snapshots``.
+
+    The market P&L of each period is the gold held at its start revalued at
+    its end price; whatever else moved the total value (deposits,
+    withdrawals, trade slippage) is treated as an external flow. Period
+    returns are market P&L over the opening value, which makes their
+    product the time-weighted return.
+    """
+    value = columns['total_value']
+    holdings = columns['gold_holdings']
+    price = columns['gold_price']
+
+    change = np.diff(value)
+    market_pnl = holdings[:-1] * np.diff(price)
+    flows = change - market_pnl
+    opening = value[:-1]
+    returns = np.divide(market_pnl, opening, out=np.zeros_like(market_pnl), where=opening > 0)
+
+    growth = np.concatenate(([1.0], np.cumprod(1.0 + returns)))
+    drawdown = growth / np.maximum.accumulate(growth) - 1.0
+    volatility = float(np.std(returns, ddof=1)) * math.sqrt(PERIODS_PER_YEAR) if len(returns) > 1 else None
+
+    return {
+        'start_date': str(columns['date'][0]),
+        'end_date': str(columns['date'][-1]),
+        'periods': len(returns),
+        'dates': [str(date) for date in columns['date'][1:]],
+        'returns': np.round(returns, 8).tolist(),
+        'drawdown': np.round(drawdown[1:], 8).tolist(),
+        'time_weighted_return': round(float(growth[-1] - 1.0), 8),
+        'max_drawdown': round(float(drawdown.min()), 8),
+        'current_drawdown': round(float(drawdown[-1]), 8),
+        'volatility': None if volatility is None else round(volatility, 8),
+        'pnl_attribution': {
+            'start_value': _money(value[0]),
+            'end_value': _money(value[-1]),
+            'gold_price': _money(market_pnl.sum()),
+            'net_flows': _money(flows.sum()),
+        },
+    }
+
+
+def portfolio_analytics(user_id):
+    """
+    Analytics for ``user_id``, cached until the user's next snapshot or for
+    ``PORTFOLIO_ANALYTICS_CACHE_TTL`` seconds, whichever comes first.
+    """
+    key = cache_key(user_id)
+    result = _cache().get(key)
+    if result is None:
+        columns = load_snapshots(user_id)
+        result = {} if columns is None else compute_analytics(columns)
+        _cache().set(key, result, getattr(settings, 'PORTFOLIO_ANALYTICS_CACHE_TTL', 300))
+    return result
@@ -0,0 +1,89 @@
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import transaction
+from django.utils import timezone
+
+from accounts.ledger import bulk_adjust_wallets, lock_wallets
+from accounts.models import LedgerEntry
+from gold_flux.middleware import invalidate_responses
+
+ACTIONS = {'approve': 'APPROVED', 'reject': 'REJECTED'}
+
+
+# ``(cash, gold)`` wallet changes an approval makes, for ``bulk_review``
+def credit_cash(amount):
+    return amount, 0
+
+
+def debit_cash(amount):
+    return -amount, 0
+
+
+def debit_gold(amount):
+    return 0, -amount
+
+
+@transaction.atomic
+def bulk_review(model, ids, action, admin, reason, reference, delta):
+    """
+    Approve or reject many PENDING requests of ``model`` in one transaction.
+
+    The requests and then the affected wallets are locked in primary key /
+    user_id order, so overlapping batches can't deadlock. ``delta(amount)``
+    gives the ``(cash, gold)`` change an approval makes; approvals are
+    applied in id order against the locked balances, so a debit that is no
+    longer covered fails on its own without failing the batch. All wallet
+    changes are summed per user and written with one UPDATE.
+
+    Returns one ``{'id', 'status'}`` or ``{'id', 'error'}`` per requested id.
+    """
+    new_status = ACTIONS[action]
+    requests = {
+        pk: (user_id, amount)
+        for pk, user_id, amount in model.objects.select_for_update()
+        .filter(pk__in=ids, status='PENDING').order_by('pk').values_list('pk', 'user_id', 'amount')
+    }
+    missing = set(ids) - set(requests)
+    if missing:
+        # Tell apart unknown ids from requests someone already processed
+        processed = set(model.objects.filter(pk__in=missing).values_list('pk', flat=True))
+    else:
+        processed = set()
+
+    wallets = lock_wallets({user_id for user_id, _ in requests.values()}) if action == 'approve' else {}
+    deltas = defaultdict(lambda: (Decimal(0), Decimal(0)))
+    entries = []
+    accepted = []
+    results = {}
+    for pk in sorted(requests):
+        user_id, amount = requests[pk]
+        if action == 'approve':
+            if user_id not in wallets:
+                results[pk] = {'id': pk, 'error': 'User has no wallet'}
+                continue
+            cash, gold = delta(amount)
+            balance, gold_holdings = wallets[user_id]
+            if balance + cash < 0:
+                results[pk] = {'id': pk, 'error': 'Insufficient balance'}
+                continue
+            if gold_holdings + gold < 0:
+                results[pk] = {'id': pk, 'error': 'Insufficient gold holdings'}
+                continue
+            wallets[user_id] = (balance + cash, gold_holdings + gold)
+            previous_cash, previous_gold = deltas[user_id]
+            deltas[user_id] = (previous_cash + cash, previous_gold + gold)
+            entries.append(LedgerEntry(
+                user_id=user_id, cash_delta=cash, gold_delta=gold, reason=reason, reference=f'{reference}:{pk}'
+            ))
+        accepted.append(pk)
+        results[pk] = {'id': pk, 'status': new_status}
+
+    model.objects.filter(pk__in=accepted).update(status=new_status, approved_at=timezone.now(), approved_by=admin)
+    invalidate_responses(model, {requests[pk][0] for pk in accepted})
+    # The wallets are still locked from above
+    bulk_adjust_wallets(deltas, entries, locked=True)
+
+    for pk in missing:
+        results[pk] = {'id': pk, 'error': 'Already processed' if pk in processed else 'Not found'}
+    return [results[pk] for pk in ids]
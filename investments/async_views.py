@@ -0,0 +1,35 @@
+from django.views import View
+
+from accounts.async_views import render_json
+from .fast_serializers import values_serializer
+from .models import GoldPrice, MarketNews
+from .pagination import TimestampCursorPagination
+from .serializers import GoldPriceSerializer, MarketNewsSerializer
+
+
+class MarketNewsAsyncView(View):
+    """Async ``MarketNewsView``, same response body."""
+    
+    async def get(self, request, *args, **kwargs):
+        news = [item async for item in MarketNews.objects.all()[:10]]
+        return render_json(MarketNewsSerializer(news, many=True).data)
+
+
+class GoldPriceAsyncView(View):
+    """
+    Async read of the most recent gold prices, newest first: ``results``
+    holds ``page_size`` prices rendered like ``GoldPriceListCreateView``.
+    Older pages are served by the cursor-paginated sync endpoint.
+    """
+    pagination = TimestampCursorPagination
+    
+    async def get(self, request, *args, **kwargs):
+        try:
+            page_size = int(request.GET.get('page_size', self.pagination.page_size))
+        except ValueError:
+            page_size = self.pagination.page_size
+        page_size = min(max(page_size, 1), self.pagination.max_page_size)
+        
+        serializer = values_serializer(GoldPriceSerializer)
+        rows = GoldPrice.objects.order_by(*self.pagination.ordering).values(*serializer.lookups)[:page_size]
+        return render_json({'results': serializer.to_representation([row async for row in rows])})
@@ -0,0 +1,120 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.db import transaction
+from django.db.models import Max, Min
+
+from .models import GoldPrice, PriceCandle
+
+INTERVALS = {
+    '1m': timedelta(minutes=1),
+    '5m': timedelta(minutes=5),
+    '1h': timedelta(hours=1),
+    '1d': timedelta(days=1),
+}
+
+# Each interval is rolled up from the next smaller one
+ROLLUPS = [('1m', '5m'), ('5m', '1h'), ('1h', '1d')]
+
+EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+
+def bucket_start(timestamp, interval):
+    """Start of the ``interval`` bucket containing ``timestamp`` (UTC aligned)."""
+    return timestamp - (timestamp - EPOCH) % INTERVALS[interval]
+
+
+def merge_candles(candles):
+    """Combine ``(open, high, low, close, tick_count)`` rows ordered by bucket."""
+    return {
+        'open': candles[0][0],
+        'high': max(candle[1] for candle in candles),
+        'low': min(candle[2] for candle in candles),
+        'close': candles[-1][3],
+        'tick_count': sum(candle[4] for candle in candles),
+    }
+
+
+def rollup(interval, bucket):
+    """Recompute one ``interval`` candle from the smaller candles inside it."""
+    child = next(smaller for smaller, larger in ROLLUPS if larger == interval)
+    children = list(
+        PriceCandle.objects.filter(
+            interval=child, bucket__gte=bucket, bucket__lt=bucket + INTERVALS[interval],
+        ).order_by('bucket').values_list('open', 'high', 'low', 'close', 'tick_count')
+    )
+    if children:
+        PriceCandle.objects.update_or_create(interval=interval, bucket=bucket, defaults=merge_candles(children))
+
+
+@transaction.atomic
+def record_tick(price, timestamp):
+    """
+    Fold a live tick into its 1m candle, then roll it up to 5m, 1h and 1d.
+    Ticks can commit out of order, so the tick only becomes the open or
+    close if no stored tick in the bucket is older or newer than it.
+    """
+    bucket = bucket_start(timestamp, '1m')
+    candle, created = PriceCandle.objects.select_for_update().get_or_create(
+        interval='1m',
+        bucket=bucket,
+        defaults={'open': price, 'high': price, 'low': price, 'close': price, 'tick_count': 1},
+    )
+    if not created:
+        span = GoldPrice.objects.filter(timestamp__gte=bucket, timestamp__lt=bucket + INTERVALS['1m']).aggregate(
+            first=Min('timestamp'), last=Max('timestamp'),
+        )
+        if span['first'] is None or timestamp <= span['first']:
+            candle.open = price
+        if span['last'] is None or timestamp >= span['last']:
+            candle.close = price
+        candle.high = max(candle.high, price)
+        candle.low = min(candle.low, price)
+        candle.tick_count += 1
+        candle.save(update_fields=['open', 'high', 'low', 'close', 'tick_count'])
+
+    for _, larger in ROLLUPS:
+        rollup(larger, bucket_start(timestamp, larger))
+
+
+def _group(rows, interval):
+    """Group ``(timestamp, open, high, low, close, tick_count)`` rows into candles."""
+    candles = []
+    bucket, members = None, []
+    for row in rows:
+        start = bucket_start(row[0], interval)
+        if start != bucket and members:
+            candles.append(PriceCandle(interval=interval, bucket=bucket, **merge_candles(members)))
+            members = []
+        bucket = start
+        members.append(row[1:])
+    if members:
+        candles.append(PriceCandle(interval=interval, bucket=bucket, **merge_candles(members)))
+    return candles
+
+
+@transaction.atomic
+def rebuild_candles(start, end, batch_size=1000):
+    """
+    Rebuild the candles covering ``[start, end]``: 1m candles from raw ticks,
+    then each larger interval from the stored candles one size down, so only
+    the buckets touching the range are rewritten. Returns the number of
+    candles written.
+    """
+    first, last = bucket_start(start, '1m'), bucket_start(end, '1m') + INTERVALS['1m']
+    rows = (
+        (timestamp, price, price, price, price, 1)
+        for timestamp, price in GoldPrice.objects.filter(timestamp__gte=first, timestamp__lt=last)
+        .order_by('timestamp').values_list('timestamp', 'price').iterator(chunk_size=batch_size)
+    )
+    PriceCandle.objects.filter(interval='1m', bucket__gte=first, bucket__lt=last).delete()
+    written = len(PriceCandle.objects.bulk_create(_group(rows, '1m'), batch_size=batch_size))
+
+    for smaller, larger in ROLLUPS:
+        first, last = bucket_start(start, larger), bucket_start(end, larger) + INTERVALS[larger]
+        rows = list(
+            PriceCandle.objects.filter(interval=smaller, bucket__gte=first, bucket__lt=last)
+            .order_by('bucket').values_list('bucket', 'open', 'high', 'low', 'close', 'tick_count')
+        )
+        PriceCandle.objects.filter(interval=larger, bucket__gte=first, bucket__lt=last).delete()
+        written += len(PriceCandle.objects.bulk_create(_group(rows, larger), batch_size=batch_size))
+    return written
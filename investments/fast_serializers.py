@@ -0,0 +1,131 @@
+from decimal import Decimal, getcontext
+from functools import lru_cache
+
+from django.core.exceptions import ImproperlyConfigured
+from django.utils import timezone
+from rest_framework import relations, serializers
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+
+def _decimal_converter(field):
+    """``DecimalField.to_representation`` for the default coerce-to-string case."""
+    exponent = Decimal('.1') ** field.decimal_places
+    context = getcontext().copy()
+    context.prec = field.max_digits
+    rounding = field.rounding
+
+    def convert(value):
+        return '{:f}'.format(value.quantize(exponent, rounding=rounding, context=context))
+    return convert
+
+
+def _datetime_converter(field, tz):
+    """``DateTimeField.to_representation`` for ISO 8601 output."""
+    def convert(value):
+        if value.tzinfo is None:
+            return field.to_representation(value)
+        value = value.astimezone(tz).isoformat()
+        if value.endswith('+00:00'):
+            value = value[:-6] + 'Z'
+        return value
+    return convert
+
+
+def _is_plain_decimal(field):
+    return (
+        isinstance(field, serializers.DecimalField)
+        and field.decimal_places is not None and field.max_digits is not None
+        and getattr(field, 'coerce_to_string', api_settings.COERCE_DECIMAL_TO_STRING)
+        and not field.localize and not field.normalize_output
+    )
+
+
+def _is_iso_datetime(field):
+    output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+    return (
+        isinstance(field, serializers.DateTimeField)
+        and output_format is not None and output_format.lower() == 'iso-8601'
+        and not hasattr(field, 'timezone')
+    )
+
+
+class ValuesSerializer:
+    """
+    Read-only twin of a ``ModelSerializer`` that works on ``values()`` rows
+    instead of model instances. Field names, order and representations come
+    from the serializer's own fields, so the rendered JSON is byte-identical;
+    only the per-row serializer machinery is skipped. Dotted sources such as
+    ``user.username`` must follow non-null relations.
+    """
+
+    def __init__(self, serializer_class):
+        self.fields = []
+        for name, field in serializer_class().fields.items():
+            if field.write_only:
+                continue
+            if isinstance(field, (serializers.BaseSerializer, serializers.SerializerMethodField, relations.ManyRelatedField)):
+                raise ImproperlyConfigured(f'{serializer_class.__name__}.{name} cannot be read from values()')
+            if isinstance(field, relations.PrimaryKeyRelatedField) and field.pk_field is None:
+                # values('user') already yields the primary key
+                self.fields.append((name, '__'.join(field.source_attrs), None))
+            elif isinstance(field, relations.RelatedField):
+                raise ImproperlyConfigured(f'{serializer_class.__name__}.{name} cannot be read from values()')
+            else:
+                self.fields.append((name, '__'.join(field.source_attrs), field))
+        self.lookups = [lookup for _, lookup, _ in self.fields]
+
+    def converters(self):
+        tz = timezone.get_current_timezone()
+        converters = []
+        for name, lookup, field in self.fields:
+            if field is None:
+                convert = None
+            elif _is_plain_decimal(field):
+                convert = _decimal_converter(field)
+            elif _is_iso_datetime(field):
+                convert = _datetime_converter(field, tz)
+            else:
+                convert = field.to_representation
+            converters.append((name, lookup, convert))
+        return converters
+
+    def to_representation(self, rows):
+        """Turn ``values()`` dicts into the dicts the serializer would return."""
+        converters = self.converters()
+        data = []
+        for row in rows:
+            item = {}
+            for name, lookup, convert in converters:
+                value = row[lookup]
+                item[name] = value if value is None or convert is None else convert(value)
+            data.append(item)
+        return data
+
+
+@lru_cache(maxsize=None)
+def values_serializer(serializer_class):
+    return ValuesSerializer(serializer_class)
+
+
+class ValuesListMixin:
+    """
+    List through ``values()`` and ``ValuesSerializer`` instead of building a
+    model instance and a serializer per row. Meant for read-only, high-volume
+    list endpoints; create and the other actions are left untouched.
+    """
+
+    def list(self, request, *args, **kwargs):
+        serializer = values_serializer(self.get_serializer_class())
+        lookups = list(serializer.lookups)
+        if self.paginator is not None:
+            # Cursor pagination reads the ordering fields off the last row
+            for ordering in getattr(self.paginator, 'ordering', ()):
+                if ordering.lstrip('-') not in lookups:
+                    lookups.append(ordering.lstrip('-'))
+
+        queryset = self.filter_queryset(self.get_queryset()).values(*lookups)
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(serializer.to_representation(page))
+        return Response(serializer.to_representation(queryset))
@@ -0,0 +1,16 @@
+from functools import partial
+
+from django.db import transaction
+
+
+def after_commit(func, *args):
+    """
+    Run ``func(*args)`` once the current transaction commits. Robust: an
+    exception is logged instead of failing the request that committed or
+    stopping the hooks registered after it. The callback keeps ``func``'s
+    ``__qualname__``, which Django 4.2.0 reads to log the error and a bare
+    ``partial`` doesn't have.
+    """
+    callback = partial(func, *args)
+    callback.__qualname__ = getattr(func, '__qualname__', repr(func))
+    transaction.on_commit(callback, robust=True)
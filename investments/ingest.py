@@ -0,0 +1,131 @@
+import csv
+import json
+from itertools import islice
+
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from gold_flux.middleware import invalidate_responses
+from .alerts import alert_index
+from .candles import rebuild_candles
+from .hooks import after_commit
+from .matching import order_book
+from .models import GoldPrice
+from .pricing import latest_price
+from .settlement import InvalidAmount, quantize_cash
+from .streams import price_broadcaster, price_payload
+
+FORMATS = ('ndjson', 'csv')
+
+
+class PriceImportError(ValueError):
+    pass
+
+
+def _decode(lines):
+    for line in lines:
+        yield line.decode('utf-8') if isinstance(line, bytes) else line
+
+
+def _price_row(line_number, timestamp, price):
+    parsed = parse_datetime(timestamp) if isinstance(timestamp, str) else None
+    if parsed is None:
+        raise PriceImportError(f'Line {line_number}: invalid timestamp {timestamp!r}')
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    try:
+        price = quantize_cash(price)
+    except InvalidAmount:
+        raise PriceImportError(f'Line {line_number}: invalid price {price!r}')
+    if price <= 0:
+        raise PriceImportError(f'Line {line_number}: price must be positive')
+    return parsed, price
+
+
+def parse_ndjson(lines):
+    """Yield ``(timestamp, price)`` from lines like ``{"timestamp": ..., "price": ...}``."""
+    for line_number, line in enumerate(_decode(lines), start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+            timestamp, price = record['timestamp'], record['price']
+        except (ValueError, KeyError, TypeError):
+            raise PriceImportError(f'Line {line_number}: expected a JSON object with timestamp and price')
+        yield _price_row(line_number, timestamp, price)
+
+
+def parse_csv(lines):
+    """Yield ``(timestamp, price)`` from CSV with a ``timestamp,price`` header."""
+    reader = csv.DictReader(_decode(lines))
+    if not reader.fieldnames or not {'timestamp', 'price'} <= set(reader.fieldnames):
+        raise PriceImportError('CSV header must include timestamp and price columns')
+    for line_number, record in enumerate(reader, start=2):
+        yield _price_row(line_number, record['timestamp'], record['price'])
+
+
+def parse_prices(lines, fmt):
+    if fmt == 'ndjson':
+        return parse_ndjson(lines)
+    if fmt == 'csv':
+        return parse_csv(lines)
+    raise PriceImportError(f"Unsupported format {fmt!r}; expected one of: {', '.join(FORMATS)}")
+
+
+@transaction.atomic
+def import_prices(rows, chunk_size=1000):
+    """
+    Insert ``(timestamp, price)`` rows in ``bulk_create`` chunks inside one
+    transaction. Timestamps are unique, so rows whose timestamp is already
+    stored or repeated in the input are skipped by the database
+    (``ignore_conflicts``) rather than by a lookup first. Candles, the
+    latest-price cache and, when the batch carries a newer price, the order
+    book, alerts and live streams are refreshed once for the whole batch
+    instead of once per row.
+    """
+    try:
+        previous = latest_price.get()[0]
+    except GoldPrice.DoesNotExist:
+        previous = None
+
+    stats = {'received': 0, 'inserted': 0, 'duplicates': 0}
+    first = last = None
+    rows = iter(rows)
+
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            break
+        stats['received'] += len(chunk)
+
+        low = min(timestamp for timestamp, _ in chunk)
+        high = max(timestamp for timestamp, _ in chunk)
+        # ignore_conflicts doesn't say which rows went in, so count the
+        # chunk's timestamp range (an index range scan) before and after
+        stored = GoldPrice.objects.filter(timestamp__gte=low, timestamp__lte=high)
+        before = stored.count()
+        GoldPrice.objects.bulk_create(
+            [GoldPrice(timestamp=timestamp, price=price) for timestamp, price in chunk], ignore_conflicts=True
+        )
+        inserted = stored.count() - before
+
+        stats['inserted'] += inserted
+        stats['duplicates'] += len(chunk) - inserted
+        if inserted:
+            first = low if first is None else min(first, low)
+            last = high if last is None else max(last, high)
+
+    if not stats['inserted']:
+        return stats
+
+    rebuild_candles(first, last)
+    invalidate_responses(GoldPrice)
+    # The stored row, not the input's: its newest timestamp may have been a duplicate
+    newest = GoldPrice.objects.order_by('-timestamp').only('timestamp', 'price').first()
+    after_commit(latest_price.update, newest.timestamp, newest.price)
+    if previous is None or newest.timestamp > previous:
+        after_commit(order_book.on_tick, newest.price)
+        after_commit(alert_index.on_tick, newest.price)
+        after_commit(price_broadcaster.publish, price_payload(newest.timestamp, newest.price))
+    return stats
@@ -0,0 +1,97 @@
+from types import SimpleNamespace
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models.query import QuerySet
+from django.urls import URLPattern, URLResolver, get_resolver
+from rest_framework.exceptions import APIException
+from rest_framework.generics import GenericAPIView
+
+from accounts.models import User
+
+# Plan fragments that mean "reads the whole table" or "sorts in memory"
+PLAN_WARNINGS = {
+    'sqlite': [
+        ('full scan', lambda line: ' SCAN ' in f' {line} ' and 'USING' not in line),
+        ('sort step', lambda line: 'TEMP B-TREE' in line),
+    ],
+    'postgresql': [
+        ('full scan', lambda line: 'Seq Scan' in line),
+        ('sort step', lambda line: line.lstrip(' ->').startswith('Sort')),
+    ],
+}
+
+
+def iter_api_views(patterns, prefix=''):
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            yield from iter_api_views(pattern.url_patterns, prefix + str(pattern.pattern))
+        elif isinstance(pattern, URLPattern):
+            view_class = getattr(pattern.callback, 'view_class', None)
+            if view_class and issubclass(view_class, GenericAPIView):
+                yield prefix + str(pattern.pattern), view_class
+
+
+class Command(BaseCommand):
+    help = "Run every API view's queryset through EXPLAIN and report full scans and sort steps"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--fail', action='store_true', help='Exit with an error if any view has a warning')
+        parser.add_argument('--verbose-plans', action='store_true', help='Print the full plan for every view')
+
+    def handle(self, *args, **options):
+        checks = PLAN_WARNINGS.get(connection.vendor)
+        if checks is None:
+            raise CommandError(f'EXPLAIN checks are not defined for {connection.vendor}')
+
+        # An unsaved admin principal: user-scoped filters and admin-only
+        # querysets both compile to their real shape without touching data
+        user = User(pk=0, username='explain', is_admin=True)
+        seen = set()
+        flagged = 0
+
+        for route, view_class in iter_api_views(get_resolver().url_patterns):
+            if view_class in seen:
+                continue
+            seen.add(view_class)
+
+            try:
+                queryset = self._build_queryset(view_class, user)
+            except APIException:
+                # e.g. a search view that requires query parameters
+                self.stdout.write(f'{view_class.__name__} ({route}): skipped (needs request parameters)')
+                continue
+            if not isinstance(queryset, QuerySet):
+                self.stdout.write(f'{view_class.__name__} ({route}): skipped (no queryset)')
+                continue
+
+            plan = queryset.explain()
+            warnings = sorted({label for line in plan.splitlines() for label, check in checks if check(line)})
+            if warnings:
+                flagged += 1
+                self.stdout.write(self.style.WARNING(f'{view_class.__name__} ({route}): {", ".join(warnings)}'))
+            else:
+                self.stdout.write(f'{view_class.__name__} ({route}): ok')
+            if warnings or options['verbose_plans']:
+                for line in plan.splitlines():
+                    self.stdout.write(f'    {line}')
+
+        if flagged and options['fail']:
+            raise CommandError(f'{flagged} view(s) need an index')
+
+    def _build_queryset(self, view_class, user):
+        if view_class.queryset is None and view_class.get_queryset is GenericAPIView.get_queryset:
+            return None
+        view = view_class()
+        view.request = SimpleNamespace(user=user, query_params={})
+        view.args, view.kwargs, view.format_kwarg = (), {}, None
+        queryset = view.get_queryset()
+        if not isinstance(queryset, QuerySet):
+            return None
+
+        # Explain the query the paginator actually issues for the first page
+        paginator = view.pagination_class
+        ordering = getattr(paginator, 'ordering', None)
+        if ordering:
+            queryset = queryset.order_by(*ordering)[:paginator.page_size + 1]
+        return queryset
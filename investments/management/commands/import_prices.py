@@ -0,0 +1,38 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from investments.ingest import FORMATS, PriceImportError, import_prices, parse_prices
+
+
+class Command(BaseCommand):
+    help = 'Bulk import gold prices from an NDJSON or CSV file (use - for stdin)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='File to import, or - to read stdin')
+        parser.add_argument('--format', choices=FORMATS, help='Input format (default: from the file extension)')
+        parser.add_argument('--chunk-size', type=int, default=1000, help='Rows per bulk insert')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        fmt = options['format']
+        if fmt is None:
+            if path.endswith('.csv'):
+                fmt = 'csv'
+            elif path.endswith(('.ndjson', '.jsonl')):
+                fmt = 'ndjson'
+            else:
+                raise CommandError('Cannot infer the format; pass --format')
+
+        stream = sys.stdin if path == '-' else open(path, newline='', encoding='utf-8')
+        try:
+            stats = import_prices(parse_prices(stream, fmt), chunk_size=options['chunk_size'])
+        except PriceImportError as exc:
+            raise CommandError(str(exc))
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {stats['inserted']} of {stats['received']} prices ({stats['duplicates']} duplicates skipped)."
+        ))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from investments.maturity import mature_gold_locks
+
+
+class Command(BaseCommand):
+    help = 'Mature due gold locks and pay the gold plus interest back to wallets'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='Locks settled per transaction (default: 500)')
+
+    def handle(self, *args, **options):
+        matured, paid = mature_gold_locks(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Matured {matured} gold locks, paying out {paid} gold.'))
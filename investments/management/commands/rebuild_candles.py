@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Max, Min
+from django.utils.dateparse import parse_datetime
+
+from investments.candles import rebuild_candles
+from investments.models import GoldPrice
+
+
+class Command(BaseCommand):
+    help = 'Rebuild OHLC candles from raw GoldPrice ticks'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--from', dest='start', help='ISO timestamp to rebuild from (default: first tick)')
+        parser.add_argument('--to', dest='end', help='ISO timestamp to rebuild up to (default: last tick)')
+
+    def handle(self, *args, **options):
+        bounds = GoldPrice.objects.aggregate(start=Min('timestamp'), end=Max('timestamp'))
+        start = self._parse(options['start']) or bounds['start']
+        end = self._parse(options['end']) or bounds['end']
+        if start is None or end is None:
+            self.stdout.write('No gold prices to aggregate.')
+            return
+
+        count = rebuild_candles(start, end)
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {count} candles between {start} and {end}.'))
+
+    def _parse(self, value):
+        if value is None:
+            return None
+        parsed = parse_datetime(value)
+        if parsed is None:
+            raise CommandError(f'Invalid timestamp: {value}')
+        return parsed
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from investments.models import GoldPrice
+from investments.snapshots import snapshot_portfolios
+
+
+class Command(BaseCommand):
+    help = "Snapshot every user's portfolio at the current gold price"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Wallets per chunk (default: 1000)')
+
+    def handle(self, *args, **options):
+        try:
+            written, skipped = snapshot_portfolios(batch_size=options['batch_size'])
+        except GoldPrice.DoesNotExist:
+            raise CommandError('No gold price available')
+        self.stdout.write(self.style.SUCCESS(
+            f'Wrote {written} portfolio snapshots; skipped {skipped} already taken today.'
+        ))
@@ -0,0 +1,215 @@
+import heapq
+import logging
+import threading
+import time
+from collections import defaultdict
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max
+
+from accounts.ledger import InsufficientFunds, bulk_adjust_wallets, lock_wallets
+from accounts.models import LedgerEntry
+from gold_flux.middleware import invalidate_responses
+from .models import Transaction
+from .settlement import trade_value
+from .tailing import RowTail
+
+logger = logging.getLogger(__name__)
+
+# Number of crossed orders settled per database transaction
+SETTLE_BATCH_SIZE = 500
+
+# Rows per query when reloading the whole book
+SYNC_CHUNK_SIZE = 2000
+
+ORDER_FIELDS = ('status', 'transaction_type', 'order_type', 'limit_price', 'stop_price')
+
+
+class SettlementConflict(Exception):
+    """Another settler claimed some of a batch's orders first."""
+
+
+class OrderBook:
+    """
+    Resting LIMIT and STOP orders kept in price-ordered heaps, so a price
+    tick only pops the orders it crosses instead of scanning every pending row.
+
+    Each tick reads only the orders added since the last one (``RowTail``).
+    Orders cancelled in this process leave through ``discard``; their heap
+    entries are dropped when they surface or when the heaps are compacted.
+    Every ``ORDER_BOOK_RECONCILE_INTERVAL`` seconds the book is reloaded
+    from the pending rows, which picks up what the tail can't see: orders
+    cancelled by other processes and inserts that took long to commit.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        # BUY limits and SELL stops trigger when the price falls to their level
+        # (max-heap on the level), SELL limits and BUY stops when it rises to it
+        # (min-heap on the level).
+        self._falling = []
+        self._rising = []
+        # Ids of the live orders; heap entries for any other id are dead
+        self._known = set()
+        self._tail = RowTail()
+        # Monotonic time of the last full reload, None until the first
+        self._reconciled_at = None
+
+    def __len__(self):
+        return len(self._known)
+
+    def add(self, order_id, transaction_type, order_type, limit_price=None, stop_price=None):
+        level = limit_price if order_type == 'LIMIT' else stop_price
+        if level is None or order_id in self._known:
+            return
+        level = Decimal(level)
+        falling = (order_type == 'LIMIT') == (transaction_type == 'BUY')
+        if falling:
+            heapq.heappush(self._falling, (-level, order_id))
+        else:
+            heapq.heappush(self._rising, (level, order_id))
+        self._known.add(order_id)
+
+    def discard(self, order_id):
+        """Forget an order that is no longer pending."""
+        with self._lock:
+            self._known.discard(order_id)
+            self._compact()
+
+    def _compact(self):
+        # Rebuild once dead entries outnumber live ones: O(n), amortized
+        # over the removals that produced them
+        if len(self._falling) + len(self._rising) > 2 * len(self._known) + 1000:
+            self._falling = [entry for entry in self._falling if entry[1] in self._known]
+            self._rising = [entry for entry in self._rising if entry[1] in self._known]
+            heapq.heapify(self._falling)
+            heapq.heapify(self._rising)
+
+    def reconcile(self):
+        """Reload the book from every pending LIMIT and STOP order."""
+        self.clear()
+        # Read the high-water mark first: rows above it are seen by the tail
+        self._tail.reset(Transaction.objects.aggregate(last=Max('pk'))['last'])
+        rows = (
+            Transaction.objects.filter(status='PENDING', order_type__in=['LIMIT', 'STOP'])
+            .values_list('pk', 'transaction_type', 'order_type', 'limit_price', 'stop_price')
+            .iterator(chunk_size=SYNC_CHUNK_SIZE)
+        )
+        for row in rows:
+            self.add(*row)
+        self._reconciled_at = time.monotonic()
+
+    def sync(self):
+        """Add the pending orders created since the last sync, or reload when due."""
+        interval = getattr(settings, 'ORDER_BOOK_RECONCILE_INTERVAL', 300)
+        if self._reconciled_at is None or time.monotonic() - self._reconciled_at >= interval:
+            self.reconcile()
+            return
+        for order_id, status, *order in self._tail.poll(Transaction.objects.all(), ORDER_FIELDS):
+            if status == 'PENDING':
+                self.add(order_id, *order)
+
+    def match(self, price):
+        """Pop and return the ids of every live order crossed by ``price``."""
+        crossed = []
+        while self._falling and -self._falling[0][0] >= price:
+            order_id = heapq.heappop(self._falling)[1]
+            if order_id in self._known:
+                self._known.remove(order_id)
+                crossed.append(order_id)
+        while self._rising and self._rising[0][0] <= price:
+            order_id = heapq.heappop(self._rising)[1]
+            if order_id in self._known:
+                self._known.remove(order_id)
+                crossed.append(order_id)
+        return crossed
+
+    def on_tick(self, price):
+        price = Decimal(price)
+        with self._lock:
+            self.sync()
+            crossed = self.match(price)
+        crossed.sort()
+        for start in range(0, len(crossed), SETTLE_BATCH_SIZE):
+            try:
+                settle_orders(crossed[start:start + SETTLE_BATCH_SIZE], price)
+            except SettlementConflict:
+                # The batch was rolled back; its orders are pending again
+                # but out of the book, so reload it on the next tick
+                logger.warning('Order settlement conflicted with another settler; reloading the book')
+                self._reconciled_at = None
+        return crossed
+
+
+@transaction.atomic
+def settle_orders(order_ids, price):
+    """
+    Fill a batch of crossed orders at ``price`` in a fixed number of
+    statements; returns the ids of the orders executed and cancelled.
+
+    The batch is claimed with one ``UPDATE ... WHERE id IN (...) AND
+    status = 'PENDING'``; if another settler got to some of the orders
+    first, the batch is rolled back with ``SettlementConflict``. The
+    claim is the first write, so the wallets read after it can't change
+    underneath (row locks on PostgreSQL, the write lock on SQLite). Orders
+    are then applied in user, id order against the locked balances: an
+    order the wallet can no longer cover is cancelled on its own. The
+    per-user sums are written with ``bulk_adjust_wallets``' single
+    guarded CASE UPDATE.
+    """
+    orders = list(
+        Transaction.objects.filter(pk__in=order_ids, status='PENDING')
+        .order_by('user_id', 'pk')
+        .values_list('pk', 'user_id', 'transaction_type', 'amount')
+    )
+    if not orders:
+        return [], []
+    claimed = Transaction.objects.filter(pk__in=[order[0] for order in orders], status='PENDING').update(
+        status='EXECUTED', executed_price=price
+    )
+    if claimed != len(orders):
+        raise SettlementConflict(f'{len(orders) - claimed} of {len(orders)} orders were settled elsewhere')
+
+    wallets = lock_wallets({user_id for _, user_id, _, _ in orders})
+    executed, cancelled, entries = [], [], []
+    deltas = defaultdict(lambda: (Decimal(0), Decimal(0)))
+    for order_id, user_id, transaction_type, amount in orders:
+        value = trade_value(amount, price)
+        if transaction_type == 'BUY':
+            cash_delta, gold_delta = -value, amount
+        else:
+            cash_delta, gold_delta = value, -amount
+        if user_id not in wallets:
+            cancelled.append(order_id)
+            continue
+        balance, gold_holdings = wallets[user_id]
+        if balance + cash_delta < 0 or gold_holdings + gold_delta < 0:
+            cancelled.append(order_id)
+            continue
+        wallets[user_id] = (balance + cash_delta, gold_holdings + gold_delta)
+        previous_cash, previous_gold = deltas[user_id]
+        deltas[user_id] = (previous_cash + cash_delta, previous_gold + gold_delta)
+        executed.append(order_id)
+        entries.append(LedgerEntry(
+            user_id=user_id, cash_delta=cash_delta, gold_delta=gold_delta,
+            reason='TRADE', reference=f'transaction:{order_id}',
+        ))
+
+    if cancelled:
+        Transaction.objects.filter(pk__in=cancelled).update(status='CANCELLED', executed_price=None)
+    # UPDATE sends no signals; bulk_adjust_wallets expires the wallet caches
+    invalidate_responses(Transaction, {user_id for _, user_id, _, _ in orders})
+    try:
+        bulk_adjust_wallets(deltas, entries, locked=True)
+    except InsufficientFunds:
+        # Only where the wallet reads took no lock and something still wrote
+        raise SettlementConflict('A wallet changed during settlement')
+    return executed, cancelled
+
+
+order_book = OrderBook()
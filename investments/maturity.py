@@ -0,0 +1,64 @@
+from collections import defaultdict
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import transaction
+from django.utils import timezone
+
+from accounts.ledger import bulk_adjust_wallets
+from accounts.models import LedgerEntry
+from gold_flux.middleware import invalidate_responses
+from .models import GoldLock
+from .settlement import quantize_gold, to_decimal
+
+YEAR = timedelta(days=365)
+
+
+def accrued_interest(amount, interest_rate, start_date, end_date):
+    """Simple interest on ``amount`` gold at ``interest_rate`` percent a year over the lock term."""
+    years = Decimal((end_date - start_date) // timedelta(microseconds=1)) / Decimal(YEAR // timedelta(microseconds=1))
+    return quantize_gold(to_decimal(amount) * to_decimal(interest_rate) / 100 * max(years, Decimal(0)))
+
+
+@transaction.atomic
+def _mature_batch(now, batch_size):
+    locks = list(
+        GoldLock.objects.select_for_update()
+        .filter(status='APPROVED', end_date__lte=now)
+        .order_by('end_date', 'id')
+        .values_list('id', 'user_id', 'amount', 'interest_rate', 'start_date', 'end_date')[:batch_size]
+    )
+    if not locks:
+        return 0, Decimal(0)
+
+    credits = defaultdict(Decimal)
+    entries = []
+    for lock_id, user_id, amount, interest_rate, start_date, end_date in locks:
+        payout = amount + accrued_interest(amount, interest_rate, start_date, end_date)
+        credits[user_id] += payout
+        entries.append(LedgerEntry(
+            user_id=user_id, gold_delta=payout, reason='LOCK_MATURITY', reference=f'gold_lock:{lock_id}'
+        ))
+
+    GoldLock.objects.filter(pk__in=[lock[0] for lock in locks]).update(status='MATURED', matured=True)
+    invalidate_responses(GoldLock, credits)
+    bulk_adjust_wallets({user_id: (0, gold) for user_id, gold in credits.items()}, entries)
+    return len(locks), sum(credits.values())
+
+
+def mature_gold_locks(now=None, batch_size=500):
+    """
+    Release every approved lock whose ``end_date`` has passed: return the
+    locked gold plus accrued interest to the owner's wallet and mark the
+    lock MATURED. Each batch is its own transaction that claims its locks
+    and pays them together, so the job can be stopped at any point and
+    re-run without paying a lock twice. Returns ``(locks, gold_paid)``.
+    """
+    now = now or timezone.now()
+    matured, paid = 0, Decimal(0)
+    while True:
+        count, gold = _mature_batch(now, batch_size)
+        if not count:
+            return matured, paid
+        matured += count
+        paid += gold
@@ -0,0 +1,33 @@
+# Generated by Django 4.2 on 2026-10-18 14:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('investments', '0003_marketnews_transaction_executed_price_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PriceCandle',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('interval', models.CharField(choices=[('1m', '1 Minute'), ('5m', '5 Minutes'), ('1h', '1 Hour'), ('1d', '1 Day')], max_length=2)),
+                ('bucket', models.DateTimeField()),
+                ('open', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('high', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('low', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('close', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('tick_count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['interval', 'bucket'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='pricecandle',
+            constraint=models.UniqueConstraint(fields=('interval', 'bucket'), name='unique_candle_interval_bucket'),
+        ),
+    ]
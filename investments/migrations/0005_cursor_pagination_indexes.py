@@ -0,0 +1,33 @@
+# Generated by Django 4.2 on 2026-10-18 14:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('investments', '0004_pricecandle'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='depositrequest',
+            index=models.Index(fields=['-created', '-id'], name='deposit_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='goldlock',
+            index=models.Index(fields=['-created', '-id'], name='goldlock_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='goldprice',
+            index=models.Index(fields=['-timestamp', '-id'], name='goldprice_timestamp_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['-timestamp', '-id'], name='transaction_timestamp_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='withdrawalrequest',
+            index=models.Index(fields=['-created', '-id'], name='withdrawal_created_idx'),
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 4.2 on 2026-10-18 14:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('investments', '0005_cursor_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='depositrequest',
+            index=models.Index(fields=['user', '-created', '-id'], name='deposit_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='depositrequest',
+            index=models.Index(fields=['status', '-created'], name='deposit_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='goldlock',
+            index=models.Index(fields=['user', '-created', '-id'], name='goldlock_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='goldlock',
+            index=models.Index(fields=['status', '-created'], name='goldlock_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='marketnews',
+            index=models.Index(fields=['-published_date'], name='marketnews_published_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='portfoliosnapshot',
+            index=models.Index(fields=['user', '-date', '-id'], name='snapshot_user_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pricealert',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['user', '-created', '-id'], name='pricealert_user_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['user', '-timestamp', '-id'], name='transaction_user_ts_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(condition=models.Q(('status', 'PENDING')), fields=['id'], name='transaction_pending_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='withdrawalrequest',
+            index=models.Index(fields=['user', '-created', '-id'], name='withdrawal_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='withdrawalrequest',
+            index=models.Index(fields=['status', '-created'], name='withdrawal_status_created_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 4.2 on 2026-10-18 14:15
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('investments', '0006_view_access_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='goldprice',
+            name='timestamp',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+    ]
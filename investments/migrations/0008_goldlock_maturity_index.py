@@ -0,0 +1,17 @@
+# Generated by Django 4.2 on 2026-10-18 14:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('investments', '0007_goldprice_timestamp_default'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='goldlock',
+            index=models.Index(fields=['status', 'end_date'], name='goldlock_status_end_idx'),
+        ),
+    ]
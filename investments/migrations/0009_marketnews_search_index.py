@@ -0,0 +1,81 @@
+# Generated by Django 4.2 on 2026-10-18 18:05
+
+from django.db import migrations
+
+# External-content FTS5 table: the index lives in the FTS table, the text
+# stays in investments_marketnews, and triggers keep the two in sync on
+# every insert, update and delete (including bulk_create and update())
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE investments_marketnews_fts USING fts5(
+        title, summary, source, sentiment, published_date UNINDEXED,
+        content='investments_marketnews', content_rowid='id'
+    )
+    """,
+    """
+    CREATE TRIGGER investments_marketnews_fts_insert AFTER INSERT ON investments_marketnews BEGIN
+        INSERT INTO investments_marketnews_fts(rowid, title, summary, source, sentiment, published_date)
+        VALUES (new.id, new.title, new.summary, new.source, new.sentiment, new.published_date);
+    END
+    """,
+    """
+    CREATE TRIGGER investments_marketnews_fts_delete AFTER DELETE ON investments_marketnews BEGIN
+        INSERT INTO investments_marketnews_fts(investments_marketnews_fts, rowid, title, summary, source, sentiment, published_date)
+        VALUES ('delete', old.id, old.title, old.summary, old.source, old.sentiment, old.published_date);
+    END
+    """,
+    """
+    CREATE TRIGGER investments_marketnews_fts_update AFTER UPDATE ON investments_marketnews BEGIN
+        INSERT INTO investments_marketnews_fts(investments_marketnews_fts, rowid, title, summary, source, sentiment, published_date)
+        VALUES ('delete', old.id, old.title, old.summary, old.source, old.sentiment, old.published_date);
+        INSERT INTO investments_marketnews_fts(rowid, title, summary, source, sentiment, published_date)
+        VALUES (new.id, new.title, new.summary, new.source, new.sentiment, new.published_date);
+    END
+    """,
+    "INSERT INTO investments_marketnews_fts(investments_marketnews_fts) VALUES ('rebuild')",
+]
+
+SQLITE_BACKWARD = [
+    'DROP TRIGGER IF EXISTS investments_marketnews_fts_update',
+    'DROP TRIGGER IF EXISTS investments_marketnews_fts_delete',
+    'DROP TRIGGER IF EXISTS investments_marketnews_fts_insert',
+    'DROP TABLE IF EXISTS investments_marketnews_fts',
+]
+
+# A generated column is recomputed by the database on every write, so it
+# can't drift from the text; title terms rank above summary terms
+POSTGRESQL_FORWARD = [
+    """
+    ALTER TABLE investments_marketnews ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('english'::regconfig, coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english'::regconfig, coalesce(summary, '')), 'B')
+    ) STORED
+    """,
+    'CREATE INDEX marketnews_search_idx ON investments_marketnews USING GIN (search_vector)',
+]
+
+POSTGRESQL_BACKWARD = [
+    'DROP INDEX IF EXISTS marketnews_search_idx',
+    'ALTER TABLE investments_marketnews DROP COLUMN IF EXISTS search_vector',
+]
+
+
+def run_for_vendor(statements):
+    def run(apps, schema_editor):
+        for statement in statements.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('investments', '0008_goldlock_maturity_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            run_for_vendor({'sqlite': SQLITE_FORWARD, 'postgresql': POSTGRESQL_FORWARD}),
+            run_for_vendor({'sqlite': SQLITE_BACKWARD, 'postgresql': POSTGRESQL_BACKWARD}),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2 on 2026-10-18 14:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('investments', '0009_marketnews_search_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='pricealert',
+            index=models.Index(condition=models.Q(('is_active', True), ('triggered__isnull', True)), fields=['id'], name='pricealert_live_idx'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 4.2 on 2026-10-18 14:58
+
+from django.db import migrations, models
+from django.db.models import Count, Min
+import django.utils.timezone
+
+
+def drop_duplicate_ticks(apps, schema_editor):
+    # Keep the first row stored for each timestamp
+    GoldPrice = apps.get_model('investments', 'GoldPrice')
+    duplicates = (
+        GoldPrice.objects.values('timestamp').annotate(rows=Count('id'), keep=Min('id')).filter(rows__gt=1)
+    )
+    for duplicate in duplicates.iterator():
+        GoldPrice.objects.filter(timestamp=duplicate['timestamp']).exclude(pk=duplicate['keep']).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('investments', '0010_pricealert_live_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_duplicate_ticks, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='goldprice',
+            name='timestamp',
+            field=models.DateTimeField(default=django.utils.timezone.now, unique=True),
+        ),
+    ]
@@ -1,12 +1,16 @@
 from django.db import models
+from django.utils import timezone
 from accounts.models import User
 
 class GoldPrice(models.Model):
-    timestamp = models.DateTimeField(auto_now_add=True)
+    timestamp = models.DateTimeField(default=timezone.now, unique=True)
     price = models.DecimalField(max_digits=10, decimal_places=2)
     
     class Meta:
         ordering = ['-timestamp']
+        indexes = [
+            models.Index(fields=['-timestamp', '-id'], name='goldprice_timestamp_idx'),
+        ]
     
     def __str__(self):
         return f"Gold Price: ${self.price} at {self.timestamp}"
@@ -40,6 +44,11 @@ class Transaction(models.Model):
     
     class Meta:
         ordering = ['-timestamp']
+        indexes = [
+            models.Index(fields=['-timestamp', '-id'], name='transaction_timestamp_idx'),
+            models.Index(fields=['user', '-timestamp', '-id'], name='transaction_user_ts_idx'),
+            models.Index(fields=['id'], condition=models.Q(status='PENDING'), name='transaction_pending_idx'),
+        ]
     
     def __str__(self):
         return f"{self.user.username} {self.get_transaction_type_display()} {self.amount} gold"
@@ -55,6 +64,9 @@ class PortfolioSnapshot(models.Model):
     
     class Meta:
         ordering = ['-date']
+        indexes = [
+            models.Index(fields=['user', '-date', '-id'], name='snapshot_user_date_idx'),
+        ]
     
     def __str__(self):
         return f"{self.user.username} portfolio on {self.date}"
@@ -72,6 +84,10 @@ class PriceAlert(models.Model):
     
     class Meta:
         ordering = ['-created']
+        indexes = [
+            models.Index(fields=['user', '-created', '-id'], condition=models.Q(is_active=True), name='pricealert_user_active_idx'),
+            models.Index(fields=['id'], condition=models.Q(is_active=True, triggered__isnull=True), name='pricealert_live_idx'),
+        ]
     
     def __str__(self):
         return f"{self.user.username} alert at ${self.target_price}"
@@ -91,6 +107,9 @@ class MarketNews(models.Model):
     
     class Meta:
         ordering = ['-published_date']
+        indexes = [
+            models.Index(fields=['-published_date'], name='marketnews_published_idx'),
+        ]
     
     def __str__(self):
         return self.title
@@ -119,6 +138,11 @@ class DepositRequest(models.Model):
     
     class Meta:
         ordering = ['-created']
+        indexes = [
+            models.Index(fields=['-created', '-id'], name='deposit_created_idx'),
+            models.Index(fields=['user', '-created', '-id'], name='deposit_user_created_idx'),
+            models.Index(fields=['status', '-created'], name='deposit_status_created_idx'),
+        ]
     
     def __str__(self):
         return f"{self.user.username} - {self.amount} {self.currency} ({self.status})"
@@ -147,6 +171,11 @@ class WithdrawalRequest(models.Model):
     
     class Meta:
         ordering = ['-created']
+        indexes = [
+            models.Index(fields=['-created', '-id'], name='withdrawal_created_idx'),
+            models.Index(fields=['user', '-created', '-id'], name='withdrawal_user_created_idx'),
+            models.Index(fields=['status', '-created'], name='withdrawal_status_created_idx'),
+        ]
     
     def __str__(self):
         return f"{self.user.username} - {self.amount} {self.currency} ({self.status})"
@@ -172,6 +201,37 @@ class GoldLock(models.Model):
     
     class Meta:
         ordering = ['-created']
+        indexes = [
+            models.Index(fields=['-created', '-id'], name='goldlock_created_idx'),
+            models.Index(fields=['user', '-created', '-id'], name='goldlock_user_created_idx'),
+            models.Index(fields=['status', '-created'], name='goldlock_status_created_idx'),
+            models.Index(fields=['status', 'end_date'], name='goldlock_status_end_idx'),
+        ]
     
     def __str__(self):
         return f"{self.user.username} - {self.amount} gold locked ({self.status})"
+
+class PriceCandle(models.Model):
+    INTERVAL_CHOICES = [
+        ('1m', '1 Minute'),
+        ('5m', '5 Minutes'),
+        ('1h', '1 Hour'),
+        ('1d', '1 Day'),
+    ]
+    
+    interval = models.CharField(max_length=2, choices=INTERVAL_CHOICES)
+    bucket = models.DateTimeField()
+    open = models.DecimalField(max_digits=10, decimal_places=2)
+    high = models.DecimalField(max_digits=10, decimal_places=2)
+    low = models.DecimalField(max_digits=10, decimal_places=2)
+    close = models.DecimalField(max_digits=10, decimal_places=2)
+    tick_count = models.PositiveIntegerField(default=0)
+    
+    class Meta:
+        ordering = ['interval', 'bucket']
+        constraints = [
+            models.UniqueConstraint(fields=['interval', 'bucket'], name='unique_candle_interval_bucket'),
+        ]
+    
+    def __str__(self):
+        return f"{self.interval} candle at {self.bucket}"
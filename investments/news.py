@@ -0,0 +1,71 @@
+import hashlib
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import Count
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from .models import MarketNews
+from .serializers import MarketNewsSerializer
+
+CACHE_KEY = 'market_news:feed'
+
+# ETag and change time of the last feed built; kept across invalidations
+VALIDATORS_KEY = 'market_news:validators'
+
+# Items in the public news feed
+FEED_SIZE = 10
+
+
+def _cache():
+    return caches[getattr(settings, 'NEWS_FEED_CACHE_ALIAS', 'default')]
+
+
+def build_feed():
+    """
+    Render the latest news once, with the validators conditional GETs need.
+    The ETag covers the rendered body and the article count, so rebuilding
+    an unchanged feed keeps it. Last-Modified is when this cache first saw
+    that ETag, not a ``published_date``: an edit or a backdated article
+    changes the feed without moving the newest publication date.
+    """
+    news = list(MarketNews.objects.all()[:FEED_SIZE])
+    count = MarketNews.objects.aggregate(count=Count('id'))['count']
+    body = JSONRenderer().render(MarketNewsSerializer(news, many=True).data)
+    etag = f'"{hashlib.sha256(f"{count}:".encode() + body).hexdigest()[:32]}"'
+    previous = _cache().get(VALIDATORS_KEY)
+    if previous is not None and previous[0] == etag:
+        changed_at = previous[1]
+    else:
+        # HTTP dates have one-second resolution; a change within the second
+        # of the last one still has to move past it
+        changed_at = timezone.now().replace(microsecond=0)
+        if previous is not None and changed_at <= previous[1]:
+            changed_at = previous[1] + timedelta(seconds=1)
+        _cache().set(VALIDATORS_KEY, (etag, changed_at), None)
+    return {
+        'body': body,
+        'etag': etag,
+        'last_modified': changed_at if count else None,
+    }
+
+
+def get_feed():
+    """
+    The pre-rendered feed: ``{'body', 'etag', 'last_modified'}``; no
+    ``last_modified`` when there is no news. Rebuilt after ``invalidate_feed``,
+    which MarketNews signals call (code that writes news with
+    ``bulk_create`` or ``update`` must call it too), or after
+    ``NEWS_FEED_CACHE_TTL`` seconds.
+    """
+    feed = _cache().get(CACHE_KEY)
+    if feed is None:
+        feed = build_feed()
+        _cache().set(CACHE_KEY, feed, getattr(settings, 'NEWS_FEED_CACHE_TTL', 60))
+    return feed
+
+
+def invalidate_feed():
+    _cache().delete(CACHE_KEY)
@@ -0,0 +1,24 @@
+from rest_framework.pagination import CursorPagination
+
+
+class TimestampCursorPagination(CursorPagination):
+    """
+    Keyset pagination: each page is a range read on an index, so page N
+    costs the same as page 1. ``id`` breaks ties between equal timestamps.
+    """
+    ordering = ('-timestamp', '-id')
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+
+
+class CreatedCursorPagination(TimestampCursorPagination):
+    ordering = ('-created', '-id')
+
+
+class DateCursorPagination(TimestampCursorPagination):
+    ordering = ('-date', '-id')
+
+
+class DateJoinedCursorPagination(TimestampCursorPagination):
+    ordering = ('-date_joined', '-id')
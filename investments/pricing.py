@@ -0,0 +1,73 @@
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import GoldPrice
+
+CACHE_KEY = 'gold_price:latest'
+
+
+def _cache_ttl():
+    return getattr(settings, 'GOLD_PRICE_CACHE_TTL', 5)
+
+
+class LatestPriceProvider:
+    """
+    Current gold price served from a process-local copy backed by Django's
+    cache, so order and portfolio requests don't query ``GoldPrice``.
+    The local copy is trusted for ``GOLD_PRICE_LOCAL_TTL`` seconds before
+    it is re-read from the cache, and the cached copy for
+    ``GOLD_PRICE_CACHE_TTL`` seconds before it is re-read from the
+    database. Both are refreshed when a tick commits; other workers pick it
+    up from the cache if it is shared, or within the TTLs if it isn't.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        self._latest = None
+        self._expires_at = 0.0
+
+    def _remember(self, latest):
+        with self._lock:
+            self._latest = latest
+            self._expires_at = time.monotonic() + getattr(settings, 'GOLD_PRICE_LOCAL_TTL', 1.0)
+
+    def get(self):
+        """Return ``(timestamp, price)`` of the latest tick."""
+        latest = self._latest
+        if latest is not None and time.monotonic() < self._expires_at:
+            return latest
+
+        latest = cache.get(CACHE_KEY)
+        if latest is None:
+            latest = GoldPrice.objects.order_by('-timestamp').values_list('timestamp', 'price').first()
+            if latest is None:
+                raise GoldPrice.DoesNotExist('No gold price available')
+            cache.set(CACHE_KEY, latest, _cache_ttl())
+        self._remember(latest)
+        return latest
+
+    def update(self, timestamp, price):
+        current = self._latest or cache.get(CACHE_KEY)
+        if current is not None and current[0] > timestamp:
+            return
+        latest = (timestamp, price)
+        cache.set(CACHE_KEY, latest, _cache_ttl())
+        self._remember(latest)
+
+    def invalidate(self):
+        cache.delete(CACHE_KEY)
+        self.clear()
+
+
+latest_price = LatestPriceProvider()
+
+
+def get_latest_price():
+    """Current gold price; raises ``GoldPrice.DoesNotExist`` if there is none."""
+    return latest_price.get()[1]
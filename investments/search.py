@@ -0,0 +1,127 @@
+import re
+
+from django.db import connection
+from django.db.models import Q
+
+from .models import MarketNews
+
+# Must match the text search configuration the 0009 migration indexes with
+SEARCH_CONFIG = 'english'
+
+FTS_TABLE = 'investments_marketnews_fts'
+
+TERM_RE = re.compile(r'\w+')
+
+
+def _quote(text):
+    return '"' + text.replace('"', '""') + '"'
+
+
+def fts5_query(query, sentiment=None, source=None):
+    """
+    An FTS5 MATCH expression for user input. Every word becomes a quoted
+    term so punctuation can't be read as query syntax, and the filters are
+    column-scoped terms, so the index narrows on them too.
+    """
+    terms = TERM_RE.findall(query)
+    if not terms:
+        return None
+    parts = ['{title summary} : (' + ' AND '.join(_quote(term) for term in terms) + ')']
+    if sentiment:
+        parts.append(f'sentiment : {_quote(sentiment)}')
+    if source:
+        source_terms = TERM_RE.findall(source)
+        if source_terms:
+            parts.append('source : ' + _quote(' '.join(source_terms)))
+    return ' AND '.join(parts)
+
+
+def _columns():
+    return ', '.join(f'm.{field.column}' for field in MarketNews._meta.concrete_fields)
+
+
+def _sqlite_search(query, sentiment, source, start, end, limit, offset):
+    match = fts5_query(query, sentiment, source)
+    if match is None:
+        return []
+    where = [f'{FTS_TABLE} MATCH %s']
+    params = [match]
+    # The MATCH terms only narrow to articles whose source contains the
+    # same words; the equality check makes the filter exact
+    if source:
+        where.append(f'{FTS_TABLE}.source = %s')
+        params.append(source)
+    if start is not None:
+        where.append(f'{FTS_TABLE}.published_date >= %s')
+        params.append(connection.ops.adapt_datetimefield_value(start))
+    if end is not None:
+        where.append(f'{FTS_TABLE}.published_date <= %s')
+        params.append(connection.ops.adapt_datetimefield_value(end))
+    # Title matches weigh more than summary matches; the filter columns don't count
+    sql = (
+        f'SELECT {_columns()} FROM {FTS_TABLE} '
+        f'JOIN investments_marketnews m ON m.id = {FTS_TABLE}.rowid '
+        f'WHERE {" AND ".join(where)} '
+        f'ORDER BY bm25({FTS_TABLE}, 10.0, 1.0, 0.0, 0.0), m.published_date DESC, m.id DESC '
+        f'LIMIT %s OFFSET %s'
+    )
+    return list(MarketNews.objects.raw(sql, params + [limit, offset]))
+
+
+def _postgres_search(query, sentiment, source, start, end, limit, offset):
+    where = ['m.search_vector @@ query']
+    params = [SEARCH_CONFIG, query]
+    if sentiment:
+        where.append('m.sentiment = %s')
+        params.append(sentiment)
+    if source:
+        where.append('m.source = %s')
+        params.append(source)
+    if start is not None:
+        where.append('m.published_date >= %s')
+        params.append(start)
+    if end is not None:
+        where.append('m.published_date <= %s')
+        params.append(end)
+    sql = (
+        f'SELECT {_columns()} FROM investments_marketnews m, websearch_to_tsquery(%s::regconfig, %s) query '
+        f'WHERE {" AND ".join(where)} '
+        f'ORDER BY ts_rank(m.search_vector, query) DESC, m.published_date DESC, m.id DESC '
+        f'LIMIT %s OFFSET %s'
+    )
+    return list(MarketNews.objects.raw(sql, params + [limit, offset]))
+
+
+def _scan_search(query, sentiment, source, start, end, limit, offset):
+    # Databases without a text index: correct, but reads every article
+    terms = TERM_RE.findall(query)
+    if not terms:
+        return []
+    queryset = MarketNews.objects.all()
+    for term in terms:
+        queryset = queryset.filter(Q(title__icontains=term) | Q(summary__icontains=term))
+    if sentiment:
+        queryset = queryset.filter(sentiment=sentiment)
+    if source:
+        queryset = queryset.filter(source=source)
+    if start is not None:
+        queryset = queryset.filter(published_date__gte=start)
+    if end is not None:
+        queryset = queryset.filter(published_date__lte=end)
+    return list(queryset.order_by('-published_date', '-id')[offset:offset + limit])
+
+
+def search_news(query, sentiment=None, source=None, start=None, end=None, limit=50, offset=0):
+    """
+    Articles matching every word of ``query`` in their title or summary,
+    best match first. Filters run inside the text index query: SQLite's
+    FTS5 table (kept in sync by triggers) or PostgreSQL's GIN-indexed
+    ``search_vector`` column (a generated column, so always in sync).
+    """
+    if connection.vendor == 'sqlite':
+        search = _sqlite_search
+    elif connection.vendor == 'postgresql':
+        search = _postgres_search
+    else:
+        search = _scan_search
+    return search(query, sentiment, source, start, end, limit, offset)
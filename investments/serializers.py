@@ -1,10 +1,11 @@
 from rest_framework import serializers
-from .models import GoldPrice, Transaction, DepositRequest, WithdrawalRequest, GoldLock, PortfolioSnapshot, PriceAlert, MarketNews
+from .models import GoldPrice, Transaction, DepositRequest, WithdrawalRequest, GoldLock, PortfolioSnapshot, PriceAlert, MarketNews, PriceCandle
 
 class GoldPriceSerializer(serializers.ModelSerializer):
     class Meta:
         model = GoldPrice
         fields = '__all__'
+        read_only_fields = ['timestamp']
 
 class TransactionSerializer(serializers.ModelSerializer):
     user = serializers.CharField(source='user.username', read_only=True)
@@ -54,4 +55,9 @@ class GoldLockSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = GoldLock
-        fields = '__all__' 
\ No newline at end of file
+        fields = '__all__' 
+
+class PriceCandleSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = PriceCandle
+        fields = ['interval', 'bucket', 'open', 'high', 'low', 'close', 'tick_count']
@@ -0,0 +1,86 @@
+from decimal import ROUND_HALF_EVEN, Decimal, InvalidOperation
+
+# Every cash and gold figure is rounded once, to the precision of the
+# column it is stored in, with banker's rounding
+CASH_QUANTUM = Decimal('0.01')
+GOLD_QUANTUM = Decimal('0.0001')
+ROUNDING = ROUND_HALF_EVEN
+
+
+class InvalidAmount(ValueError):
+    pass
+
+
+def to_decimal(value):
+    """Convert request input or a stored value to a finite ``Decimal``."""
+    if isinstance(value, Decimal):
+        result = value
+    elif isinstance(value, (int, str)):
+        try:
+            result = Decimal(value)
+        except InvalidOperation:
+            raise InvalidAmount(f'Invalid amount: {value!r}')
+    elif isinstance(value, float):
+        # Go through repr so 0.1 becomes Decimal('0.1'), not its binary expansion
+        result = Decimal(repr(value))
+    else:
+        raise InvalidAmount(f'Invalid amount: {value!r}')
+    if not result.is_finite():
+        raise InvalidAmount(f'Invalid amount: {value!r}')
+    return result
+
+
+def quantize_cash(value):
+    return to_decimal(value).quantize(CASH_QUANTUM, rounding=ROUNDING)
+
+
+def quantize_gold(value):
+    return to_decimal(value).quantize(GOLD_QUANTUM, rounding=ROUNDING)
+
+
+def parse_gold_amount(value):
+    """
+    Validate an order size from request data: positive, no finer than gold
+    precision and within the gold columns (``max_digits=15,
+    decimal_places=4``). Finer amounts are rejected rather than rounded, so
+    the order never differs from what was asked for.
+    """
+    if isinstance(value, bool):
+        raise InvalidAmount(f'Invalid amount: {value!r}')
+    amount = to_decimal(value)
+    if amount.adjusted() >= 11:
+        raise InvalidAmount('Amount is too large')
+    if amount != amount.quantize(GOLD_QUANTUM, rounding=ROUNDING):
+        raise InvalidAmount(f'Amount must have at most {-GOLD_QUANTUM.as_tuple().exponent} decimal places')
+    amount = quantize_gold(amount)
+    if amount <= 0:
+        raise InvalidAmount('Amount must be positive')
+    return amount
+
+
+def parse_price(value, name='price'):
+    """
+    Validate an order's price level from request data: positive, in cents,
+    and within the price columns (``max_digits=10, decimal_places=2``).
+    """
+    if value is None or value == '' or isinstance(value, bool):
+        raise InvalidAmount(f'{name} is required')
+    price = to_decimal(value)
+    if price != price.quantize(CASH_QUANTUM, rounding=ROUNDING):
+        raise InvalidAmount(f'{name} must have at most 2 decimal places')
+    if price <= 0:
+        raise InvalidAmount(f'{name} must be positive')
+    if price.adjusted() >= 8:
+        raise InvalidAmount(f'{name} is too large')
+    return quantize_cash(price)
+
+
+def trade_value(amount, price):
+    """Cash cost of buying, or proceeds of selling, ``amount`` gold at ``price``."""
+    return quantize_cash(to_decimal(amount) * to_decimal(price))
+
+
+def portfolio_value(balance, gold_holdings, price):
+    """Return ``(gold_value, total_value)`` for a wallet at ``price``."""
+    gold_value = trade_value(gold_holdings, price)
+    return gold_value, quantize_cash(balance) + gold_value
@@ -0,0 +1,109 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from gold_flux.middleware import invalidate_responses
+from .alerts import alert_index
+from .analytics import invalidate_analytics
+from .candles import record_tick
+from .hooks import after_commit
+from .matching import order_book
+from .models import (
+    DepositRequest, GoldLock, GoldPrice, MarketNews, PortfolioSnapshot, PriceAlert, Transaction, WithdrawalRequest
+)
+from .news import invalidate_feed
+from .pricing import latest_price
+from .streams import price_broadcaster, price_payload
+
+
+# Every after-commit hook is robust: the tick is already stored, so one
+# failing consumer is logged without failing the request or the other hooks
+@receiver(post_save, sender=GoldPrice)
+def match_orders_on_tick(sender, instance, created, **kwargs):
+    if created:
+        after_commit(order_book.on_tick, instance.price)
+
+
+@receiver(post_save, sender=GoldPrice)
+def trigger_alerts_on_tick(sender, instance, created, **kwargs):
+    if created:
+        after_commit(alert_index.on_tick, instance.price)
+
+
+@receiver(post_save, sender=GoldPrice)
+def aggregate_candles_on_tick(sender, instance, created, **kwargs):
+    if created:
+        after_commit(record_tick, instance.price, instance.timestamp)
+
+
+@receiver(post_save, sender=GoldPrice)
+def refresh_latest_price(sender, instance, **kwargs):
+    # After commit, so a tick that is rolled back never becomes the price
+    after_commit(latest_price.update, instance.timestamp, instance.price)
+
+
+@receiver(post_save, sender=GoldPrice)
+def broadcast_tick(sender, instance, created, **kwargs):
+    if created:
+        after_commit(price_broadcaster.publish, price_payload(instance.timestamp, instance.price))
+
+
+@receiver(post_delete, sender=GoldPrice)
+def invalidate_latest_price(sender, instance, **kwargs):
+    after_commit(latest_price.invalidate)
+
+
+@receiver(post_save, sender=Transaction)
+@receiver(post_delete, sender=Transaction)
+def drop_settled_order(sender, instance, signal, **kwargs):
+    # New orders reach the book through its tail; this only takes out the
+    # ones cancelled or deleted here before the next reload would
+    if signal is post_delete or instance.status != 'PENDING':
+        after_commit(order_book.discard, instance.pk)
+
+
+@receiver(post_save, sender=PriceAlert)
+@receiver(post_delete, sender=PriceAlert)
+def drop_inactive_alert(sender, instance, signal, **kwargs):
+    # As with orders: new alerts arrive through the index's tail
+    if signal is post_delete or not instance.is_active or instance.triggered is not None:
+        after_commit(alert_index.discard, instance.pk)
+
+
+@receiver(post_save, sender=PortfolioSnapshot)
+@receiver(post_delete, sender=PortfolioSnapshot)
+def invalidate_portfolio_analytics(sender, instance, **kwargs):
+    invalidate_analytics(instance.user_id)
+    # Again after commit, in case a read in between cached the old rows
+    after_commit(invalidate_analytics, instance.user_id)
+
+
+@receiver(post_save, sender=MarketNews)
+@receiver(post_delete, sender=MarketNews)
+def invalidate_news_feed(sender, instance, **kwargs):
+    invalidate_feed()
+    after_commit(invalidate_feed)
+    after_commit(invalidate_responses, MarketNews)
+
+
+@receiver(post_save, sender=GoldPrice)
+@receiver(post_delete, sender=GoldPrice)
+def invalidate_price_responses(sender, **kwargs):
+    # Registered after aggregate_candles_on_tick, so its on-commit run
+    # also retires candle responses cached before the candle update
+    invalidate_responses(sender)
+
+
+@receiver(post_save, sender=Transaction)
+@receiver(post_delete, sender=Transaction)
+@receiver(post_save, sender=DepositRequest)
+@receiver(post_delete, sender=DepositRequest)
+@receiver(post_save, sender=WithdrawalRequest)
+@receiver(post_delete, sender=WithdrawalRequest)
+@receiver(post_save, sender=GoldLock)
+@receiver(post_delete, sender=GoldLock)
+@receiver(post_save, sender=PortfolioSnapshot)
+@receiver(post_delete, sender=PortfolioSnapshot)
+@receiver(post_save, sender=PriceAlert)
+@receiver(post_delete, sender=PriceAlert)
+def invalidate_user_responses(sender, instance, **kwargs):
+    invalidate_responses(sender, [instance.user_id])
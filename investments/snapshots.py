@@ -0,0 +1,59 @@
+from itertools import islice
+
+from django.db import transaction
+from django.utils import timezone
+
+from accounts.models import Wallet
+from gold_flux.middleware import invalidate_responses
+from .analytics import invalidate_analytics
+from .models import PortfolioSnapshot
+from .pricing import get_latest_price
+from .settlement import portfolio_value
+
+
+def snapshot_portfolios(batch_size=1000):
+    """
+    Snapshot every wallet against one read of the current gold price.
+    Wallets are streamed in ``batch_size`` chunks; each chunk costs one
+    query for users already snapshotted today and one ``bulk_create``, so
+    re-running the job the same day only fills in the gaps. Raises
+    ``GoldPrice.DoesNotExist`` if there is no price. Returns
+    ``(written, skipped)``.
+    """
+    price = get_latest_price()
+    today = timezone.localdate()
+    written = skipped = 0
+
+    wallets = Wallet.objects.order_by('user_id').values_list('user_id', 'balance', 'gold_holdings')
+    wallets = wallets.iterator(chunk_size=batch_size)
+    while True:
+        chunk = list(islice(wallets, batch_size))
+        if not chunk:
+            break
+
+        user_ids = [user_id for user_id, _, _ in chunk]
+        done = set(
+            PortfolioSnapshot.objects.filter(user_id__in=user_ids, date=today).values_list('user_id', flat=True)
+        )
+        snapshots = []
+        for user_id, balance, gold_holdings in chunk:
+            if user_id in done:
+                continue
+            gold_value, total_value = portfolio_value(balance, gold_holdings, price)
+            snapshots.append(PortfolioSnapshot(
+                user_id=user_id,
+                total_value=total_value,
+                cash_balance=balance,
+                gold_value=gold_value,
+                gold_holdings=gold_holdings,
+                gold_price=price,
+            ))
+
+        with transaction.atomic():
+            PortfolioSnapshot.objects.bulk_create(snapshots)
+        # bulk_create sends no signals, so drop the cached analytics here
+        invalidate_analytics(*[snapshot.user_id for snapshot in snapshots])
+        invalidate_responses(PortfolioSnapshot, [snapshot.user_id for snapshot in snapshots])
+        written += len(snapshots)
+        skipped += len(chunk) - len(snapshots)
+    return written, skipped
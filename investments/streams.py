@@ -0,0 +1,170 @@
+import asyncio
+import json
+from contextlib import aclosing
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import StreamingHttpResponse
+
+from .models import GoldPrice
+from .pricing import latest_price
+from .settlement import quantize_cash
+
+# Seconds between SSE comment lines that keep idle proxies from closing the stream
+HEARTBEAT_INTERVAL = 15
+
+
+class PriceBroadcaster:
+    """
+    In-process fan-out of price ticks to every connected stream. A tick is
+    encoded once and delivered by setting a single shared event, so the cost
+    per tick does not grow with the number of subscribers. Each tick bumps a
+    sequence number; a subscriber that sees it moved while it was busy skips
+    straight to the newest tick instead of waiting for the next one.
+    """
+
+    def __init__(self):
+        self._loop = None
+        self._event = None
+        self._message = None
+        self._sequence = 0
+
+    def _bind(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._event = asyncio.Event()
+
+    def publish(self, payload):
+        """Broadcast ``payload``; safe to call from any thread."""
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        loop.call_soon_threadsafe(self._deliver, json.dumps(payload))
+
+    def _deliver(self, message):
+        self._message = message
+        self._sequence += 1
+        event, self._event = self._event, asyncio.Event()
+        event.set()
+
+    async def subscribe(self, heartbeat=None):
+        """
+        Yield each message published after subscribing; yield ``None`` after
+        ``heartbeat`` idle seconds so callers can keep the connection alive.
+        """
+        self._bind()
+        seen = self._sequence
+        while True:
+            # No await between the check and taking the event, so a tick
+            # can't land in between and go unnoticed
+            if self._sequence == seen:
+                try:
+                    await asyncio.wait_for(self._event.wait(), heartbeat)
+                except asyncio.TimeoutError:
+                    yield None
+                    continue
+            seen = self._sequence
+            yield self._message
+
+
+price_broadcaster = PriceBroadcaster()
+
+
+def price_payload(timestamp, price):
+    return {'timestamp': timestamp.isoformat(), 'price': str(quantize_cash(price))}
+
+
+async def _current_price_message():
+    try:
+        timestamp, price = await sync_to_async(latest_price.get)()
+    except GoldPrice.DoesNotExist:
+        return None
+    return json.dumps(price_payload(timestamp, price))
+
+
+async def price_events():
+    """The SSE body: a retry hint, the current price, then each tick or a heartbeat."""
+    yield f'retry: {HEARTBEAT_INTERVAL * 1000}\n\n'
+    current = await _current_price_message()
+    if current is not None:
+        yield f'event: price\ndata: {current}\n\n'
+    async for message in price_broadcaster.subscribe(heartbeat=HEARTBEAT_INTERVAL):
+        if message is None:
+            yield ': keepalive\n\n'
+        else:
+            yield f'event: price\ndata: {message}\n\n'
+
+
+async def price_stream(request):
+    """
+    Server-sent events feed of gold price ticks, starting with the current
+    price. Under ASGI the entry point serves this path with ``price_sse``.
+    """
+    response = StreamingHttpResponse(price_events(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+def _cors_headers(scope):
+    # What CorsMiddleware would add, since no middleware runs for raw routes
+    origin = dict(scope.get('headers', [])).get(b'origin')
+    if origin is None or origin.decode('latin1') not in getattr(settings, 'CORS_ALLOWED_ORIGINS', []):
+        return []
+    headers = [(b'access-control-allow-origin', origin), (b'vary', b'origin')]
+    if getattr(settings, 'CORS_ALLOW_CREDENTIALS', False):
+        headers.append((b'access-control-allow-credentials', b'true'))
+    return headers
+
+
+async def price_sse(scope, receive, send):
+    """
+    ``price_stream`` served straight from the ASGI entry point. Django 4.2's
+    handler stops calling ``receive()`` once the request body is read, so it
+    never sees ``http.disconnect`` and a departed client's stream would
+    heartbeat forever; here the stream is cancelled as soon as it arrives.
+    """
+    await send({
+        'type': 'http.response.start',
+        'status': 200,
+        'headers': [
+            (b'content-type', b'text/event-stream'),
+            (b'cache-control', b'no-cache'),
+            (b'x-accel-buffering', b'no'),
+            *_cors_headers(scope),
+        ],
+    })
+
+    async def pump():
+        async with aclosing(price_events()) as events:
+            async for event in events:
+                await send({'type': 'http.response.body', 'body': event.encode(), 'more_body': True})
+
+    sender = asyncio.create_task(pump())
+    try:
+        while (await receive())['type'] != 'http.disconnect':
+            pass
+    finally:
+        sender.cancel()
+
+
+async def price_socket(scope, receive, send):
+    """WebSocket variant of ``price_stream`` served straight from the ASGI entry point."""
+    if (await receive())['type'] != 'websocket.connect':
+        return
+    await send({'type': 'websocket.accept'})
+
+    async def pump():
+        current = await _current_price_message()
+        if current is not None:
+            await send({'type': 'websocket.send', 'text': current})
+        async for message in price_broadcaster.subscribe():
+            await send({'type': 'websocket.send', 'text': message})
+
+    sender = asyncio.create_task(pump())
+    try:
+        while (await receive())['type'] != 'websocket.disconnect':
+            pass
+    finally:
+        sender.cancel()
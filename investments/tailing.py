@@ -0,0 +1,48 @@
+import time
+
+# Seconds a skipped id is re-read before it is given up as a rolled back insert
+GAP_TIMEOUT = 60
+
+# Skipped runs longer than this (e.g. a sequence jump) aren't tracked
+MAX_GAP = 1000
+
+
+class RowTail:
+    """
+    Follows the rows added to a table since the last poll, by primary key,
+    so each poll costs an index range read of the new rows only.
+
+    Ids are handed out before commit, so a row can become visible after a
+    higher id has been seen. The ids skipped over are kept as gaps and
+    re-read on later polls until they show up or ``GAP_TIMEOUT`` seconds
+    pass (a rolled back insert never fills its gap). Rows that take longer
+    than that to commit are left to the owner's periodic full reload.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self, high_water=0):
+        self.high_water = high_water or 0
+        self._gaps = {}
+
+    def poll(self, queryset, fields):
+        """New rows of ``queryset`` as ``(pk, *fields)`` tuples, oldest id first."""
+        now = time.monotonic()
+        rows = []
+        if self._gaps:
+            rows = list(queryset.filter(pk__in=list(self._gaps)).order_by('pk').values_list('pk', *fields))
+            for row in rows:
+                del self._gaps[row[0]]
+
+        new = list(queryset.filter(pk__gt=self.high_water).order_by('pk').values_list('pk', *fields))
+        expected = self.high_water + 1
+        for row in new:
+            if row[0] - expected <= MAX_GAP:
+                self._gaps.update(dict.fromkeys(range(expected, row[0]), now))
+            expected = row[0] + 1
+        if new:
+            self.high_water = new[-1][0]
+
+        self._gaps = {pk: seen for pk, seen in self._gaps.items() if now - seen < GAP_TIMEOUT}
+        return rows + new
@@ -1,3 +1,1248 @@
-from django.test import TestCase
+import asyncio
+import json
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache, caches
+from django.core.management import CommandError, call_command
+from django.db import connection, transaction
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import get_resolver
+from django.utils import timezone
+from django.utils.http import http_date
+from rest_framework.mixins import ListModelMixin
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from accounts.models import LedgerEntry, User, Wallet
+from .alerts import AlertIndex, alert_index
+from .candles import bucket_start
+from .ingest import import_prices, parse_prices
+from .management.commands.explain_queries import iter_api_views
+from .matching import OrderBook, SettlementConflict, order_book, settle_orders
+from .models import (
+    DepositRequest, GoldLock, GoldPrice, MarketNews, PortfolioSnapshot, PriceAlert, PriceCandle, Transaction,
+    WithdrawalRequest,
+)
+from .news import invalidate_feed
+from .pricing import get_latest_price, latest_price
+from .serializers import GoldPriceSerializer, TransactionSerializer
+from .settlement import InvalidAmount, parse_gold_amount, portfolio_value, trade_value
+from .streams import PriceBroadcaster, price_broadcaster
+
+
+# Rows are added with bulk_create, which sends no invalidation signals
+@override_settings(RESPONSE_CACHE_ROUTES={})
+class ListEndpointQueryCountTests(TestCase):
+    """
+    Every list endpoint must run a fixed number of queries however many rows
+    it returns: related objects are loaded with the page, never per row.
+    """
+
+    # endpoint -> (row factory, queries per request)
+    endpoints = {
+        '/api/user/transactions/': ('make_transactions', 1),
+        '/api/user/deposits/': ('make_deposits', 1),
+        '/api/user/withdrawals/': ('make_withdrawals', 1),
+        '/api/user/gold-locks/': ('make_gold_locks', 1),
+        '/api/user/portfolio/': ('make_snapshots', 1),
+        '/api/user/price-alerts/': ('make_alerts', 1),
+        '/api/admin/users/': ('make_users', 1),
+        '/api/admin/transactions/': ('make_transactions', 1),
+        '/api/admin/deposits/': ('make_deposits', 1),
+        '/api/admin/withdrawals/': ('make_withdrawals', 1),
+        '/api/admin/gold-locks/': ('make_gold_locks', 1),
+        '/api/gold/prices/': ('make_prices', 1),
+        # On a feed rebuild: the page and its validators
+        '/api/market/news/': ('make_news', 2),
+    }
+
+    def setUp(self):
+        self.admin = User.objects.create_user(username='admin', email='admin@example.com', password='pass12345', is_admin=True)
+        Wallet.objects.create(user=self.admin, balance=Decimal('1000.00'))
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def make_users(self, count):
+        users = User.objects.bulk_create(
+            User(username=f'user{User.objects.count()}-{i}', email=f'user{i}@example.com') for i in range(count)
+        )
+        Wallet.objects.bulk_create(Wallet(user=user) for user in users)
+
+    def make_transactions(self, count):
+        Transaction.objects.bulk_create(
+            Transaction(user=self.admin, transaction_type='BUY', amount=Decimal('1'), price_at_transaction=Decimal('2000'))
+            for _ in range(count)
+        )
+
+    def _requests(self, model, count):
+        model.objects.bulk_create(
+            model(user=self.admin, approved_by=self.admin, amount=Decimal('10'), currency='USDT') for _ in range(count)
+        )
+
+    def make_deposits(self, count):
+        self._requests(DepositRequest, count)
+
+    def make_withdrawals(self, count):
+        self._requests(WithdrawalRequest, count)
+
+    def make_gold_locks(self, count):
+        now = timezone.now()
+        GoldLock.objects.bulk_create(
+            GoldLock(
+                user=self.admin, approved_by=self.admin, amount=Decimal('1'), start_date=now,
+                end_date=now + timedelta(days=30), interest_rate=Decimal('2.50'),
+            )
+            for _ in range(count)
+        )
+
+    def make_snapshots(self, count):
+        PortfolioSnapshot.objects.bulk_create(
+            PortfolioSnapshot(
+                user=self.admin, total_value=Decimal('1000'), cash_balance=Decimal('1000'),
+                gold_value=Decimal('0'), gold_holdings=Decimal('0'), gold_price=Decimal('2000'),
+            )
+            for _ in range(count)
+        )
+
+    def make_alerts(self, count):
+        PriceAlert.objects.bulk_create(
+            PriceAlert(user=self.admin, target_price=Decimal('2100'), alert_type='ABOVE') for _ in range(count)
+        )
+
+    def make_prices(self, count):
+        GoldPrice.objects.bulk_create(GoldPrice(price=Decimal('2000')) for _ in range(count))
+
+    def make_news(self, count):
+        MarketNews.objects.bulk_create(
+            MarketNews(title='Gold', summary='Gold moves', source='Wire', sentiment='NEUTRAL', published_date=timezone.now())
+            for _ in range(count)
+        )
+        # bulk_create sends no signals
+        invalidate_feed()
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, url)
+        return len(queries)
+
+    def test_query_count_does_not_grow_with_rows(self):
+        for url, (factory, expected) in self.endpoints.items():
+            with self.subTest(url=url):
+                getattr(self, factory)(2)
+                few = self.count_queries(url)
+                getattr(self, factory)(40)
+                many = self.count_queries(url)
+                self.assertEqual(few, many, f'{url} issues queries per row')
+                self.assertEqual(many, expected, f'{url} query count changed')
+
+
+# Rows are added with bulk_create, which sends no invalidation signals
+@override_settings(RESPONSE_CACHE_ROUTES={})
+class CursorPaginationTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='trader', email='trader@example.com', password='pass12345')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        now = timezone.now()
+        # Pairs of orders share a timestamp, so id has to break the ties
+        Transaction.objects.bulk_create(
+            Transaction(
+                user=self.user, transaction_type='BUY', amount=Decimal('1'),
+                price_at_transaction=Decimal('2000'), timestamp=now - timedelta(minutes=i // 2),
+            )
+            for i in range(7)
+        )
+
+    def ids(self, response):
+        return [row['id'] for row in response.json()['results']]
+
+    def test_pages_follow_timestamp_then_id(self):
+        expected = list(Transaction.objects.order_by('-timestamp', '-id').values_list('id', flat=True))
+        seen = []
+        url = '/api/user/transactions/?page_size=2'
+        while url:
+            response = self.client.get(url)
+            seen += self.ids(response)
+            url = response.json()['next']
+        self.assertEqual(seen, expected)
+
+    def test_pages_are_stable_while_rows_are_added(self):
+        first = self.client.get('/api/user/transactions/?page_size=3')
+        Transaction.objects.create(
+            user=self.user, transaction_type='SELL', amount=Decimal('1'), price_at_transaction=Decimal('2000')
+        )
+        second = self.client.get(first.json()['next'])
+        expected = list(Transaction.objects.order_by('-timestamp', '-id').values_list('id', flat=True))[1:7]
+        self.assertEqual(self.ids(first) + self.ids(second), expected)
+
+
+class ValuesListSerializationTests(TestCase):
+    """The values() list path must render exactly what the serializers would."""
+
+    def setUp(self):
+        self.admin = User.objects.create_user(username='admin', email='admin@example.com', password='pass12345', is_admin=True)
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def assertSameAsSerializer(self, url, serializer_class, queryset):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        expected = JSONRenderer().render({
+            'next': response.data['next'],
+            'previous': response.data['previous'],
+            'results': serializer_class(queryset, many=True).data,
+        })
+        self.assertEqual(response.content, expected)
+
+    def test_admin_transactions(self):
+        Transaction.objects.bulk_create([
+            Transaction(user=self.admin, transaction_type='BUY', amount=Decimal('1.5'), price_at_transaction=Decimal('2000'),
+                        executed_price=Decimal('2000.1'), status='EXECUTED'),
+            Transaction(user=self.admin, transaction_type='SELL', order_type='LIMIT', amount=Decimal('0.0001'),
+                        price_at_transaction=Decimal('1999.99'), limit_price=Decimal('2100')),
+        ] * 30)
+        queryset = Transaction.objects.select_related('user').order_by('-timestamp', '-id')[:50]
+        self.assertSameAsSerializer('/api/admin/transactions/', TransactionSerializer, queryset)
+
+    def test_gold_prices(self):
+        now = timezone.now()
+        GoldPrice.objects.bulk_create(
+            GoldPrice(timestamp=now - timedelta(seconds=i, microseconds=i), price=Decimal(2000) + Decimal(i) / 100)
+            for i in range(60)
+        )
+        queryset = GoldPrice.objects.order_by('-timestamp', '-id')[:50]
+        self.assertSameAsSerializer('/api/gold/prices/', GoldPriceSerializer, queryset)
+
+
+class PortfolioAnalyticsTests(TestCase):
+
+    def setUp(self):
+        caches['responses'].clear()
+        self.user = User.objects.create_user(username='trader', email='trader@example.com', password='pass12345')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def snapshot(self, days_ago, cash, holdings, price):
+        cash, holdings, price = Decimal(cash), Decimal(holdings), Decimal(price)
+        snapshot = PortfolioSnapshot.objects.create(
+            user=self.user, total_value=cash + holdings * price, cash_balance=cash,
+            gold_value=holdings * price, gold_holdings=holdings, gold_price=price,
+        )
+        PortfolioSnapshot.objects.filter(pk=snapshot.pk).update(date=timezone.localdate() - timedelta(days=days_ago))
+
+    def test_time_weighted_return_excludes_deposits(self):
+        self.snapshot(3, '0', '1', '2000')
+        self.snapshot(2, '0', '1', '2200')  # +10%
+        self.snapshot(1, '1000', '1', '1980')  # -10%, plus a 1000 deposit
+        self.snapshot(0, '1000', '1', '1980')
+
+        response = self.client.get('/api/user/portfolio/analytics/')
+        self.assertEqual(response.status_code, 200)
+        data = response.data
+        self.assertEqual(data['periods'], 3)
+        self.assertAlmostEqual(data['time_weighted_return'], -0.01)
+        self.assertAlmostEqual(data['max_drawdown'], -0.1)
+        self.assertEqual(data['pnl_attribution']['gold_price'], '-20.00')
+        self.assertEqual(data['pnl_attribution']['net_flows'], '1000.00')
+
+    def test_cached_until_next_snapshot(self):
+        self.snapshot(1, '0', '1', '2000')
+        self.snapshot(0, '0', '1', '2100')
+        self.client.get('/api/user/portfolio/analytics/')
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get('/api/user/portfolio/analytics/')
+        self.assertEqual(len(queries), 0)
+
+        PortfolioSnapshot.objects.filter(user=self.user).delete()
+        self.snapshot(2, '0', '1', '2000')
+        self.snapshot(0, '0', '2', '2000')
+        response = self.client.get('/api/user/portfolio/analytics/')
+        self.assertAlmostEqual(response.data['time_weighted_return'], 0.0)
+
+    def test_snapshot_command_invalidates_the_shared_cache(self):
+        GoldPrice.objects.create(price=Decimal('2000.00'))
+        latest_price.invalidate()
+        Wallet.objects.create(user=self.user, gold_holdings=Decimal('1.0000'))
+        self.snapshot(1, '0', '1', '1000')
+        self.assertEqual(self.client.get('/api/user/portfolio/analytics/').data['periods'], 0)
+        call_command('snapshot_portfolios', stdout=StringIO())
+        self.assertAlmostEqual(self.client.get('/api/user/portfolio/analytics/').data['time_weighted_return'], 1.0)
+
+    @override_settings(PORTFOLIO_ANALYTICS_CACHE_TTL=0.2)
+    def test_cached_result_expires(self):
+        self.snapshot(1, '0', '1', '2000')
+        self.client.get('/api/user/portfolio/analytics/')
+        # A write this process wasn't told about, e.g. from another worker
+        PortfolioSnapshot.objects.bulk_create([PortfolioSnapshot(
+            user=self.user, total_value=Decimal('2200'), cash_balance=0, gold_value=Decimal('2200'),
+            gold_holdings=1, gold_price=Decimal('2200'),
+        )])
+        self.assertEqual(self.client.get('/api/user/portfolio/analytics/').data['periods'], 0)
+        time.sleep(0.3)
+        self.assertAlmostEqual(self.client.get('/api/user/portfolio/analytics/').data['time_weighted_return'], 0.1)
+
+
+class SettlementTests(TestCase):
+
+    def setUp(self):
+        latest_price.invalidate()
+        self.user = User.objects.create_user(username='trader', email='trader@example.com', password='pass12345')
+        Wallet.objects.create(user=self.user, balance=Decimal('100.00'), gold_holdings=Decimal('1.0000'))
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_values_round_half_even_to_the_cent(self):
+        self.assertEqual(trade_value('0.0005', '10.00'), Decimal('0.00'))
+        self.assertEqual(trade_value('0.0015', '10.00'), Decimal('0.02'))
+        self.assertEqual(trade_value('0.0025', '10.00'), Decimal('0.02'))
+        self.assertEqual(portfolio_value(Decimal('1.005'), '0.0035', '10.00'), (Decimal('0.04'), Decimal('1.04')))
+
+    def test_amounts_finer_than_gold_precision_are_rejected(self):
+        self.assertEqual(parse_gold_amount('1.2345'), Decimal('1.2345'))
+        self.assertEqual(parse_gold_amount('1.23450'), Decimal('1.2345'))
+        self.assertEqual(parse_gold_amount(0.1), Decimal('0.1000'))
+        self.assertEqual(parse_gold_amount('99999999999.9999'), Decimal('99999999999.9999'))
+        for value in ('1.23456', '0.00001', '0', '-1', 'abc', 'NaN', None, True, '1e20', '100000000000', 10**40):
+            with self.assertRaises(InvalidAmount):
+                parse_gold_amount(value)
+
+    def test_out_of_range_amounts_are_a_bad_request(self):
+        GoldPrice.objects.create(price=Decimal('10.00'))
+        for amount in ('1e20', True):
+            with self.subTest(amount=amount):
+                response = self.client.post(
+                    '/api/user/transactions/', {'transaction_type': 'BUY', 'amount': amount}, format='json'
+                )
+                self.assertEqual(response.status_code, 400)
+        self.assertFalse(Transaction.objects.exists())
+
+    def test_market_order_settles_at_the_rounded_value(self):
+        GoldPrice.objects.create(price=Decimal('10.00'))
+        response = self.client.post(
+            '/api/user/transactions/', {'transaction_type': 'BUY', 'amount': '0.12345'}, format='json'
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Transaction.objects.exists())
+
+        response = self.client.post('/api/user/transactions/', {'transaction_type': 'BUY', 'amount': '0.0015'}, format='json')
+        self.assertEqual(response.status_code, 201)
+        wallet = Wallet.objects.get(user=self.user)
+        self.assertEqual((wallet.balance, wallet.gold_holdings), (Decimal('99.98'), Decimal('1.0015')))
+
+    def test_order_book_settles_at_the_rounded_value(self):
+        order = Transaction.objects.create(
+            user=self.user, transaction_type='SELL', order_type='LIMIT', amount=Decimal('0.0025'),
+            price_at_transaction=Decimal('10.00'), limit_price=Decimal('10.00'), status='PENDING',
+        )
+        self.assertEqual(settle_orders([order.pk], Decimal('10.00')), ([order.pk], []))
+        wallet = Wallet.objects.get(user=self.user)
+        self.assertEqual((wallet.balance, wallet.gold_holdings), (Decimal('100.02'), Decimal('0.9975')))
+        self.assertEqual(LedgerEntry.objects.get(user=self.user).cash_delta, Decimal('0.02'))
+
+
+class SnapshotPortfoliosCommandTests(TestCase):
+
+    def test_snapshots_every_wallet_once_per_day(self):
+        latest_price.invalidate()
+        GoldPrice.objects.create(price=Decimal('2000.00'))
+        users = User.objects.bulk_create(User(username=f'user{i}', email=f'user{i}@example.com') for i in range(5))
+        Wallet.objects.bulk_create(
+            Wallet(user=user, balance=Decimal('100.00'), gold_holdings=Decimal(i).scaleb(-1)) for i, user in enumerate(users)
+        )
+
+        call_command('snapshot_portfolios', batch_size=2, stdout=StringIO())
+        call_command('snapshot_portfolios', batch_size=2, stdout=StringIO())
+
+        self.assertEqual(PortfolioSnapshot.objects.count(), 5)
+        snapshot = PortfolioSnapshot.objects.get(user=users[3])
+        self.assertEqual(snapshot.gold_value, Decimal('600.00'))
+        self.assertEqual(snapshot.total_value, Decimal('700.00'))
+
+
+class GoldLockMaturityTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='saver', email='saver@example.com', password='pass12345')
+        Wallet.objects.create(user=self.user, gold_holdings=Decimal('1.0000'))
+        self.now = timezone.now()
+
+    def lock(self, days_left, status='APPROVED'):
+        return GoldLock.objects.create(
+            user=self.user, amount=Decimal('10'), interest_rate=Decimal('3.65'), status=status,
+            start_date=self.now - timedelta(days=100), end_date=self.now + timedelta(days=days_left),
+        )
+
+    def test_matures_due_locks_once(self):
+        due = [self.lock(-1), self.lock(0)]
+        pending = self.lock(-5, status='PENDING')
+        running = self.lock(3)
+
+        call_command('mature_gold_locks', batch_size=1, stdout=StringIO())
+        call_command('mature_gold_locks', stdout=StringIO())
+
+        # 10 gold at 3.65% a year for 99 and 100 days
+        wallet = Wallet.objects.get(user=self.user)
+        self.assertEqual(wallet.gold_holdings, Decimal('1') + Decimal('10.0990') + Decimal('10.1000'))
+        self.assertEqual(
+            set(GoldLock.objects.filter(status='MATURED', matured=True).values_list('id', flat=True)),
+            {lock.id for lock in due},
+        )
+        self.assertEqual(GoldLock.objects.get(pk=pending.pk).status, 'PENDING')
+        self.assertEqual(GoldLock.objects.get(pk=running.pk).status, 'APPROVED')
+        self.assertEqual(LedgerEntry.objects.filter(user=self.user, reason='LOCK_MATURITY').count(), 2)
+
+
+class AdminBulkReviewTests(TestCase):
+
+    def setUp(self):
+        self.admin = User.objects.create_user(username='admin', email='admin@example.com', password='pass12345', is_admin=True)
+        self.user = User.objects.create_user(username='client', email='client@example.com', password='pass12345')
+        Wallet.objects.create(user=self.user, balance=Decimal('100.00'))
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def test_bulk_withdrawals_apply_in_order_against_the_balance(self):
+        first, second, third = (
+            WithdrawalRequest.objects.create(user=self.user, amount=Decimal(amount), currency='USDT')
+            for amount in ('60', '50', '40')
+        )
+        done = WithdrawalRequest.objects.create(user=self.user, amount=Decimal('1'), currency='USDT', status='APPROVED')
+
+        response = self.client.post(
+            '/api/admin/withdrawals/bulk-review/',
+            {'ids': [third.pk, second.pk, first.pk, done.pk, 999999], 'action': 'approve'}, format='json',
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['results'], [
+            {'id': third.pk, 'status': 'APPROVED'},
+            {'id': second.pk, 'error': 'Insufficient balance'},
+            {'id': first.pk, 'status': 'APPROVED'},
+            {'id': done.pk, 'error': 'Already processed'},
+            {'id': 999999, 'error': 'Not found'},
+        ])
+        self.assertEqual(Wallet.objects.get(user=self.user).balance, Decimal('0.00'))
+        self.assertEqual(WithdrawalRequest.objects.get(pk=second.pk).status, 'PENDING')
+        self.assertEqual(LedgerEntry.objects.filter(user=self.user, reason='WITHDRAWAL').count(), 2)
+
+    def test_deposits_and_gold_locks_lock_each_wallet_once(self):
+        Wallet.objects.filter(user=self.user).update(gold_holdings=Decimal('2.0000'))
+        deposits = [DepositRequest.objects.create(user=self.user, amount=Decimal('10'), currency='USDT') for _ in range(2)]
+        lock = GoldLock.objects.create(
+            user=self.user, amount=Decimal('1.5000'), start_date=timezone.now(),
+            end_date=timezone.now() + timedelta(days=30), interest_rate=Decimal('2.00'),
+        )
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(
+                '/api/admin/deposits/bulk-review/', {'ids': [deposit.pk for deposit in deposits], 'action': 'approve'},
+                format='json',
+            )
+        self.assertEqual([result['status'] for result in response.data['results']], ['APPROVED', 'APPROVED'])
+        wallet_reads = [q['sql'] for q in queries.captured_queries if q['sql'].startswith('SELECT') and 'FROM "accounts_wallet"' in q['sql']]
+        self.assertEqual(len(wallet_reads), 1)
+
+        response = self.client.post('/api/admin/gold-locks/bulk-review/', {'ids': [lock.pk], 'action': 'approve'}, format='json')
+        self.assertEqual(response.data['results'], [{'id': lock.pk, 'status': 'APPROVED'}])
+        wallet = Wallet.objects.get(user=self.user)
+        self.assertEqual((wallet.balance, wallet.gold_holdings), (Decimal('120.00'), Decimal('0.5000')))
+
+    def test_non_admin_is_refused(self):
+        deposit = DepositRequest.objects.create(user=self.user, amount=Decimal('10'), currency='USDT')
+        self.client.force_authenticate(self.user)
+        response = self.client.post('/api/admin/deposits/bulk-review/', {'ids': [deposit.pk], 'action': 'approve'}, format='json')
+        self.assertEqual(response.status_code, 403)
+
+
+# Rows are added with bulk_create, which sends no invalidation signals
+@override_settings(RESPONSE_CACHE_ROUTES={})
+class AsyncViewTests(TestCase):
+    """The async variants must answer exactly like the sync views."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='reader', email='reader@example.com', password='pass12345')
+        Wallet.objects.create(user=self.user, balance=Decimal('12.50'))
+        MarketNews.objects.bulk_create(
+            MarketNews(title=f'Gold {i}', summary='Gold moves', source='Wire', sentiment='NEUTRAL',
+                       published_date=timezone.now() - timedelta(hours=i))
+            for i in range(12)
+        )
+        GoldPrice.objects.bulk_create(
+            GoldPrice(timestamp=timezone.now() - timedelta(seconds=i), price=Decimal('2000.5')) for i in range(5)
+        )
+
+    def test_market_news_matches_sync(self):
+        sync = self.client.get('/api/market/news/')
+        self.assertEqual(self.client.get('/api/async/market/news/').content, sync.content)
+
+    def test_gold_prices_match_first_sync_page(self):
+        sync = self.client.get('/api/gold/prices/?page_size=3')
+        response = self.client.get('/api/async/gold/prices/?page_size=3')
+        self.assertEqual(response.json()['results'], sync.json()['results'])
+
+    def test_profile_requires_token(self):
+        self.assertEqual(self.client.get('/api/async/user/profile/').status_code, 401)
+        token = RefreshToken.for_user(self.user).access_token
+        response = self.client.get('/api/async/user/profile/', HTTP_AUTHORIZATION=f'Bearer {token}')
+        sync = self.client.get('/api/user/profile/', HTTP_AUTHORIZATION=f'Bearer {token}')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, sync.content)
+
+
+class MarketNewsFeedTests(TestCase):
+
+    def setUp(self):
+        invalidate_feed()
+        self.news = MarketNews.objects.create(
+            title='Gold steady', summary='Flat session', source='Wire', sentiment='NEUTRAL', published_date=timezone.now()
+        )
+
+    def test_feed_is_rendered_once_and_revalidated(self):
+        first = self.client.get('/api/market/news/')
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first.json()[0]['title'], 'Gold steady')
+
+        with CaptureQueriesContext(connection) as queries:
+            again = self.client.get('/api/market/news/')
+            not_modified = self.client.get('/api/market/news/', HTTP_IF_NONE_MATCH=first['ETag'])
+            since = self.client.get('/api/market/news/', HTTP_IF_MODIFIED_SINCE=first['Last-Modified'])
+        self.assertEqual(len(queries), 0)
+        self.assertEqual(again.content, first.content)
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(since.status_code, 304)
+
+    def test_feed_changes_with_news(self):
+        first = self.client.get('/api/market/news/')
+        self.news.title = 'Gold rallies'
+        self.news.save()
+        response = self.client.get('/api/market/news/', HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()[0]['title'], 'Gold rallies')
+        self.assertNotEqual(response['ETag'], first['ETag'])
+
+    def test_rebuilding_unchanged_news_keeps_the_validators(self):
+        first = self.client.get('/api/market/news/')
+        # A rebuild of unchanged news, e.g. after an unrelated invalidation
+        invalidate_feed()
+        self.assertEqual(self.client.get('/api/market/news/', HTTP_IF_NONE_MATCH=first['ETag']).status_code, 304)
+        invalidate_feed()
+        since = self.client.get('/api/market/news/', HTTP_IF_MODIFIED_SINCE=first['Last-Modified'])
+        self.assertEqual(since.status_code, 304)
+
+    def test_last_modified_moves_when_the_feed_changes(self):
+        first = self.client.get('/api/market/news/')
+        self.news.title = 'Gold rallies'
+        self.news.save()
+        edited = self.client.get('/api/market/news/', HTTP_IF_MODIFIED_SINCE=first['Last-Modified'])
+        self.assertEqual(edited.status_code, 200)
+        self.assertEqual(edited.json()[0]['title'], 'Gold rallies')
+
+        # Published before everything in the feed, so the newest date stays put
+        MarketNews.objects.create(
+            title='Gold dips', summary='Down 1%', source='Wire', sentiment='NEGATIVE',
+            published_date=self.news.published_date - timedelta(days=1),
+        )
+        backdated = self.client.get('/api/market/news/', HTTP_IF_MODIFIED_SINCE=edited['Last-Modified'])
+        self.assertEqual(backdated.status_code, 200)
+        self.assertEqual(len(backdated.json()), 2)
+
+    @override_settings(NEWS_FEED_CACHE_TTL=0.2)
+    def test_feed_expires(self):
+        first = self.client.get('/api/market/news/')
+        # Written without signals, as bulk imports and other workers do
+        MarketNews.objects.bulk_create([MarketNews(
+            title='Gold rallies', summary='Up 2%', source='Wire', sentiment='POSITIVE', published_date=timezone.now()
+        )])
+        self.assertEqual(self.client.get('/api/market/news/').content, first.content)
+        time.sleep(0.3)
+        response = self.client.get('/api/market/news/')
+        self.assertEqual(response.json()[0]['title'], 'Gold rallies')
+        self.assertNotEqual(response['ETag'], first['ETag'])
+
+    def test_empty_feed(self):
+        MarketNews.objects.all().delete()
+        response = self.client.get('/api/market/news/')
+        self.assertEqual(response.json(), [])
+        self.assertNotIn('Last-Modified', response)
+
+
+@override_settings(RESPONSE_CACHE_SINGLE_WORKER=True)
+class ResponseCacheTests(TestCase):
+
+    def setUp(self):
+        caches['responses'].clear()
+        self.alice = self.user('alice')
+        self.bob = self.user('bob')
+
+    def user(self, username):
+        user = User.objects.create_user(username=username, email=f'{username}@example.com', password='pass12345')
+        Wallet.objects.create(user=user, balance=Decimal('1000.00'))
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(user).access_token}')
+        user.api = client
+        return user
+
+    def trade(self, user):
+        Transaction.objects.create(user=user, transaction_type='BUY', amount=Decimal('1'), price_at_transaction=Decimal('2000'))
+
+    def test_public_route_is_shared_and_expires_on_new_price(self):
+        GoldPrice.objects.create(price=Decimal('2000.00'))
+        self.assertEqual(self.alice.api.get('/api/gold/prices/')['X-Cache'], 'MISS')
+        with CaptureQueriesContext(connection) as queries:
+            response = self.bob.api.get('/api/gold/prices/')
+        self.assertEqual(response['X-Cache'], 'HIT')
+        self.assertEqual(len(queries), 0)
+
+        GoldPrice.objects.create(price=Decimal('2010.00'))
+        response = self.bob.api.get('/api/gold/prices/')
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.json()['results'][0]['price'], '2010.00')
+
+    def test_user_route_expires_only_for_the_owner(self):
+        self.trade(self.alice)
+        self.alice.api.get('/api/user/transactions/')
+        self.bob.api.get('/api/user/transactions/')
+
+        self.trade(self.bob)
+        self.assertEqual(self.alice.api.get('/api/user/transactions/')['X-Cache'], 'HIT')
+        response = self.bob.api.get('/api/user/transactions/')
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(len(response.json()['results']), 1)
+
+    @override_settings(RESPONSE_CACHE_SINGLE_WORKER=False)
+    def test_process_local_cache_only_keeps_public_responses(self):
+        GoldPrice.objects.create(price=Decimal('2000.00'))
+        self.alice.api.get('/api/gold/prices/')
+        self.assertEqual(self.alice.api.get('/api/gold/prices/')['X-Cache'], 'HIT')
+        self.alice.api.get('/api/user/transactions/')
+        self.assertFalse(self.alice.api.get('/api/user/transactions/').has_header('X-Cache'))
+
+    def test_unauthenticated_requests_are_not_cached(self):
+        response = self.client.get('/api/user/transactions/')
+        self.assertEqual(response.status_code, 401)
+        self.assertFalse(response.has_header('X-Cache'))
+
+
+class MarketNewsSearchTests(TestCase):
+
+    def setUp(self):
+        caches['responses'].clear()
+        now = timezone.now()
+        self.rally = self.news('Gold rallies on rate cut', 'Bullion jumps as yields fall', 'Reuters', 'POSITIVE', now)
+        self.slump = self.news('Gold slumps', 'Dollar strength weighs on bullion', 'Bloomberg', 'NEGATIVE', now - timedelta(days=3))
+        self.oil = self.news('Oil rallies', 'Crude climbs on supply cuts', 'Reuters', 'POSITIVE', now)
+
+    def news(self, title, summary, source, sentiment, published_date):
+        return MarketNews.objects.create(
+            title=title, summary=summary, source=source, sentiment=sentiment, published_date=published_date
+        )
+
+    def search(self, **params):
+        response = self.client.get('/api/market/news/search/', params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return [item['id'] for item in response.json()]
+
+    def test_matches_every_word_with_filters(self):
+        self.assertEqual(set(self.search(q='bullion')), {self.rally.id, self.slump.id})
+        self.assertEqual(self.search(q='gold rallies'), [self.rally.id])
+        self.assertEqual(set(self.search(q='rallies', sentiment='POSITIVE', source='Reuters')), {self.rally.id, self.oil.id})
+        self.assertEqual(self.search(q='gold', sentiment='NEGATIVE'), [self.slump.id])
+        self.assertEqual(self.search(q='gold', source='Bloomberg'), [self.slump.id])
+        self.assertEqual(self.search(q='gold', **{'from': (timezone.now() - timedelta(days=1)).isoformat()}), [self.rally.id])
+        self.assertEqual(self.search(q='gold', to=(timezone.now() - timedelta(days=1)).isoformat()), [self.slump.id])
+        # Query syntax characters are just text
+        self.assertEqual(self.search(q='"gold" -(slumps*'), [self.slump.id])
+
+    def test_index_follows_updates_and_deletes(self):
+        self.oil.title = 'Silver rallies'
+        self.oil.save()
+        self.assertEqual(self.search(q='silver'), [self.oil.id])
+        self.assertEqual(self.search(q='oil'), [])
+        self.rally.delete()
+        self.assertEqual(self.search(q='bullion'), [self.slump.id])
+
+    def test_rejects_bad_parameters(self):
+        for params in ({}, {'q': 'gold', 'sentiment': 'HAPPY'}, {'q': 'gold', 'limit': '0'}, {'q': 'gold', 'from': 'yesterday'}):
+            response = self.client.get('/api/market/news/search/', params)
+            self.assertEqual(response.status_code, 400, params)
+
+
+class LatestPriceTests(TestCase):
+
+    def setUp(self):
+        latest_price.invalidate()
+        GoldPrice.objects.create(price=Decimal('2000.00'), timestamp=timezone.now() - timedelta(minutes=1))
+
+    def test_served_from_cache_after_first_read(self):
+        self.assertEqual(get_latest_price(), Decimal('2000.00'))
+        latest_price.clear()  # drop the local copy; the cached one remains
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(get_latest_price(), Decimal('2000.00'))
+        self.assertEqual(len(queries), 0)
+
+    def test_tick_refreshes_price_on_commit(self):
+        get_latest_price()
+        with self.captureOnCommitCallbacks(execute=True):
+            GoldPrice.objects.create(price=Decimal('2100.00'))
+            self.assertEqual(get_latest_price(), Decimal('2000.00'))
+        self.assertEqual(get_latest_price(), Decimal('2100.00'))
+
+    def test_rolled_back_tick_never_becomes_the_price(self):
+        get_latest_price()
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            try:
+                with transaction.atomic():
+                    GoldPrice.objects.create(price=Decimal('9999.00'))
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+        self.assertEqual(callbacks, [])
+        self.assertEqual(get_latest_price(), Decimal('2000.00'))
+
+    @override_settings(GOLD_PRICE_LOCAL_TTL=0, GOLD_PRICE_CACHE_TTL=0.05)
+    def test_cached_price_expires_to_the_database(self):
+        get_latest_price()
+        # Saved by another worker: bulk_create sends no signals here
+        GoldPrice.objects.bulk_create([GoldPrice(price=Decimal('2200.00'))])
+        self.assertEqual(get_latest_price(), Decimal('2000.00'))
+        time.sleep(0.1)
+        self.assertEqual(get_latest_price(), Decimal('2200.00'))
+
+
+class ExplainQueriesCommandTests(TestCase):
+
+    def test_reports_every_list_view(self):
+        out = StringIO()
+        call_command('explain_queries', stdout=out)
+        output = out.getvalue()
+        list_views = {
+            view_class.__name__ for _, view_class in iter_api_views(get_resolver().url_patterns)
+            if issubclass(view_class, ListModelMixin)
+        }
+        self.assertIn('MarketNewsSearchView', list_views)
+        for name in list_views:
+            self.assertIn(f'{name} (', output)
+        self.assertIn('MarketNewsSearchView (api/market/news/search/): skipped', output)
+
+    def test_paginated_list_views_use_their_indexes(self):
+        out = StringIO()
+        call_command('explain_queries', '--fail', stdout=out)
+        for line in out.getvalue().splitlines():
+            if not line.startswith(' '):
+                self.assertRegex(line, r': (ok|skipped \(.*\))$')
+
+    def test_flags_a_missing_index(self):
+        with connection.cursor() as cursor:
+            # Rolled back with the test
+            cursor.execute('DROP INDEX transaction_user_ts_idx')
+        out = StringIO()
+        with self.assertRaisesMessage(CommandError, '1 view(s) need an index'):
+            call_command('explain_queries', '--fail', stdout=out)
+        self.assertIn('TransactionListCreateView (api/user/transactions/): sort step', out.getvalue())
+
+
+class OrderBookTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='trader', email='trader@example.com', password='pass12345')
+        Wallet.objects.create(user=self.user, balance=Decimal('10000.00'), gold_holdings=Decimal('2.0000'))
+        self.book = OrderBook()
+
+    def order(self, transaction_type, order_type, level, amount='1'):
+        return Transaction.objects.create(
+            user=self.user, transaction_type=transaction_type, order_type=order_type, amount=Decimal(amount),
+            price_at_transaction=Decimal('2000'), status='PENDING',
+            limit_price=Decimal(level) if order_type == 'LIMIT' else None,
+            stop_price=Decimal(level) if order_type == 'STOP' else None,
+        )
+
+    def status(self, order):
+        return Transaction.objects.get(pk=order.pk).status
+
+    def test_tick_fills_only_crossed_orders(self):
+        buy_limit = self.order('BUY', 'LIMIT', '1990')
+        sell_limit = self.order('SELL', 'LIMIT', '2010')
+        buy_stop = self.order('BUY', 'STOP', '2020')
+        sell_stop = self.order('SELL', 'STOP', '1980')
+
+        self.assertEqual(self.book.on_tick(Decimal('2000')), [])
+        self.assertEqual(len(self.book), 4)
+
+        self.assertEqual(self.book.on_tick(Decimal('1985')), [buy_limit.pk])
+        self.assertEqual(sorted(self.book.on_tick(Decimal('2015'))), [sell_limit.pk])
+        self.assertEqual(self.status(buy_stop), 'PENDING')
+        self.assertEqual(self.status(sell_stop), 'PENDING')
+
+        filled = Transaction.objects.get(pk=buy_limit.pk)
+        self.assertEqual((filled.status, filled.executed_price), ('EXECUTED', Decimal('1985.00')))
+        wallet = Wallet.objects.get(user=self.user)
+        self.assertEqual(wallet.balance, Decimal('10000.00') - Decimal('1985.00') + Decimal('2015.00'))
+        self.assertEqual(wallet.gold_holdings, Decimal('2.0000'))
+        self.assertEqual(LedgerEntry.objects.filter(user=self.user, reason='TRADE').count(), 2)
+
+    def test_uncovered_orders_in_a_batch_are_cancelled(self):
+        first = self.order('BUY', 'LIMIT', '2000', amount='3')
+        second = self.order('BUY', 'LIMIT', '2000', amount='3')  # 6000 each; the wallet covers one
+        self.book.on_tick(Decimal('2000'))
+        self.assertEqual(self.status(first), 'EXECUTED')
+        self.assertEqual(self.status(second), 'CANCELLED')
+        self.assertIsNone(Transaction.objects.get(pk=second.pk).executed_price)
+        self.assertEqual(Wallet.objects.get(user=self.user).balance, Decimal('4000.00'))
+
+    def test_order_committed_after_a_higher_id_is_still_filled(self):
+        self.book.sync()
+        # An id handed out to an insert that hasn't committed yet
+        placeholder = self.order('SELL', 'LIMIT', '2010')
+        gap = placeholder.pk
+        placeholder.delete()
+        early = self.order('SELL', 'LIMIT', '2010')
+        self.book.on_tick(Decimal('1000'))  # the tail moves past the gap
+        late = self.order('SELL', 'LIMIT', '2010')
+        Transaction.objects.filter(pk=late.pk).update(id=gap)
+
+        self.assertEqual(sorted(self.book.on_tick(Decimal('2010'))), [gap, early.pk])
+        self.assertEqual(self.status(Transaction(pk=gap)), 'EXECUTED')
+
+    def test_idle_tick_reads_only_new_orders(self):
+        for _ in range(5):
+            self.order('BUY', 'LIMIT', '1000')
+        self.book.on_tick(Decimal('2000'))
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.book.on_tick(Decimal('2000')), [])
+        self.assertEqual(len(queries), 1)
+        self.assertIn('"id" > ', queries[0]['sql'])
+
+    def test_cancelled_orders_leave_the_book(self):
+        order_book.clear()
+        order = self.order('BUY', 'LIMIT', '1990')
+        order_book.on_tick(Decimal('2000'))
+        self.assertEqual(len(order_book), 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            order.status = 'CANCELLED'
+            order.save()
+        self.assertEqual(len(order_book), 0)
+        self.assertEqual(order_book.on_tick(Decimal('1900')), [])
+
+        # Cancelled elsewhere: gone at the next reload
+        other = self.order('BUY', 'LIMIT', '1990')
+        order_book.on_tick(Decimal('2000'))
+        Transaction.objects.filter(pk=other.pk).update(status='CANCELLED')
+        with override_settings(ORDER_BOOK_RECONCILE_INTERVAL=0):
+            self.assertEqual(order_book.on_tick(Decimal('2000')), [])
+        self.assertEqual(len(order_book), 0)
+
+    def test_crossed_orders_settle_in_a_fixed_number_of_queries(self):
+        users = User.objects.bulk_create(
+            User(username=f'bulk{i}', email=f'bulk{i}@example.com') for i in range(30)
+        )
+        Wallet.objects.bulk_create(Wallet(user=user, balance=Decimal('100000.00')) for user in users)
+        Transaction.objects.bulk_create(
+            Transaction(
+                user=users[i % 30], transaction_type='BUY', order_type='LIMIT', amount=Decimal('1'),
+                price_at_transaction=Decimal('2000'), limit_price=Decimal('1990'), status='PENDING',
+            )
+            for i in range(300)
+        )
+        self.book.on_tick(Decimal('2000'))
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(len(self.book.on_tick(Decimal('1990'))), 300)
+        # Read, claim, wallets, wallet UPDATE and the ledger INSERT batches
+        statements = [q['sql'] for q in queries.captured_queries if 'SAVEPOINT' not in q['sql']]
+        self.assertLessEqual(len(statements), 7)
+        self.assertEqual(Transaction.objects.filter(status='EXECUTED').count(), 300)
+        self.assertEqual(
+            set(Wallet.objects.filter(user__in=users).values_list('balance', 'gold_holdings')),
+            {(Decimal('80100.00'), Decimal('10.0000'))},
+        )
+        self.assertEqual(LedgerEntry.objects.filter(reason='TRADE').count(), 300)
+
+    def test_batch_is_rolled_back_when_another_settler_claims_an_order(self):
+        first = self.order('SELL', 'LIMIT', '2010')
+        second = self.order('SELL', 'LIMIT', '2010')
+        real_filter = Transaction.objects.filter
+        reads = []
+
+        def racing_filter(*args, **kwargs):
+            if 'pk__in' in kwargs:
+                reads.append(kwargs)
+                if len(reads) == 2:
+                    # The claim: another process filled ``second`` since the read
+                    real_filter(pk=second.pk).update(status='EXECUTED')
+            return real_filter(*args, **kwargs)
+
+        with mock.patch.object(Transaction.objects, 'filter', side_effect=racing_filter):
+            with self.assertRaises(SettlementConflict):
+                settle_orders([first.pk, second.pk], Decimal('2010'))
+        self.assertEqual(self.status(first), 'PENDING')
+        self.assertEqual(Wallet.objects.get(user=self.user).balance, Decimal('10000.00'))
+
+    def test_order_is_settled_once(self):
+        order = self.order('SELL', 'LIMIT', '2010')
+        self.assertEqual(settle_orders([order.pk], Decimal('2010')), ([order.pk], []))
+        self.assertEqual(settle_orders([order.pk], Decimal('2010')), ([], []))
+        wallet = Wallet.objects.get(user=self.user)
+        self.assertEqual((wallet.balance, wallet.gold_holdings), (Decimal('12010.00'), Decimal('1.0000')))
+
+
+class OrderPlacementTests(TestCase):
+
+    def setUp(self):
+        latest_price.invalidate()
+        GoldPrice.objects.create(price=Decimal('2000.00'))
+        self.user = User.objects.create_user(username='trader', email='trader@example.com', password='pass12345')
+        Wallet.objects.create(user=self.user, balance=Decimal('10000.00'), gold_holdings=Decimal('1.0000'))
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def place(self, **data):
+        order = {'transaction_type': 'BUY', 'order_type': 'LIMIT', 'amount': '1', 'limit_price': '1990'}
+        order.update(data)
+        return self.client.post('/api/user/transactions/', {k: v for k, v in order.items() if v is not None}, format='json')
+
+    def test_invalid_orders_are_rejected(self):
+        for data in [
+            {'transaction_type': ''}, {'transaction_type': None}, {'order_type': 'FOO'},
+            {'limit_price': 'abc'}, {'limit_price': '-5'}, {'limit_price': '0'}, {'limit_price': None},
+            {'limit_price': '1990.001'}, {'limit_price': '1e12'}, {'limit_price': True},
+            {'order_type': 'STOP', 'stop_price': None},
+        ]:
+            with self.subTest(data=data):
+                self.assertEqual(self.place(**data).status_code, 400)
+        self.assertFalse(Transaction.objects.exists())
+
+    def test_only_the_triggering_level_is_stored(self):
+        response = self.place(order_type='STOP', stop_price='2100.50', limit_price='abc')
+        self.assertEqual(response.status_code, 201)
+        order = Transaction.objects.get()
+        self.assertEqual((order.status, order.stop_price, order.limit_price), ('PENDING', Decimal('2100.50'), None))
+
+
+class TickHookTests(TestCase):
+
+    def setUp(self):
+        latest_price.invalidate()
+        self.admin = User.objects.create_user(username='admin', email='admin@example.com', password='pass12345', is_admin=True)
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def test_failing_consumer_does_not_stop_the_others(self):
+        with mock.patch.object(order_book, 'on_tick', side_effect=RuntimeError('book down')):
+            with self.assertLogs(level='ERROR'):
+                with self.captureOnCommitCallbacks(execute=True):
+                    response = self.client.post('/api/gold/prices/', {'price': '2050.00'}, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(get_latest_price(), Decimal('2050.00'))
+        tick = GoldPrice.objects.get()
+        candle = PriceCandle.objects.get(interval='1m', bucket=bucket_start(tick.timestamp, '1m'))
+        self.assertEqual(candle.close, Decimal('2050.00'))
+
+
+class AlertIndexTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='watcher', email='watcher@example.com', password='pass12345')
+        self.index = AlertIndex()
+
+    def alert(self, alert_type, target):
+        return PriceAlert.objects.create(user=self.user, alert_type=alert_type, target_price=Decimal(target))
+
+    def triggered(self):
+        return set(PriceAlert.objects.filter(triggered__isnull=False).values_list('pk', flat=True))
+
+    def test_tick_triggers_crossed_alerts_once(self):
+        above = self.alert('ABOVE', '2100')
+        below = self.alert('BELOW', '1900')
+        far = self.alert('ABOVE', '2500')
+
+        self.assertEqual(self.index.on_tick(Decimal('2000')), [])
+        self.assertEqual(self.index.on_tick(Decimal('2100')), [above.pk])
+        self.assertEqual(self.index.on_tick(Decimal('1850')), [below.pk])
+        self.assertEqual(self.triggered(), {above.pk, below.pk})
+
+        # One-shot: crossing the level again fires nothing
+        first_fired = PriceAlert.objects.get(pk=above.pk).triggered
+        self.assertEqual(self.index.on_tick(Decimal('2200')), [])
+        self.assertEqual(PriceAlert.objects.get(pk=above.pk).triggered, first_fired)
+        self.assertEqual(len(self.index), 1)
+        self.assertIsNone(PriceAlert.objects.get(pk=far.pk).triggered)
+
+    def test_deactivated_alert_leaves_the_index(self):
+        alert_index.clear()
+        alert = self.alert('ABOVE', '2100')
+        alert_index.on_tick(Decimal('2000'))
+        self.assertEqual(len(alert_index), 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            alert.is_active = False
+            alert.save()
+        self.assertEqual(len(alert_index), 0)
+        self.assertEqual(alert_index.on_tick(Decimal('2200')), [])
+
+        # Deactivated elsewhere: never marked, and gone at the next reload
+        other = self.alert('ABOVE', '2100')
+        alert_index.on_tick(Decimal('2000'))
+        PriceAlert.objects.filter(pk=other.pk).update(is_active=False)
+        alert_index.on_tick(Decimal('2200'))
+        self.assertEqual(self.triggered(), set())
+        third = self.alert('ABOVE', '2100')
+        third.is_active = False
+        third.save()
+        alert_index.on_tick(Decimal('2000'))
+        PriceAlert.objects.filter(pk=third.pk).update(is_active=True)
+        with override_settings(ALERT_INDEX_RECONCILE_INTERVAL=0):
+            alert_index.on_tick(Decimal('2000'))
+        self.assertEqual(len(alert_index), 1)
+
+    def test_alert_committed_after_a_higher_id_is_still_evaluated(self):
+        self.index.sync()
+        # An id handed out to an insert that hasn't committed yet
+        placeholder = self.alert('BELOW', '1900')
+        gap = placeholder.pk
+        placeholder.delete()
+        early = self.alert('BELOW', '1900')
+        self.index.on_tick(Decimal('2000'))  # the tail moves past the gap
+        late = self.alert('BELOW', '1900')
+        PriceAlert.objects.filter(pk=late.pk).update(id=gap)
+
+        self.assertEqual(sorted(self.index.on_tick(Decimal('1900'))), [gap, early.pk])
+        self.assertEqual(self.triggered(), {gap, early.pk})
+
+    def test_idle_tick_reads_only_new_alerts(self):
+        for _ in range(5):
+            self.alert('ABOVE', '2500')
+        self.index.on_tick(Decimal('2000'))
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.index.on_tick(Decimal('2000')), [])
+        self.assertEqual(len(queries), 1)
+        self.assertIn('"id" > ', queries[0]['sql'])
+
+
+class PriceBroadcasterTests(TestCase):
+
+    async def next_message(self, stream):
+        return await asyncio.wait_for(stream.__anext__(), 1)
+
+    async def test_tick_published_while_subscriber_is_busy_is_not_lost(self):
+        broadcaster = PriceBroadcaster()
+        stream = broadcaster.subscribe()
+        waiting = asyncio.ensure_future(self.next_message(stream))
+        await asyncio.sleep(0.01)
+        broadcaster.publish({'tick': 1})
+        self.assertEqual(json.loads(await waiting), {'tick': 1})
+
+        # Two ticks arrive while the subscriber is still handling the first
+        broadcaster.publish({'tick': 2})
+        broadcaster.publish({'tick': 3})
+        await asyncio.sleep(0.01)
+        self.assertEqual(json.loads(await self.next_message(stream)), {'tick': 3})
+        await stream.aclose()
+
+    async def test_idle_subscriber_gets_heartbeats(self):
+        stream = PriceBroadcaster().subscribe(heartbeat=0.01)
+        self.assertIsNone(await self.next_message(stream))
+        await stream.aclose()
+
+
+class PriceStreamEndpointTests(TestCase):
+
+    def setUp(self):
+        latest_price.update(timezone.now(), Decimal('2000'))
+
+    def tearDown(self):
+        latest_price.invalidate()
+
+    async def test_sse_stream_sends_current_price_then_ticks(self):
+        response = await self.async_client.get('/api/gold/prices/stream/')
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        chunks = aiter(response.streaming_content)
+        self.assertTrue((await anext(chunks)).startswith(b'retry:'))
+        self.assertIn(b'"price": "2000.00"', await anext(chunks))
+
+        tick = asyncio.ensure_future(anext(chunks))
+        await asyncio.sleep(0.01)
+        price_broadcaster.publish({'price': '2001.00'})
+        self.assertEqual(await asyncio.wait_for(tick, 1), b'event: price\ndata: {"price": "2001.00"}\n\n')
+        await chunks.aclose()
+
+    async def test_websocket_sends_current_price_then_ticks(self):
+        from gold_flux.asgi import application
+
+        incoming = asyncio.Queue()
+        outgoing = asyncio.Queue()
+        await incoming.put({'type': 'websocket.connect'})
+        scope = {'type': 'websocket', 'path': '/ws/gold/prices/', 'headers': []}
+        server = asyncio.ensure_future(application(scope, incoming.get, outgoing.put))
+
+        self.assertEqual((await asyncio.wait_for(outgoing.get(), 1))['type'], 'websocket.accept')
+        self.assertEqual(json.loads((await asyncio.wait_for(outgoing.get(), 1))['text'])['price'], '2000.00')
+        price_broadcaster.publish({'price': '2001.00'})
+        self.assertEqual(json.loads((await asyncio.wait_for(outgoing.get(), 1))['text']), {'price': '2001.00'})
+
+        await incoming.put({'type': 'websocket.disconnect'})
+        await asyncio.wait_for(server, 1)
+
+    async def test_sse_stream_stops_when_the_client_disconnects(self):
+        from gold_flux.asgi import application
+
+        incoming = asyncio.Queue()
+        outgoing = asyncio.Queue()
+        await incoming.put({'type': 'http.request', 'body': b'', 'more_body': False})
+        scope = {'type': 'http', 'method': 'GET', 'path': '/api/gold/prices/stream/', 'headers': []}
+        server = asyncio.ensure_future(application(scope, incoming.get, outgoing.put))
+
+        start = await asyncio.wait_for(outgoing.get(), 1)
+        self.assertEqual(start['status'], 200)
+        self.assertIn((b'content-type', b'text/event-stream'), start['headers'])
+        self.assertTrue((await asyncio.wait_for(outgoing.get(), 1))['body'].startswith(b'retry:'))
+        self.assertIn(b'"price": "2000.00"', (await asyncio.wait_for(outgoing.get(), 1))['body'])
+
+        await incoming.put({'type': 'http.disconnect'})
+        await asyncio.wait_for(server, 1)
+        await asyncio.sleep(0.01)
+        price_broadcaster.publish({'price': '2001.00'})
+        await asyncio.sleep(0.01)
+        self.assertTrue(outgoing.empty())
+
+    async def test_unknown_websocket_path_is_closed(self):
+        from gold_flux.asgi import application
+
+        sent = []
+
+        async def send(message):
+            sent.append(message)
+
+        await application({'type': 'websocket', 'path': '/ws/nope/'}, None, send)
+        self.assertEqual(sent, [{'type': 'websocket.close', 'code': 4404}])
+
+
+class PriceCandleTests(TestCase):
+
+    def setUp(self):
+        caches['responses'].clear()
+        self.start = datetime(2026, 3, 2, 10, 0, tzinfo=dt_timezone.utc)
+
+    def tick(self, seconds, price):
+        with self.captureOnCommitCallbacks(execute=True):
+            GoldPrice.objects.create(timestamp=self.start + timedelta(seconds=seconds), price=Decimal(price))
+
+    def candle(self, interval, bucket=None):
+        return PriceCandle.objects.get(interval=interval, bucket=bucket or self.start)
+
+    def ohlc(self, candle):
+        return [str(candle.open), str(candle.high), str(candle.low), str(candle.close), candle.tick_count]
+
+    def test_ticks_aggregate_and_roll_up(self):
+        self.tick(0, '2000.00')
+        self.tick(20, '2010.00')
+        self.tick(40, '1990.00')
+        self.tick(70, '2005.00')
+        self.assertEqual(self.ohlc(self.candle('1m')), ['2000.00', '2010.00', '1990.00', '1990.00', 3])
+        self.assertEqual(self.ohlc(self.candle('5m')), ['2000.00', '2010.00', '1990.00', '2005.00', 4])
+        self.assertEqual(self.ohlc(self.candle('1d', self.start.replace(hour=0))), self.ohlc(self.candle('5m')))
+
+    def test_out_of_order_ticks_keep_open_and_close(self):
+        self.tick(30, '2000.00')
+        self.tick(50, '2020.00')
+        self.tick(40, '2030.00')  # Committed after the newer tick
+        self.tick(10, '1980.00')  # ... and after the older ones
+        self.assertEqual(self.ohlc(self.candle('1m')), ['1980.00', '2030.00', '1980.00', '2020.00', 4])
+        self.assertEqual(str(self.candle('5m').close), '2020.00')
+
+    def test_window_includes_the_bucket_containing_the_start(self):
+        for minute in range(3):
+            self.tick(minute * 60, f'20{minute}0.00')
+        response = self.client.get('/api/gold/candles/', {
+            'interval': '1m', 'from': (self.start + timedelta(seconds=90)).isoformat(),
+            'to': (self.start + timedelta(seconds=150)).isoformat(),
+        })
+        self.assertEqual([candle['close'] for candle in response.json()], ['2010.00', '2020.00'])
+
+    def test_rebuild_matches_live_aggregation(self):
+        for seconds, price in [(0, '2000.00'), (50, '2010.00'), (20, '1995.00'), (400, '2001.00')]:
+            self.tick(seconds, price)
+        live = {(c.interval, c.bucket): self.ohlc(c) for c in PriceCandle.objects.all()}
+        PriceCandle.objects.all().delete()
+
+        out = StringIO()
+        call_command('rebuild_candles', stdout=out)
+        self.assertEqual({(c.interval, c.bucket): self.ohlc(c) for c in PriceCandle.objects.all()}, live)
+        self.assertIn(f'Rebuilt {len(live)} candles', out.getvalue())
+
+
+class GoldPriceImportTests(TestCase):
+
+    def setUp(self):
+        caches['responses'].clear()
+        latest_price.invalidate()
+        self.start = datetime(2026, 3, 2, 10, 0, tzinfo=dt_timezone.utc)
+        self.admin = User.objects.create_user(username='admin', email='admin@example.com', password='pass12345', is_admin=True)
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def at(self, seconds):
+        return (self.start + timedelta(seconds=seconds)).isoformat()
+
+    def post(self, body, content_type='application/x-ndjson'):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post('/api/gold/prices/bulk/', body, content_type=content_type)
+
+    def test_ndjson_and_csv_import(self):
+        response = self.post(''.join(
+            json.dumps({'timestamp': self.at(seconds), 'price': price}) + '\n'
+            for seconds, price in [(0, '2000'), (30, '2010.5')]
+        ))
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json(), {'received': 2, 'inserted': 2, 'duplicates': 0})
+
+        response = self.post(f'timestamp,price\n{self.at(60)},2020\n', content_type='text/csv')
+        self.assertEqual(response.json()['inserted'], 1)
+        self.assertEqual(
+            list(GoldPrice.objects.order_by('timestamp').values_list('price', flat=True)),
+            [Decimal('2000.00'), Decimal('2010.50'), Decimal('2020.00')],
+        )
+
+    def test_rejects_bad_input(self):
+        self.assertEqual(self.post('{"price": 1}\n').status_code, 400)
+        self.assertEqual(self.post('x', content_type='text/plain').status_code, 415)
+        self.client.force_authenticate(User.objects.create_user(username='u', email='u@example.com', password='pass12345'))
+        self.assertEqual(self.post('').status_code, 403)
+        self.assertFalse(GoldPrice.objects.exists())
+
+    def test_duplicates_are_skipped(self):
+        GoldPrice.objects.create(timestamp=self.start, price=Decimal('1999.00'))
+        body = f'timestamp,price\n{self.at(0)},2000\n{self.at(10)},2001\n{self.at(10)},2002\n{self.at(20)},2003\n'
+        # Small chunks: duplicates within a chunk, across chunks and against stored rows
+        stats = import_prices(parse_prices(body.splitlines(keepends=True), 'csv'), chunk_size=2)
+        self.assertEqual(stats, {'received': 4, 'inserted': 2, 'duplicates': 2})
+        self.assertEqual(
+            list(GoldPrice.objects.order_by('timestamp').values_list('price', flat=True)),
+            [Decimal('1999.00'), Decimal('2001.00'), Decimal('2003.00')],
+        )
+        self.assertEqual(self.post(f'timestamp,price\n{self.at(0)},2000\n', 'text/csv').json()['inserted'], 0)
+
+    def test_refreshes_candles_and_latest_price(self):
+        GoldPrice.objects.create(timestamp=self.start, price=Decimal('2000.00'))
+        self.assertEqual(get_latest_price(), Decimal('2000.00'))
+        self.post(f'timestamp,price\n{self.at(40)},2010\n{self.at(20)},1990\n{self.at(0)},2222\n', 'text/csv')
+        self.assertEqual(get_latest_price(), Decimal('2010.00'))
+        candle = PriceCandle.objects.get(interval='1m', bucket=self.start)
+        self.assertEqual(
+            [candle.open, candle.high, candle.low, candle.close, candle.tick_count],
+            [Decimal('2000.00'), Decimal('2010.00'), Decimal('1990.00'), Decimal('2010.00'), 3],
+        )
+
+    def test_command(self):
+        out = StringIO()
+        with tempfile.NamedTemporaryFile('w', suffix='.ndjson') as stream:
+            stream.write(json.dumps({'timestamp': self.at(0), 'price': 2000}) + '\n')
+            stream.write(json.dumps({'timestamp': self.at(0), 'price': 2001}) + '\n')
+            stream.flush()
+            call_command('import_prices', stream.name, stdout=out)
+        self.assertIn('Imported 1 of 2 prices (1 duplicates skipped)', out.getvalue())
@@ -1,12 +1,15 @@
 from django.urls import path
 from .views import (
-    TransactionListCreateView, GoldPriceListCreateView,
+    TransactionListCreateView, GoldPriceListCreateView, GoldPriceBulkImportView,
     AdminUserListView, AdminTransactionListView,
     UserDepositListCreateView, UserWithdrawalListCreateView, UserGoldLockListCreateView,
     AdminDepositListView, AdminWithdrawalListView, AdminGoldLockListView,
     AdminDepositApproveView, AdminWithdrawalApproveView, AdminGoldLockApproveView,
-    PortfolioSnapshotView, PriceAlertView, MarketNewsView
+    AdminDepositBulkReviewView, AdminWithdrawalBulkReviewView, AdminGoldLockBulkReviewView,
+    PortfolioSnapshotView, PortfolioAnalyticsView, PriceAlertView, MarketNewsView, MarketNewsSearchView, PriceCandleListView
 )
+from .async_views import GoldPriceAsyncView, MarketNewsAsyncView
+from .streams import price_stream
 
 urlpatterns = [
     # User endpoints
@@ -15,6 +18,7 @@ urlpatterns = [
     path('user/withdrawals/', UserWithdrawalListCreateView.as_view(), name='user-withdrawals'),
     path('user/gold-locks/', UserGoldLockListCreateView.as_view(), name='user-gold-locks'),
     path('user/portfolio/', PortfolioSnapshotView.as_view(), name='user-portfolio'),
+    path('user/portfolio/analytics/', PortfolioAnalyticsView.as_view(), name='user-portfolio-analytics'),
     path('user/price-alerts/', PriceAlertView.as_view(), name='user-price-alerts'),
     path('user/price-alerts/<int:pk>/', PriceAlertView.as_view(), name='user-price-alert-detail'),
     
@@ -29,8 +33,19 @@ urlpatterns = [
     path('admin/deposits/<int:pk>/approve/', AdminDepositApproveView.as_view(), name='admin-deposit-approve'),
     path('admin/withdrawals/<int:pk>/approve/', AdminWithdrawalApproveView.as_view(), name='admin-withdrawal-approve'),
     path('admin/gold-locks/<int:pk>/approve/', AdminGoldLockApproveView.as_view(), name='admin-gold-lock-approve'),
+    path('admin/deposits/bulk-review/', AdminDepositBulkReviewView.as_view(), name='admin-deposit-bulk-review'),
+    path('admin/withdrawals/bulk-review/', AdminWithdrawalBulkReviewView.as_view(), name='admin-withdrawal-bulk-review'),
+    path('admin/gold-locks/bulk-review/', AdminGoldLockBulkReviewView.as_view(), name='admin-gold-lock-bulk-review'),
     
     # Market data endpoints
     path('gold/prices/', GoldPriceListCreateView.as_view(), name='gold-prices'),
+    path('gold/candles/', PriceCandleListView.as_view(), name='gold-candles'),
+    path('gold/prices/stream/', price_stream, name='gold-price-stream'),
+    path('gold/prices/bulk/', GoldPriceBulkImportView.as_view(), name='gold-prices-bulk'),
     path('market/news/', MarketNewsView.as_view(), name='market-news'),
+    path('market/news/search/', MarketNewsSearchView.as_view(), name='market-news-search'),
+    
+    # Async (ASGI-native) variants of read-heavy endpoints
+    path('async/gold/prices/', GoldPriceAsyncView.as_view(), name='async-gold-prices'),
+    path('async/market/news/', MarketNewsAsyncView.as_view(), name='async-market-news'),
 ] 
\ No newline at end of file
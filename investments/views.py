@@ -1,18 +1,38 @@
+from django.http import HttpResponse
 from django.shortcuts import render
 from rest_framework import generics, status
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from django.db import transaction
 from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.dateparse import parse_datetime
+from django.utils.http import http_date
 from datetime import datetime, timedelta
-from .models import GoldPrice, Transaction, DepositRequest, WithdrawalRequest, GoldLock, PortfolioSnapshot, PriceAlert, MarketNews
+from .models import GoldPrice, Transaction, DepositRequest, WithdrawalRequest, GoldLock, PortfolioSnapshot, PriceAlert, MarketNews, PriceCandle
+from .analytics import portfolio_analytics
+from .approvals import ACTIONS, bulk_review, credit_cash, debit_cash, debit_gold
+from .candles import INTERVALS, bucket_start
+from .fast_serializers import ValuesListMixin
+from .ingest import PriceImportError, import_prices, parse_prices
+from .news import FEED_SIZE, get_feed
+from .pagination import (
+    TimestampCursorPagination, CreatedCursorPagination,
+    DateCursorPagination, DateJoinedCursorPagination
+)
+from .pricing import get_latest_price
+from .search import search_news
+from .settlement import InvalidAmount, parse_gold_amount, parse_price, portfolio_value, trade_value
 from .serializers import (
     GoldPriceSerializer, TransactionSerializer, DepositRequestSerializer,
     WithdrawalRequestSerializer, GoldLockSerializer, PortfolioSnapshotSerializer,
-    PriceAlertSerializer, MarketNewsSerializer
+    PriceAlertSerializer, MarketNewsSerializer, PriceCandleSerializer
 )
-from accounts.models import User
+from accounts.ledger import InsufficientFunds, adjust_wallet
+from accounts.models import User, Wallet
 from accounts.serializers import UserSerializer
+from gold_flux.middleware import invalidate_responses
 
 class IsAdminOrReadOnly:
     def has_permission(self, request, view):
@@ -23,9 +43,10 @@ class IsAdminOrReadOnly:
 class TransactionListCreateView(generics.ListCreateAPIView):
     serializer_class = TransactionSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = TimestampCursorPagination
     
     def get_queryset(self):
-        return Transaction.objects.filter(user=self.request.user)
+        return Transaction.objects.filter(user=self.request.user).select_related('user')
     
     @transaction.atomic
     def create(self, request, *args, **kwargs):
@@ -37,33 +58,28 @@ class TransactionListCreateView(generics.ListCreateAPIView):
         
         # Get current gold price
         try:
-            current_price = GoldPrice.objects.latest('timestamp').price
+            current_price = get_latest_price()
         except GoldPrice.DoesNotExist:
             return Response({'error': 'No gold price available'}, status=status.HTTP_400_BAD_REQUEST)
         
+        if transaction_type not in ('BUY', 'SELL'):
+            return Response({'error': 'Invalid transaction type'}, status=status.HTTP_400_BAD_REQUEST)
+        if order_type not in ('MARKET', 'LIMIT', 'STOP'):
+            return Response({'error': 'Invalid order type'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            amount = parse_gold_amount(amount)
+            # Only the level the order type triggers on is kept
+            limit_price = parse_price(limit_price, 'limit_price') if order_type == 'LIMIT' else None
+            stop_price = parse_price(stop_price, 'stop_price') if order_type == 'STOP' else None
+        except InvalidAmount as exc:
+            return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        
         user = request.user
-        wallet = user.wallet
         
         # For market orders, execute immediately
         if order_type == 'MARKET':
-            if transaction_type == 'BUY':
-                cost = float(amount) * float(current_price)
-                if wallet.balance < cost:
-                    return Response({'error': 'Insufficient balance'}, status=status.HTTP_400_BAD_REQUEST)
-                
-                wallet.balance -= cost
-                wallet.gold_holdings += float(amount)
-                
-            elif transaction_type == 'SELL':
-                if wallet.gold_holdings < float(amount):
-                    return Response({'error': 'Insufficient gold holdings'}, status=status.HTTP_400_BAD_REQUEST)
-                
-                wallet.gold_holdings -= float(amount)
-                wallet.balance += float(amount) * float(current_price)
-            
-            wallet.save()
-            
-            transaction = Transaction.objects.create(
+            order = Transaction.objects.create(
                 user=user,
                 transaction_type=transaction_type,
                 order_type=order_type,
@@ -72,9 +88,24 @@ class TransactionListCreateView(generics.ListCreateAPIView):
                 executed_price=current_price,
                 status='EXECUTED'
             )
+            
+            value = trade_value(amount, current_price)
+            if transaction_type == 'BUY':
+                cash_delta, gold_delta = -value, amount
+            else:
+                cash_delta, gold_delta = value, -amount
+            try:
+                adjust_wallet(
+                    user.pk, balance=cash_delta, gold_holdings=gold_delta,
+                    reason='TRADE', reference=f'transaction:{order.pk}'
+                )
+            except InsufficientFunds as exc:
+                transaction.set_rollback(True)
+                return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
         else:
-            # For limit/stop orders, create pending order
-            transaction = Transaction.objects.create(
+            # For limit/stop orders, create pending order; the order book
+            # fills it once a price tick crosses its level
+            order = Transaction.objects.create(
                 user=user,
                 transaction_type=transaction_type,
                 order_type=order_type,
@@ -85,28 +116,31 @@ class TransactionListCreateView(generics.ListCreateAPIView):
                 status='PENDING'
             )
         
-        serializer = self.get_serializer(transaction)
+        serializer = self.get_serializer(order)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
 class PortfolioSnapshotView(generics.ListCreateAPIView):
     serializer_class = PortfolioSnapshotSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = DateCursorPagination
     
     def get_queryset(self):
-        return PortfolioSnapshot.objects.filter(user=self.request.user)
+        return PortfolioSnapshot.objects.filter(user=self.request.user).select_related('user')
     
     def create(self, request, *args, **kwargs):
         user = request.user
-        wallet = user.wallet
+        # From the database: request.user.wallet may come from the principal cache
+        wallet = Wallet.objects.filter(user_id=user.pk).first()
+        if wallet is None:
+            return Response({'error': 'User has no wallet'}, status=status.HTTP_400_BAD_REQUEST)
         
         # Get current gold price
         try:
-            current_price = GoldPrice.objects.latest('timestamp').price
+            current_price = get_latest_price()
         except GoldPrice.DoesNotExist:
             return Response({'error': 'No gold price available'}, status=status.HTTP_400_BAD_REQUEST)
         
-        gold_value = float(wallet.gold_holdings) * float(current_price)
-        total_value = float(wallet.balance) + gold_value
+        gold_value, total_value = portfolio_value(wallet.balance, wallet.gold_holdings, current_price)
         
         snapshot = PortfolioSnapshot.objects.create(
             user=user,
@@ -120,12 +154,22 @@ class PortfolioSnapshotView(generics.ListCreateAPIView):
         serializer = self.get_serializer(snapshot)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
+class PortfolioAnalyticsView(generics.GenericAPIView):
+    permission_classes = [IsAuthenticated]
+    
+    def get(self, request, *args, **kwargs):
+        analytics = portfolio_analytics(request.user.pk)
+        if not analytics:
+            return Response({'error': 'No portfolio snapshots available'}, status=status.HTTP_404_NOT_FOUND)
+        return Response(analytics)
+
 class PriceAlertView(generics.ListCreateAPIView):
     serializer_class = PriceAlertSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = CreatedCursorPagination
     
     def get_queryset(self):
-        return PriceAlert.objects.filter(user=self.request.user, is_active=True)
+        return PriceAlert.objects.filter(user=self.request.user, is_active=True).select_related('user')
     
     def destroy(self, request, *args, **kwargs):
         alert = self.get_object()
@@ -138,40 +182,157 @@ class MarketNewsView(generics.ListAPIView):
     permission_classes = [AllowAny]
     
     def get_queryset(self):
-        return MarketNews.objects.all()[:10]  # Return latest 10 news items
+        return MarketNews.objects.all()[:FEED_SIZE]  # Return latest 10 news items
+    
+    def get(self, request, *args, **kwargs):
+        if request.accepted_renderer.format != 'json':
+            return super().get(request, *args, **kwargs)
+        
+        # Serve the pre-rendered feed; pollers that have it get a 304
+        feed = get_feed()
+        last_modified = feed['last_modified'] and feed['last_modified'].timestamp()
+        response = get_conditional_response(
+            request, etag=feed['etag'], last_modified=last_modified
+        ) or HttpResponse(feed['body'], content_type='application/json')
+        response['ETag'] = feed['etag']
+        if last_modified:
+            response['Last-Modified'] = http_date(last_modified)
+        response['Cache-Control'] = 'public, max-age=0, must-revalidate'
+        return response
+
+class TimeRangeMixin:
+    def _parse_bound(self, name):
+        value = self.request.query_params.get(name)
+        if not value:
+            return None
+        parsed = parse_datetime(value)
+        if parsed is None:
+            raise ValidationError({name: 'Must be an ISO 8601 timestamp'})
+        if timezone.is_naive(parsed):
+            parsed = timezone.make_aware(parsed)
+        return parsed
+
+class MarketNewsSearchView(TimeRangeMixin, generics.ListAPIView):
+    serializer_class = MarketNewsSerializer
+    permission_classes = [AllowAny]
+    pagination_class = None
+    default_limit = 50
+    max_limit = 500
+    
+    def get_queryset(self):
+        params = self.request.query_params
+        query = params.get('q', '').strip()
+        if not query:
+            raise ValidationError({'q': 'This query parameter is required'})
+        sentiment = params.get('sentiment') or None
+        sentiments = [choice for choice, _ in MarketNews._meta.get_field('sentiment').choices]
+        if sentiment is not None and sentiment not in sentiments:
+            raise ValidationError({'sentiment': f"Must be one of: {', '.join(sentiments)}"})
+        return search_news(
+            query,
+            sentiment=sentiment,
+            source=params.get('source') or None,
+            start=self._parse_bound('from'),
+            end=self._parse_bound('to'),
+            limit=self._parse_int('limit', self.default_limit, 1, self.max_limit),
+            offset=self._parse_int('offset', 0, 0, None),
+        )
+    
+    def _parse_int(self, name, default, minimum, maximum):
+        value = self.request.query_params.get(name)
+        if not value:
+            return default
+        try:
+            parsed = int(value)
+        except ValueError:
+            raise ValidationError({name: 'Must be an integer'})
+        if parsed < minimum or (maximum is not None and parsed > maximum):
+            raise ValidationError({name: f'Must be between {minimum} and {maximum}' if maximum else f'Must be at least {minimum}'})
+        return parsed
 
-class GoldPriceListCreateView(generics.ListCreateAPIView):
+class GoldPriceListCreateView(ValuesListMixin, generics.ListCreateAPIView):
     serializer_class = GoldPriceSerializer
     permission_classes = [IsAdminOrReadOnly]
+    pagination_class = TimestampCursorPagination
     
     def get_queryset(self):
         return GoldPrice.objects.all()
 
+class PriceCandleListView(TimeRangeMixin, generics.ListAPIView):
+    serializer_class = PriceCandleSerializer
+    permission_classes = [AllowAny]
+    max_candles = 2000
+    
+    def get_queryset(self):
+        interval = self.request.query_params.get('interval', '1m')
+        if interval not in INTERVALS:
+            raise ValidationError({'interval': f"Must be one of: {', '.join(INTERVALS)}"})
+        
+        queryset = PriceCandle.objects.filter(interval=interval)
+        start = self._parse_bound('from')
+        end = self._parse_bound('to')
+        if end is not None:
+            queryset = queryset.filter(bucket__lte=end)
+        if start is not None:
+            # Include the candle the start falls inside, not just those after it
+            start = bucket_start(start, interval)
+            return queryset.filter(bucket__gte=start).order_by('bucket')[:self.max_candles]
+        
+        # Without a start, return the most recent candles in chronological order
+        return list(queryset.order_by('-bucket')[:self.max_candles])[::-1]
+    
+class GoldPriceBulkImportView(generics.GenericAPIView):
+    permission_classes = [IsAdminOrReadOnly]
+    content_formats = {
+        'application/x-ndjson': 'ndjson',
+        'application/jsonl': 'ndjson',
+        'text/csv': 'csv',
+    }
+    
+    def post(self, request, *args, **kwargs):
+        content_type = request.content_type.split(';')[0].strip()
+        fmt = self.content_formats.get(content_type)
+        if fmt is None:
+            return Response(
+                {'error': f"Content-Type must be one of: {', '.join(self.content_formats)}"},
+                status=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE
+            )
+        
+        try:
+            # Iterating the underlying request reads the body line by line
+            stats = import_prices(parse_prices(request._request, fmt))
+        except PriceImportError as exc:
+            return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(stats, status=status.HTTP_201_CREATED)
+
 class AdminUserListView(generics.ListAPIView):
     serializer_class = UserSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = DateJoinedCursorPagination
     
     def get_queryset(self):
         if not self.request.user.is_admin:
             return User.objects.none()
-        return User.objects.all()
+        return User.objects.select_related('wallet')
 
-class AdminTransactionListView(generics.ListAPIView):
+class AdminTransactionListView(ValuesListMixin, generics.ListAPIView):
     serializer_class = TransactionSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = TimestampCursorPagination
     
     def get_queryset(self):
         if not self.request.user.is_admin:
             return Transaction.objects.none()
-        return Transaction.objects.all()
+        return Transaction.objects.select_related('user')
 
 # User deposit/withdrawal/gold lock views
 class UserDepositListCreateView(generics.ListCreateAPIView):
     serializer_class = DepositRequestSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = CreatedCursorPagination
     
     def get_queryset(self):
-        return DepositRequest.objects.filter(user=self.request.user)
+        return DepositRequest.objects.filter(user=self.request.user).select_related('user', 'approved_by')
     
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
@@ -179,9 +340,10 @@ class UserDepositListCreateView(generics.ListCreateAPIView):
 class UserWithdrawalListCreateView(generics.ListCreateAPIView):
     serializer_class = WithdrawalRequestSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = CreatedCursorPagination
     
     def get_queryset(self):
-        return WithdrawalRequest.objects.filter(user=self.request.user)
+        return WithdrawalRequest.objects.filter(user=self.request.user).select_related('user', 'approved_by')
     
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
@@ -189,9 +351,10 @@ class UserWithdrawalListCreateView(generics.ListCreateAPIView):
 class UserGoldLockListCreateView(generics.ListCreateAPIView):
     serializer_class = GoldLockSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = CreatedCursorPagination
     
     def get_queryset(self):
-        return GoldLock.objects.filter(user=self.request.user)
+        return GoldLock.objects.filter(user=self.request.user).select_related('user', 'approved_by')
     
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
@@ -200,31 +363,50 @@ class UserGoldLockListCreateView(generics.ListCreateAPIView):
 class AdminDepositListView(generics.ListAPIView):
     serializer_class = DepositRequestSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = CreatedCursorPagination
     
     def get_queryset(self):
         if not self.request.user.is_admin:
             return DepositRequest.objects.none()
-        return DepositRequest.objects.all()
+        return DepositRequest.objects.select_related('user', 'approved_by')
 
 class AdminWithdrawalListView(generics.ListAPIView):
     serializer_class = WithdrawalRequestSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = CreatedCursorPagination
     
     def get_queryset(self):
         if not self.request.user.is_admin:
             return WithdrawalRequest.objects.none()
-        return WithdrawalRequest.objects.all()
+        return WithdrawalRequest.objects.select_related('user', 'approved_by')
 
 class AdminGoldLockListView(generics.ListAPIView):
     serializer_class = GoldLockSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = CreatedCursorPagination
     
     def get_queryset(self):
         if not self.request.user.is_admin:
             return GoldLock.objects.none()
-        return GoldLock.objects.all()
+        return GoldLock.objects.select_related('user', 'approved_by')
 
 # Approval views
+def claim_pending(request_obj, new_status, admin):
+    """
+    Move a PENDING request to ``new_status`` with a conditional UPDATE, so two
+    admins acting on the same request cannot both apply its wallet change.
+    """
+    now = timezone.now()
+    claimed = type(request_obj).objects.filter(pk=request_obj.pk, status='PENDING').update(
+        status=new_status, approved_at=now, approved_by=admin
+    )
+    if claimed:
+        invalidate_responses(type(request_obj), [request_obj.user_id])
+        request_obj.status = new_status
+        request_obj.approved_at = now
+        request_obj.approved_by = admin
+    return bool(claimed)
+
 class AdminDepositApproveView(generics.UpdateAPIView):
     serializer_class = DepositRequestSerializer
     permission_classes = [IsAuthenticated]
@@ -232,7 +414,7 @@ class AdminDepositApproveView(generics.UpdateAPIView):
     def get_queryset(self):
         if not self.request.user.is_admin:
             return DepositRequest.objects.none()
-        return DepositRequest.objects.filter(status='PENDING')
+        return DepositRequest.objects.filter(status='PENDING').select_related('user')
     
     @transaction.atomic
     def update(self, request, *args, **kwargs):
@@ -240,22 +422,15 @@ class AdminDepositApproveView(generics.UpdateAPIView):
         action = request.data.get('action')
         
         if action == 'approve':
-            deposit.status = 'APPROVED'
-            deposit.approved_at = timezone.now()
-            deposit.approved_by = request.user
-            deposit.save()
+            if not claim_pending(deposit, 'APPROVED', request.user):
+                return Response({'error': 'Deposit already processed'}, status=status.HTTP_409_CONFLICT)
             
             # Update user's wallet balance
-            user = deposit.user
-            wallet = user.wallet
-            wallet.balance += deposit.amount
-            wallet.save()
+            adjust_wallet(deposit.user_id, balance=deposit.amount, reason='DEPOSIT', reference=f'deposit:{deposit.pk}')
             
         elif action == 'reject':
-            deposit.status = 'REJECTED'
-            deposit.approved_at = timezone.now()
-            deposit.approved_by = request.user
-            deposit.save()
+            if not claim_pending(deposit, 'REJECTED', request.user):
+                return Response({'error': 'Deposit already processed'}, status=status.HTTP_409_CONFLICT)
         
         serializer = self.get_serializer(deposit)
         return Response(serializer.data)
@@ -267,7 +442,7 @@ class AdminWithdrawalApproveView(generics.UpdateAPIView):
     def get_queryset(self):
         if not self.request.user.is_admin:
             return WithdrawalRequest.objects.none()
-        return WithdrawalRequest.objects.filter(status='PENDING')
+        return WithdrawalRequest.objects.filter(status='PENDING').select_related('user')
     
     @transaction.atomic
     def update(self, request, *args, **kwargs):
@@ -275,25 +450,21 @@ class AdminWithdrawalApproveView(generics.UpdateAPIView):
         action = request.data.get('action')
         
         if action == 'approve':
-            user = withdrawal.user
-            wallet = user.wallet
+            try:
+                adjust_wallet(
+                    withdrawal.user_id, balance=-withdrawal.amount,
+                    reason='WITHDRAWAL', reference=f'withdrawal:{withdrawal.pk}'
+                )
+            except InsufficientFunds as exc:
+                return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
             
-            if wallet.balance < withdrawal.amount:
-                return Response({'error': 'Insufficient balance'}, status=status.HTTP_400_BAD_REQUEST)
-            
-            withdrawal.status = 'APPROVED'
-            withdrawal.approved_at = timezone.now()
-            withdrawal.approved_by = request.user
-            withdrawal.save()
-            
-            wallet.balance -= withdrawal.amount
-            wallet.save()
+            if not claim_pending(withdrawal, 'APPROVED', request.user):
+                transaction.set_rollback(True)
+                return Response({'error': 'Withdrawal already processed'}, status=status.HTTP_409_CONFLICT)
             
         elif action == 'reject':
-            withdrawal.status = 'REJECTED'
-            withdrawal.approved_at = timezone.now()
-            withdrawal.approved_by = request.user
-            withdrawal.save()
+            if not claim_pending(withdrawal, 'REJECTED', request.user):
+                return Response({'error': 'Withdrawal already processed'}, status=status.HTTP_409_CONFLICT)
         
         serializer = self.get_serializer(withdrawal)
         return Response(serializer.data)
@@ -305,7 +476,7 @@ class AdminGoldLockApproveView(generics.UpdateAPIView):
     def get_queryset(self):
         if not self.request.user.is_admin:
             return GoldLock.objects.none()
-        return GoldLock.objects.filter(status='PENDING')
+        return GoldLock.objects.filter(status='PENDING').select_related('user')
     
     @transaction.atomic
     def update(self, request, *args, **kwargs):
@@ -313,25 +484,73 @@ class AdminGoldLockApproveView(generics.UpdateAPIView):
         action = request.data.get('action')
         
         if action == 'approve':
-            user = gold_lock.user
-            wallet = user.wallet
-            
-            if wallet.gold_holdings < gold_lock.amount:
-                return Response({'error': 'Insufficient gold holdings'}, status=status.HTTP_400_BAD_REQUEST)
+            try:
+                adjust_wallet(
+                    gold_lock.user_id, gold_holdings=-gold_lock.amount,
+                    reason='GOLD_LOCK', reference=f'gold_lock:{gold_lock.pk}'
+                )
+            except InsufficientFunds as exc:
+                return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
             
-            gold_lock.status = 'APPROVED'
-            gold_lock.approved_at = timezone.now()
-            gold_lock.approved_by = request.user
-            gold_lock.save()
-            
-            wallet.gold_holdings -= gold_lock.amount
-            wallet.save()
+            if not claim_pending(gold_lock, 'APPROVED', request.user):
+                transaction.set_rollback(True)
+                return Response({'error': 'Gold lock already processed'}, status=status.HTTP_409_CONFLICT)
             
         elif action == 'reject':
-            gold_lock.status = 'REJECTED'
-            gold_lock.approved_at = timezone.now()
-            gold_lock.approved_by = request.user
-            gold_lock.save()
+            if not claim_pending(gold_lock, 'REJECTED', request.user):
+                return Response({'error': 'Gold lock already processed'}, status=status.HTTP_409_CONFLICT)
         
         serializer = self.get_serializer(gold_lock)
         return Response(serializer.data)
+
+class AdminBulkReviewView(generics.GenericAPIView):
+    """
+    Approve or reject a batch of pending requests: POST ``{"ids": [...],
+    "action": "approve" | "reject"}``. Returns a result per id. Subclasses
+    set ``model``, the ledger ``reason`` and ``reference`` prefix, and
+    ``delta``, the ``(cash, gold)`` change an approval of ``amount`` makes.
+    """
+    permission_classes = [IsAuthenticated]
+    model = None
+    reason = None
+    reference = None
+    delta = None
+    max_ids = 1000
+    
+    def post(self, request, *args, **kwargs):
+        assert self.delta is not None, f"'{self.__class__.__name__}' should set the `delta` attribute"
+        
+        if not request.user.is_admin:
+            return Response({'error': 'Admin access required'}, status=status.HTTP_403_FORBIDDEN)
+        
+        action = request.data.get('action')
+        if action not in ACTIONS:
+            return Response({'error': f"action must be one of: {', '.join(ACTIONS)}"}, status=status.HTTP_400_BAD_REQUEST)
+        
+        ids = request.data.get('ids')
+        if not isinstance(ids, list) or not ids or not all(isinstance(pk, int) and not isinstance(pk, bool) for pk in ids):
+            return Response({'error': 'ids must be a non-empty list of integers'}, status=status.HTTP_400_BAD_REQUEST)
+        ids = list(dict.fromkeys(ids))
+        if len(ids) > self.max_ids:
+            return Response({'error': f'At most {self.max_ids} ids per request'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        results = bulk_review(self.model, ids, action, request.user, self.reason, self.reference, self.delta)
+        return Response({'results': results})
+
+class AdminDepositBulkReviewView(AdminBulkReviewView):
+    model = DepositRequest
+    reason = 'DEPOSIT'
+    reference = 'deposit'
+    delta = staticmethod(credit_cash)
+
+class AdminWithdrawalBulkReviewView(AdminBulkReviewView):
+    model = WithdrawalRequest
+    reason = 'WITHDRAWAL'
+    reference = 'withdrawal'
+    delta = staticmethod(debit_cash)
+
+class AdminGoldLockBulkReviewView(AdminBulkReviewView):
+    model = GoldLock
+    reason = 'GOLD_LOCK'
+    reference = 'gold_lock'
+    delta = staticmethod(debit_gold)
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Load test: async vs sync variants of the read-heavy endpoints under ASGI
+
+By default requests are driven straight into gold_flux.asgi.application,
+in process, against a throwaway test database. With --url they are sent
+over HTTP with aiohttp to a running server instead, e.g.
+
+    uvicorn gold_flux.asgi:application --workers 1
+    python loadtest_async.py --url http://127.0.0.1:8000 --token <access token>
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+from datetime import timedelta
+from decimal import Decimal
+
+import django
+
+# Setup Django
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'gold_flux.settings')
+django.setup()
+
+from django.conf import settings
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+from django.utils import timezone
+
+# (sync path, async path)
+ENDPOINTS = [
+    ('/api/market/news/', '/api/async/market/news/'),
+    ('/api/gold/prices/', '/api/async/gold/prices/'),
+    ('/api/user/profile/', '/api/async/user/profile/'),
+]
+
+
+def seed():
+    """Create market data and a user; return that user's access token."""
+    from rest_framework_simplejwt.tokens import RefreshToken
+
+    from accounts.models import User, Wallet
+    from investments.models import GoldPrice, MarketNews
+
+    now = timezone.now()
+    MarketNews.objects.bulk_create(
+        MarketNews(title=f'Gold update {i}', summary='Gold moves', source='Wire', sentiment='NEUTRAL',
+                   published_date=now - timedelta(minutes=i))
+        for i in range(100)
+    )
+    GoldPrice.objects.bulk_create(
+        GoldPrice(timestamp=now - timedelta(seconds=i), price=Decimal(200_000 + i).scaleb(-2)) for i in range(1000)
+    )
+    user = User.objects.create_user(username='loadtest', email='loadtest@example.com', password='loadtest-pass')
+    Wallet.objects.create(user=user, balance=Decimal('1000.00'))
+    return str(RefreshToken.for_user(user).access_token)
+
+
+def in_process_client(token):
+    from gold_flux.asgi import application
+
+    headers = [(b'host', b'testserver'), (b'authorization', f'Bearer {token}'.encode())]
+
+    async def get(path):
+        scope = {
+            'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET',
+            'scheme': 'http', 'path': path, 'raw_path': path.encode(), 'query_string': b'',
+            'root_path': '', 'headers': headers, 'client': ('127.0.0.1', 1234), 'server': ('testserver', 80),
+        }
+        sent = False
+        status = None
+
+        async def receive():
+            nonlocal sent
+            if not sent:
+                sent = True
+                return {'type': 'http.request', 'body': b'', 'more_body': False}
+            await asyncio.Event().wait()  # no disconnect until the response is done
+
+        async def send(message):
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = message['status']
+
+        await application(scope, receive, send)
+        return status
+
+    return get, None
+
+
+def http_client(base_url, token):
+    import aiohttp
+
+    session = aiohttp.ClientSession(
+        headers={'Authorization': f'Bearer {token}'},
+        connector=aiohttp.TCPConnector(limit=0),
+    )
+
+    async def get(path):
+        async with session.get(base_url + path) as response:
+            await response.read()
+            return response.status
+
+    return get, session
+
+
+async def run(get, path, connections, requests):
+    """``connections`` concurrent clients each sending ``requests`` GETs in a row."""
+    latencies = []
+    errors = 0
+
+    async def client():
+        nonlocal errors
+        for _ in range(requests):
+            start = time.perf_counter()
+            status = await get(path)
+            latencies.append(time.perf_counter() - start)
+            if status != 200:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(connections)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        'rps': len(latencies) / elapsed,
+        'p50': statistics.median(latencies) * 1000,
+        'p99': latencies[int(len(latencies) * 0.99) - 1] * 1000,
+        'errors': errors,
+    }
+
+
+async def main(args, token):
+    if args.url:
+        get, session = http_client(args.url.rstrip('/'), token)
+    else:
+        get, session = in_process_client(token)
+    try:
+        print(f'=== {args.connections} concurrent connections x {args.requests} requests ===')
+        for sync_path, async_path in ENDPOINTS:
+            for label, path in (('sync', sync_path), ('async', async_path)):
+                result = await run(get, path, args.connections, args.requests)
+                print(f'{path:>28} {label:>5}: {result["rps"]:8.0f} req/s  p50 {result["p50"]:8.1f} ms  '
+                      f'p99 {result["p99"]:8.1f} ms  errors {result["errors"]}')
+    finally:
+        if session is not None:
+            await session.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--connections', type=int, default=1000)
+    parser.add_argument('--requests', type=int, default=5, help='Requests per connection')
+    parser.add_argument('--url', help='Base URL of a running server (default: drive the ASGI app in process)')
+    parser.add_argument('--token', help='Access token for the profile endpoints when using --url')
+    args = parser.parse_args()
+
+    if args.url:
+        asyncio.run(main(args, args.token or ''))
+    else:
+        # Run against a throwaway test database, never the real one
+        settings.ALLOWED_HOSTS = ['testserver']
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0)
+        try:
+            asyncio.run(main(args, seed()))
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()